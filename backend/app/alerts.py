@@ -0,0 +1,178 @@
+"""
+Düşük stok uyarı tarayıcısı.
+Stock.quantity veya Product.stock yeniden sipariş eşiğinin altına düşen
+satırlar için low_stock_alerts tablosunu güncel tutar.
+
+İlk tur uyarıları eşik altındaki satırları tutan kısmi indeksten yeniden
+kurar; sonraki turlar yalnızca son turdan beri güncellenen (updated_at)
+satırlara bakar. Eşiğin altına düşen satırın uyarısı eklenir/güncellenir,
+üstüne çıkan veya eşiği kaldırılan satırın uyarısı silinir.
+"""
+
+import asyncio
+import datetime
+import logging
+from typing import Callable, Dict, Optional
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .core.settings import settings
+from .models import LowStockAlert, Product, Stock
+from .routes.common import upsert_statement
+
+logger = logging.getLogger(__name__)
+
+# Uyarı türü -> (model, ad kolonu, miktar kolonu)
+ALERT_ITEMS = {
+    "stock": (Stock, Stock.product_name, Stock.quantity),
+    "product": (Product, Product.name, Product.stock),
+}
+
+# updated_at saniye çözünürlüklü olabilir ve PostgreSQL'de now() transaction
+# başlangıcıdır; geç commit edilen satırlar kaçmasın diye pencere örtüşür.
+SCAN_OVERLAP = datetime.timedelta(seconds=5)
+
+
+class LowStockScanner:
+    """
+    Son turdan beri dokunulan satırları tarayan düşük stok tarayıcısı.
+
+    Attributes:
+        since: Sonraki turun baktığı en eski updated_at (ilk turda None)
+        runs: Tamamlanan tur sayısı
+        raised: Yeni açılan uyarı sayısı
+        cleared: Kapanan uyarı sayısı
+    """
+
+    def __init__(self, chunk_size: Optional[int] = None):
+        self.chunk_size = chunk_size or settings.BULK_CHUNK_SIZE
+        self.since: Optional[datetime.datetime] = None
+        self.runs = 0
+        self.raised = 0
+        self.cleared = 0
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "runs": self.runs,
+            "raised": self.raised,
+            "cleared": self.cleared,
+            "since": self.since.isoformat() if self.since else None,
+        }
+
+    async def scan(self, db: AsyncSession) -> int:
+        """
+        Bir tarama turu çalıştırır; her parça ayrı transaction'dır.
+
+        Args:
+            db: Async veritabanı oturumu
+
+        Returns:
+            int: Bu turda yeni açılan uyarı sayısı
+        """
+        started = (await db.execute(select(func.now()))).scalar_one()
+        raised = 0
+        for kind, (model, name, quantity) in ALERT_ITEMS.items():
+            if self.since is None:
+                # İlk tur: kısmi indeksten eşik altındaki satırlar
+                await db.execute(
+                    delete(LowStockAlert).where(LowStockAlert.item_type == kind)
+                )
+                where = quantity < model.reorder_threshold
+            else:
+                where = model.updated_at >= self.since - SCAN_OVERLAP
+            stmt = select(model.id, name, quantity, model.reorder_threshold).where(
+                where
+            )
+            last_id = 0
+            while True:
+                rows = (
+                    await db.execute(
+                        stmt.where(model.id > last_id)
+                        .order_by(model.id)
+                        .limit(self.chunk_size)
+                    )
+                ).all()
+                if not rows:
+                    break
+                raised += await self._apply(db, kind, rows)
+                await db.commit()
+                last_id = rows[-1][0]
+        await db.commit()
+        self.since = started
+        self.runs += 1
+        self.raised += raised
+        return raised
+
+    async def _apply(self, db: AsyncSession, kind: str, rows) -> int:
+        """Bir parça satırın uyarılarını açar, günceller veya kapatır."""
+        low = {
+            id: (name, quantity, threshold)
+            for id, name, quantity, threshold in rows
+            if threshold is not None and quantity < threshold
+        }
+        recovered = [row[0] for row in rows if row[0] not in low]
+        if recovered:
+            result = await db.execute(
+                delete(LowStockAlert).where(
+                    LowStockAlert.item_type == kind,
+                    LowStockAlert.item_id.in_(recovered),
+                )
+            )
+            self.cleared += result.rowcount
+        if not low:
+            return 0
+
+        existing = set(
+            (
+                await db.execute(
+                    select(LowStockAlert.item_id).where(
+                        LowStockAlert.item_type == kind,
+                        LowStockAlert.item_id.in_(low),
+                    )
+                )
+            ).scalars()
+        )
+        stmt = upsert_statement(
+            db,
+            LowStockAlert.__table__,
+            ["item_type", "item_id"],
+            ["name", "quantity", "reorder_threshold"],
+        )
+        await db.execute(
+            stmt,
+            [
+                {
+                    "item_type": kind,
+                    "item_id": id,
+                    "name": name,
+                    "quantity": quantity,
+                    "reorder_threshold": threshold,
+                }
+                for id, (name, quantity, threshold) in low.items()
+            ],
+        )
+        for id in low.keys() - existing:
+            name, quantity, threshold = low[id]
+            logger.warning(f"Düşük stok: {kind} {id} ({name}) {quantity} < {threshold}")
+        return len(low.keys() - existing)
+
+
+scanner = LowStockScanner()
+
+
+async def run_scanner(
+    session_factory: Callable[[], AsyncSession], interval: float
+) -> None:
+    """
+    Tarayıcıyı uygulama kapanana kadar her interval saniyede bir çalıştırır.
+    Veritabanı hataları loglanır, sonraki turda tekrar denenir.
+    """
+    while True:
+        try:
+            async with session_factory() as db:
+                await scanner.scan(db)
+        except SQLAlchemyError:
+            logger.exception("Düşük stok taraması başarısız")
+        await asyncio.sleep(interval)
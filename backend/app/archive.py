@@ -0,0 +1,137 @@
+"""
+Sipariş geçmişi arşivleme.
+Kapanmış ve belirli bir yaştan eski siparişleri kalemleriyle birlikte
+orders_archive/order_items_archive tablolarına taşır. Taşıma küçük
+parçalar halinde ayrı transaction'larda yapılır, böylece sıcak tablolarda
+uzun süreli kilit tutulmaz.
+"""
+
+import datetime
+import logging
+from typing import Iterable, Optional
+
+from sqlalchemy import delete, insert, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .core.settings import settings
+from .entity_cache import invalidate_after_commit
+from .models import Order, OrderArchive, OrderItem, OrderItemArchive
+
+logger = logging.getLogger(__name__)
+
+# Arşivlenebilir (kapanmış) sipariş durumları
+CLOSED_STATUSES = ("delivered", "cancelled")
+
+_ORDER_COLUMNS = (
+    "id",
+    "created_at",
+    "user_id",
+    "status",
+    "total_amount",
+    "shipping_address_id",
+)
+_ITEM_COLUMNS = (
+    "id",
+    "order_id",
+    "product_id",
+    "quantity",
+    "unit_price",
+    "total_price",
+)
+
+
+async def is_partitioned(db: AsyncSession) -> bool:
+    """orders_archive PostgreSQL'de partition'lı tablo olarak mı oluşturulmuş?"""
+    if db.bind.dialect.name != "postgresql":
+        return False
+    relkind = await db.scalar(
+        text("SELECT relkind FROM pg_class WHERE relname = 'orders_archive'")
+    )
+    return relkind == "p"
+
+
+async def ensure_partitions(db: AsyncSession, years: Iterable[int]) -> None:
+    """
+    Verilen yıllar için orders_archive range partition'larını oluşturur.
+    Yalnızca partition'lı PostgreSQL tablosunda çağrılmalıdır.
+    """
+    for year in sorted(set(years)):
+        await db.execute(
+            text(
+                f"CREATE TABLE IF NOT EXISTS orders_archive_{year:04d} "
+                "PARTITION OF orders_archive "
+                f"FOR VALUES FROM ('{year:04d}-01-01') TO ('{year + 1:04d}-01-01')"
+            )
+        )
+
+
+async def _archive_chunk(db: AsyncSession, order_ids: list) -> None:
+    """Siparişleri ve kalemlerini arşive kopyalayıp sıcak tablolardan siler."""
+    orders = Order.__table__
+    items = OrderItem.__table__
+    await db.execute(
+        insert(OrderArchive.__table__).from_select(
+            _ORDER_COLUMNS,
+            select(*(orders.c[name] for name in _ORDER_COLUMNS)).where(
+                orders.c.id.in_(order_ids)
+            ),
+        )
+    )
+    await db.execute(
+        insert(OrderItemArchive.__table__).from_select(
+            _ITEM_COLUMNS,
+            select(*(items.c[name] for name in _ITEM_COLUMNS)).where(
+                items.c.order_id.in_(order_ids)
+            ),
+        )
+    )
+    await db.execute(delete(items).where(items.c.order_id.in_(order_ids)))
+    await db.execute(delete(orders).where(orders.c.id.in_(order_ids)))
+
+
+async def archive_orders(
+    db: AsyncSession,
+    older_than_days: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+    now: Optional[datetime.datetime] = None,
+) -> int:
+    """
+    Kapanmış eski siparişleri arşive taşır.
+
+    Args:
+        db: Async veritabanı oturumu
+        older_than_days: Arşivlenecek en küçük yaş (varsayılan: ARCHIVE_AFTER_DAYS)
+        chunk_size: Transaction başına sipariş (varsayılan: ARCHIVE_CHUNK_SIZE)
+        now: Yaş hesabı için referans zaman (varsayılan: şimdi, UTC)
+
+    Returns:
+        int: Arşivlenen sipariş sayısı
+    """
+    if older_than_days is None:
+        older_than_days = settings.ARCHIVE_AFTER_DAYS
+    chunk_size = chunk_size or settings.ARCHIVE_CHUNK_SIZE
+    now = now or datetime.datetime.utcnow()
+    cutoff = now - datetime.timedelta(days=older_than_days)
+    partitioned = await is_partitioned(db)
+
+    total = 0
+    while True:
+        rows = (
+            await db.execute(
+                select(Order.id, Order.created_at, Order.user_id)
+                .where(Order.status.in_(CLOSED_STATUSES), Order.created_at < cutoff)
+                .order_by(Order.id)
+                .limit(chunk_size)
+            )
+        ).all()
+        if not rows:
+            break
+        if partitioned:
+            await ensure_partitions(db, (row.created_at.year for row in rows))
+        await _archive_chunk(db, [row.id for row in rows])
+        invalidate_after_commit(db, "order", (row.id for row in rows))
+        invalidate_after_commit(db, "user", {row.user_id for row in rows})
+        await db.commit()
+        total += len(rows)
+        logger.info(f"{total} sipariş arşivlendi.")
+    return total
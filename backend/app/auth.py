@@ -11,6 +11,8 @@ from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from passlib.context import CryptContext
 
 from .core.settings import settings
+from .revocation import revocation_list
+from .token_cache import token_cache
 
 # HTTPBearer'ı auto_error=False ile yapılandır
 security = HTTPBearer(auto_error=False)
@@ -18,6 +20,11 @@ security = HTTPBearer(auto_error=False)
 # Test token from settings
 VALID_TOKEN = settings.VALID_TOKEN
 
+# İptal edilen token'ların cache kayıtları isabette düşürülür
+token_cache.set_revocation_check(
+    lambda claims: revocation_list.is_revoked(claims.get("jti"))
+)
+
 # Password hashing context
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -40,11 +47,15 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 
 
 def verify_token(token: str) -> dict:
-    """JWT token'ı doğrula"""
+    """JWT token'ı doğrula (doğrulanmış claim'ler exp'e kadar cache'lenir)"""
+    payload = token_cache.get(token)
+    if payload is not None:
+        return payload
     try:
         payload = jwt.decode(
             token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM]
         )
+        token_cache.set(token, payload)
         return payload
     except jwt.ExpiredSignatureError:
         raise HTTPException(
@@ -91,15 +102,6 @@ def get_current_user(
         # JWT token doğrulama
         try:
             payload = verify_token(token)
-            user_id = payload.get("sub")
-            role = payload.get("role", "user")
-            permissions = payload.get("permissions", [])
-
-            return {
-                "user": user_id,
-                "role": role,
-                "permissions": permissions,
-            }
         except HTTPException:
             # JWT token geçersiz, eski token kontrolü yap
             if token != VALID_TOKEN:
@@ -116,6 +118,26 @@ def get_current_user(
                 "permissions": ["read", "write", "delete"],
             }
 
+        # Geçerli JWT'nin reddi eski token yoluna düşmez, kendi mesajıyla döner
+        if payload.get("type") == "refresh":
+            # Refresh token yalnızca /auth/refresh'te kullanılabilir
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid token type",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        if revocation_list.is_revoked(payload.get("jti")):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Token has been revoked",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        return {
+            "user": payload.get("sub"),
+            "role": payload.get("role", "user"),
+            "permissions": payload.get("permissions", []),
+        }
+
     except HTTPException:
         # HTTPException'ları tekrar fırlat
         raise
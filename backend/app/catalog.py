@@ -0,0 +1,174 @@
+"""
+Süreç içi ürün katalog indeksi.
+Sipariş oluştururken ürün adı/id çözümlemesini veritabanına gitmeden yapar.
+
+İndeks uygulama başlangıcında ısıtılır, ORM üzerinden eklenen/değişen/silinen
+ürünler commit sonrası indekse yansıtılır ve boyutu LRU ile sınırlıdır.
+Başka süreçlerin yaptığı değişiklikler ancak ilgili kayıt LRU'dan düşünce
+veya süreç yeniden başlayınca görülür; ürün adları benzersiz ve id'ler
+sabit olduğundan sipariş çözümlemesi için bu yeterlidir.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Iterable, NamedTuple, Optional
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, object_session
+
+from .core.settings import settings
+from .models import Product
+
+_PENDING_KEY = "catalog_changes"
+
+
+class CatalogEntry(NamedTuple):
+    """Katalogdaki ürün özeti."""
+
+    id: int
+    name: str
+    price: float
+    sku: str
+
+
+class ProductCatalog:
+    """
+    LRU ile sınırlı ürün indeksi.
+
+    name -> CatalogEntry ve id -> name eşlemelerini birlikte tutar.
+    """
+
+    def __init__(self, max_size: int = 10000):
+        self.max_size = max_size
+        self._by_name: "OrderedDict[str, CatalogEntry]" = OrderedDict()
+        self._names_by_id: dict = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._by_name)
+
+    def get_by_name(self, name: str) -> Optional[CatalogEntry]:
+        """Ürünü adına göre döndürür; yoksa None."""
+        with self._lock:
+            entry = self._by_name.get(name)
+            if entry is not None:
+                self._by_name.move_to_end(name)
+            return entry
+
+    def get_name(self, product_id: int) -> Optional[str]:
+        """Ürün adını id'sine göre döndürür; yoksa None."""
+        with self._lock:
+            name = self._names_by_id.get(product_id)
+            if name is not None:
+                self._by_name.move_to_end(name)
+            return name
+
+    def put(self, entry: CatalogEntry) -> None:
+        """Ürünü ekler veya günceller, gerekirse en eski kaydı çıkarır."""
+        with self._lock:
+            old_name = self._names_by_id.get(entry.id)
+            if old_name is not None and old_name != entry.name:
+                self._by_name.pop(old_name, None)
+            self._by_name[entry.name] = entry
+            self._by_name.move_to_end(entry.name)
+            self._names_by_id[entry.id] = entry.name
+            while len(self._by_name) > self.max_size:
+                _, evicted = self._by_name.popitem(last=False)
+                self._names_by_id.pop(evicted.id, None)
+
+    def discard(self, product_id: int) -> None:
+        """Ürünü indeksten çıkarır."""
+        with self._lock:
+            name = self._names_by_id.pop(product_id, None)
+            if name is not None:
+                self._by_name.pop(name, None)
+
+    def discard_name(self, name: str) -> None:
+        """Ürünü adına göre indeksten çıkarır (ORM dışı yazımlar için)."""
+        with self._lock:
+            entry = self._by_name.pop(name, None)
+            if entry is not None:
+                self._names_by_id.pop(entry.id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._by_name.clear()
+            self._names_by_id.clear()
+
+    def warm(self, entries: Iterable[CatalogEntry]) -> int:
+        """
+        İndeksi verilen kayıtlarla doldurur.
+
+        Returns:
+            int: Eklenen kayıt sayısı
+        """
+        count = 0
+        for entry in entries:
+            self.put(entry)
+            count += 1
+        return count
+
+
+def entry_for(product: Product) -> CatalogEntry:
+    """ORM Product nesnesinden katalog kaydı üretir."""
+    return CatalogEntry(product.id, product.name, product.price, product.sku)
+
+
+product_catalog = ProductCatalog(settings.PRODUCT_CATALOG_SIZE)
+
+
+async def warm_catalog(db: AsyncSession, catalog: ProductCatalog = None) -> int:
+    """
+    Kataloğu en son eklenen ürünlerle ısıtır.
+
+    Args:
+        db: Async veritabanı oturumu
+        catalog: Isıtılacak katalog (varsayılan: product_catalog)
+
+    Returns:
+        int: Yüklenen ürün sayısı
+    """
+    if catalog is None:
+        catalog = product_catalog
+    result = await db.execute(
+        select(Product.id, Product.name, Product.price, Product.sku)
+        .order_by(Product.id.desc())
+        .limit(catalog.max_size)
+    )
+    # En yeni ürünler LRU'da en taze kalsın diye eskiden yeniye ekle
+    return catalog.warm(CatalogEntry(*row) for row in reversed(result.all()))
+
+
+# --- ORM event'leri: değişiklikler commit sonrası kataloğa yansır ---
+
+
+def _record(target: Product, change: tuple) -> None:
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_PENDING_KEY, []).append(change)
+
+
+@event.listens_for(Product, "after_insert")
+@event.listens_for(Product, "after_update")
+def _product_written(mapper, connection, target):
+    _record(target, ("put", entry_for(target)))
+
+
+@event.listens_for(Product, "after_delete")
+def _product_deleted(mapper, connection, target):
+    _record(target, ("discard", target.id))
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_catalog_changes(session):
+    for action, value in session.info.pop(_PENDING_KEY, ()):
+        if action == "put":
+            product_catalog.put(value)
+        else:
+            product_catalog.discard(value)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_catalog_changes(session):
+    session.info.pop(_PENDING_KEY, None)
@@ -3,9 +3,13 @@ Security configuration and utilities.
 JWT, password hashing, and security-related functions.
 """
 
+import asyncio
 import secrets
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Callable, Dict, Optional
 
 import bcrypt
 import jwt
@@ -45,6 +49,8 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
         expire = datetime.utcnow() + timedelta(
             minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
         )
+    # jti: token'ın tek başına iptal edilebilmesi için kimlik
+    to_encode.setdefault("jti", uuid.uuid4().hex)
     to_encode.update({"exp": expire})
     encoded_jwt = jwt.encode(
         to_encode, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM
@@ -117,7 +123,7 @@ def hash_password(password: str) -> str:
     Returns:
         str: Hashed şifre
     """
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)
     hashed = bcrypt.hashpw(password.encode("utf-8"), salt)
     return hashed.decode("utf-8")
 
@@ -138,6 +144,22 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     )
 
 
+def password_needs_rehash(hashed_password: str) -> bool:
+    """
+    Hash'in maliyet faktörü BCRYPT_ROUNDS'tan farklı mı kontrol eder.
+
+    Args:
+        hashed_password: "$2b$<cost>$..." biçiminde bcrypt hash'i
+
+    Returns:
+        bool: Hash yeniden oluşturulmalıysa (farklı maliyet veya okunamayan biçim)
+    """
+    try:
+        return int(hashed_password.split("$")[2]) != settings.BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return True
+
+
 def get_password_hash(password: str) -> str:
     """
     Şifre hash'i oluşturur (hash_password ile aynı).
@@ -163,3 +185,117 @@ def verify_password_hash(plain_password: str, hashed_password: str) -> bool:
         bool: Şifre doğru ise True
     """
     return verify_password(plain_password, hashed_password)
+
+
+# Şifre havuzu dolduğunda dönen hata
+HASH_POOL_BUSY_DETAIL = (
+    "Şifre işlemleri yoğun, lütfen tekrar deneyin / "
+    "Password service is busy, please retry"
+)
+
+
+class PasswordHashPool:
+    """
+    bcrypt hash/doğrulama işlerini event loop dışında çalıştıran sınırlı havuz.
+
+    bcrypt GIL'i bıraktığı için iş parçacıkları gerçek paralellik sağlar.
+    Çalışan + bekleyen iş sayısı workers + queue_limit'i aşarsa yeni iş
+    kuyruğa alınmaz, 503 ile reddedilir.
+
+    Attributes:
+        completed: Tamamlanan iş sayısı
+        shed: Kuyruk dolu olduğu için reddedilen iş sayısı
+    """
+
+    def __init__(
+        self, workers: Optional[int] = None, queue_limit: Optional[int] = None
+    ):
+        self.workers = workers or settings.PASSWORD_HASH_WORKERS
+        self.queue_limit = (
+            settings.PASSWORD_HASH_QUEUE_LIMIT if queue_limit is None else queue_limit
+        )
+        self.in_flight = 0
+        self.completed = 0
+        self.shed = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="bcrypt"
+                )
+            return self._executor
+
+    async def run(self, fn: Callable, *args):
+        """
+        fn'i havuzda çalıştırır ve sonucunu döndürür.
+
+        Raises:
+            HTTPException: 503, havuz ve kuyruk doluysa
+        """
+        if self.in_flight >= self.workers + self.queue_limit:
+            self.shed += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=HASH_POOL_BUSY_DETAIL,
+                headers={"Retry-After": "1"},
+            )
+        self.in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), fn, *args)
+        finally:
+            self.in_flight -= 1
+            self.completed += 1
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "workers": self.workers,
+            "queue_limit": self.queue_limit,
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "shed": self.shed,
+        }
+
+    def shutdown(self) -> None:
+        """Havuzu kapatır; sonraki ilk işte yeniden oluşturulur."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+
+
+password_pool = PasswordHashPool()
+
+
+async def hash_password_async(password: str) -> str:
+    """hash_password'ün event loop'u bloklamayan, havuzda çalışan sürümü."""
+    return await password_pool.run(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    verify_password'ün event loop'u bloklamayan, havuzda çalışan sürümü.
+    Okunamayan hash (bcrypt dışı/bozuk) eşleşmeyen şifre gibi değerlendirilir.
+    """
+    try:
+        return await password_pool.run(verify_password, plain_password, hashed_password)
+    except ValueError:
+        return False
+
+
+# Bilinmeyen e-posta için doğrulama süresini eşitleyen hash (maliyet -> hash)
+_dummy_hashes: Dict[int, str] = {}
+
+
+async def dummy_verify_async(plain_password: str) -> None:
+    """
+    Kullanıcı bulunamadığında da bir bcrypt doğrulaması yapar; böylece
+    yanıt süresinden e-postanın kayıtlı olup olmadığı anlaşılmaz.
+    """
+    rounds = settings.BCRYPT_ROUNDS
+    if rounds not in _dummy_hashes:
+        _dummy_hashes[rounds] = await hash_password_async(secrets.token_urlsafe(16))
+    await verify_password_async(plain_password, _dummy_hashes[rounds])
@@ -69,6 +69,57 @@ class Settings(BaseSettings):
     LOG_HEADERS: bool = True
     MAX_LOG_BODY_SIZE: int = 10240  # 10KB
 
+    # Toplu işlem ayarları
+    BULK_CHUNK_SIZE: int = 500  # transaction başına satır
+    BULK_MAX_ROWS: int = 50000  # istek başına en fazla satır
+
+    # NDJSON streaming'de tek seferde okunan satır sayısı
+    STREAM_BATCH_SIZE: int = 500
+
+    # Ürün katalog indeksi (süreç içi LRU)
+    PRODUCT_CATALOG_SIZE: int = 10000
+
+    # Sipariş arşivleme
+    ARCHIVE_AFTER_DAYS: int = 365  # bu yaştan eski kapanmış siparişler
+    ARCHIVE_CHUNK_SIZE: int = 500  # transaction başına sipariş
+    ARCHIVE_PARTITIONING: bool = False  # PostgreSQL'de orders_archive partition'lı
+
+    # Stok defteri: görüntü çalışmasında transaction başına hareket id'si
+    LEDGER_CHUNK_SIZE: int = 100000
+    # Görüntüye alınmadan önce hareketin beklediği süre (saniye); en uzun
+    # yazma transaction'ından uzun olmalı
+    LEDGER_SETTLE_SECONDS: float = 60.0
+
+    # Tek kayıt GET'leri için süreç içi entity cache (0: kapalı)
+    ENTITY_CACHE_SIZE: int = 10000
+    ENTITY_CACHE_TTL: float = 30.0  # saniye
+
+    # Düşük stok tarayıcısı: çalışma aralığı (0: kapalı)
+    LOW_STOCK_SCAN_INTERVAL: float = 60.0  # saniye
+
+    # Stok değerleme raporları: yanıt cache süresi ve artımlı özet tablosu
+    REPORT_CACHE_TTL: float = 5.0  # saniye
+    VALUATION_SUMMARY: bool = False
+
+    # Product.stock / Stock.quantity mutabakatı: sorgu başına ürün id'si
+    RECONCILE_CHUNK_SIZE: int = 10000
+
+    # bcrypt: maliyet faktörü ve hash/doğrulama havuzu (iş parçacığı, kuyruk)
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_QUEUE_LIMIT: int = 32  # aşılırsa 503
+
+    # Doğrulanmış JWT claim cache'i (token özeti -> claim, 0: kapalı)
+    TOKEN_CACHE_SIZE: int = 10000
+
+    # Refresh token rotasyonu: süreç içi jti indeksinin boyutu
+    REFRESH_TOKEN_INDEX_SIZE: int = 100000
+
+    # Access token iptal listesi: Bloom filtresi boyutu ve yenileme aralığı
+    REVOCATION_BLOOM_CAPACITY: int = 100000
+    REVOCATION_BLOOM_ERROR_RATE: float = 0.01
+    REVOCATION_REFRESH_INTERVAL: float = 5.0  # saniye (0: kapalı)
+
     @field_validator("BACKEND_CORS_ORIGINS", mode="before")
     @classmethod
     def parse_cors_origins(cls, v):
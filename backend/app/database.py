@@ -7,8 +7,9 @@ import os
 
 from fastapi import HTTPException, status
 from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool, StaticPool
 
 from .core.settings import settings
 
@@ -16,6 +17,16 @@ from .core.settings import settings
 _engine = None
 _SessionLocal = None
 _database_url = None
+_async_engine = None
+_AsyncSessionLocal = None
+
+# Sync driver -> async driver eşlemesi
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+}
 
 
 def get_database_url():
@@ -30,8 +41,8 @@ def get_database_url():
             or os.getenv("TESTING")
             or os.getenv("PYTEST_CURRENT_TEST")
         ):
-            # Test ortamında SQLite
-            _database_url = "sqlite:///./test.db"
+            # Test ortamında SQLite (TEST_SQLITE_URL, varsayılan ./test.db)
+            _database_url = settings.TEST_SQLITE_URL
         elif environment == "development":
             # Development ortamında SQLite (hızlı geliştirme için)
             _database_url = "sqlite:///./dev.db"
@@ -83,6 +94,51 @@ def get_session_local():
     return _SessionLocal
 
 
+def get_async_database_url():
+    """
+    Database URL'ini async driver ile döndürür.
+    SQLite için aiosqlite, PostgreSQL için asyncpg kullanılır.
+    """
+    database_url = get_database_url()
+    scheme, sep, rest = database_url.partition("://")
+    return f"{ASYNC_DRIVERS.get(scheme, scheme)}{sep}{rest}"
+
+
+def get_async_engine():
+    """AsyncEngine'i lazy olarak oluşturur."""
+    global _async_engine
+    if _async_engine is None:
+        database_url = get_async_database_url()
+        if database_url.startswith("sqlite"):
+            # aiosqlite her bağlantı için ayrı thread açar, havuzlamaya gerek yok
+            _async_engine = create_async_engine(database_url, poolclass=NullPool)
+        else:
+            # PostgreSQL için connection pooling
+            _async_engine = create_async_engine(
+                database_url,
+                pool_size=5,
+                max_overflow=10,
+                pool_pre_ping=True,
+                echo=settings.DEBUG,
+            )
+    return _async_engine
+
+
+def get_async_session_local():
+    """AsyncSessionLocal'ı lazy olarak oluşturur."""
+    global _AsyncSessionLocal
+    if _AsyncSessionLocal is None:
+        # expire_on_commit=False: commit sonrası attribute erişimi
+        # event loop içinde implicit IO tetiklemesin
+        _AsyncSessionLocal = async_sessionmaker(
+            bind=get_async_engine(),
+            class_=AsyncSession,
+            autoflush=False,
+            expire_on_commit=False,
+        )
+    return _AsyncSessionLocal
+
+
 # Backward compatibility için - lazy loading
 def engine():
     return get_engine()
@@ -92,6 +148,10 @@ def SessionLocal():
     return get_session_local()()
 
 
+def AsyncSessionLocal():
+    return get_async_session_local()()
+
+
 # Test ortamı için özel session local
 def TestingSessionLocal():
     """Test ortamı için özel session local."""
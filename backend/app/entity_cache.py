@@ -0,0 +1,314 @@
+"""
+Tek kayıt GET'leri için read-through entity cache.
+GET /stocks/{id}, /users/{user_id} ve /orders/{order_id} yanıtları
+serileştirilmiş halde (JSON byte + ETag) süreç içi LRU'da tutulur.
+
+Kayıtlar TTL ve boyut sınırıyla düşer. ORM üzerinden yapılan yazımlar
+mapper event'leriyle, Core yazımları invalidate_after_commit ile
+işaretlenir ve commit sonrası yalnızca ilgili kayıtlar cache'ten silinir.
+Yanıta gömülen ürünler (sipariş kalemleri) payload'ın bağımlılıkları olarak
+saklanır; ürün yazımı onu içeren sipariş ve kullanıcı yanıtlarını da düşürür.
+Yanıt üretilirken commit edilen bir yazımın eski veriyi cache'e koymaması
+için set, üretim öncesi okunan invalidation sayacıyla (generation) yapılır.
+Başka süreçlerin yaptığı değişiklikler en geç TTL sonunda görülür.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+from fastapi import Response
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session, object_session
+
+from .core.settings import settings
+from .interfaces import CachedPayload, CacheInterface
+from .models import Address, Order, OrderItem, Product, Stock, User
+
+_PENDING_KEY = "entity_invalidations"
+
+# Cache'lenen (veya cache'lenen yanıtlara gömülen) modeller -> kayıt türü
+CACHED_ENTITIES = {Stock: "stock", User: "user", Order: "order", Product: "product"}
+
+_Key = Tuple[str, Hashable, str]
+
+
+class LRUEntityCache(CacheInterface):
+    """
+    TTL ve boyut sınırlı, süreç içi LRU entity cache.
+
+    Aynı kaydın farklı varyantları (örn. include parametresi) ayrı tutulur;
+    invalidate kaydın tüm varyantlarını ve ona bağımlı payload'ları
+    birlikte siler.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 10000,
+        ttl: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: "OrderedDict[_Key, Tuple[float, CachedPayload]]" = OrderedDict()
+        self._variants: Dict[Tuple[str, Hashable], set] = {}
+        # (entity, id) -> onu gömen payload anahtarları
+        self._dependents: Dict[Tuple[str, Hashable], set] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._counters = dict.fromkeys(
+            (
+                "hits",
+                "misses",
+                "evictions",
+                "expirations",
+                "invalidations",
+                "stale_sets",
+            ),
+            0,
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _pop(self, key: _Key) -> None:
+        item = self._entries.pop(key, None)
+        if item is not None:
+            for dependency in item[1].depends:
+                dependents = self._dependents.get(dependency)
+                if dependents is not None:
+                    dependents.discard(key)
+                    if not dependents:
+                        del self._dependents[dependency]
+        variants = self._variants.get(key[:2])
+        if variants is not None:
+            variants.discard(key[2])
+            if not variants:
+                del self._variants[key[:2]]
+
+    def get(
+        self, entity: str, entity_id: Hashable, variant: str = ""
+    ) -> Optional[CachedPayload]:
+        key = (entity, entity_id, variant)
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                self._counters["misses"] += 1
+                return None
+            expires_at, payload = item
+            if expires_at <= self._clock():
+                self._pop(key)
+                self._counters["expirations"] += 1
+                self._counters["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._counters["hits"] += 1
+            return payload
+
+    def set(
+        self,
+        entity: str,
+        entity_id: Hashable,
+        payload: CachedPayload,
+        variant: str = "",
+        generation: Optional[int] = None,
+    ) -> None:
+        if self.max_size <= 0:
+            return
+        key = (entity, entity_id, variant)
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                self._counters["stale_sets"] += 1
+                return
+            self._pop(key)
+            self._entries[key] = (self._clock() + self.ttl, payload)
+            self._variants.setdefault(key[:2], set()).add(variant)
+            for dependency in payload.depends:
+                self._dependents.setdefault(dependency, set()).add(key)
+            while len(self._entries) > self.max_size:
+                oldest = next(iter(self._entries))
+                self._pop(oldest)
+                self._counters["evictions"] += 1
+
+    def invalidate(self, entity: str, entity_id: Hashable) -> None:
+        with self._lock:
+            self._generation += 1
+            keys = [
+                (entity, entity_id, variant)
+                for variant in self._variants.get((entity, entity_id), ())
+            ]
+            keys.extend(self._dependents.get((entity, entity_id), ()))
+            for key in keys:
+                if key in self._entries:
+                    self._pop(key)
+                    self._counters["invalidations"] += 1
+
+    def generation(self) -> int:
+        return self._generation
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._variants.clear()
+            self._dependents.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                **self._counters,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+            }
+
+
+_entity_cache: CacheInterface = LRUEntityCache(
+    settings.ENTITY_CACHE_SIZE, settings.ENTITY_CACHE_TTL
+)
+
+
+def get_entity_cache() -> CacheInterface:
+    """Kullanılan entity cache backend'ini döndürür."""
+    return _entity_cache
+
+
+def set_entity_cache(cache: CacheInterface) -> None:
+    """Entity cache backend'ini değiştirir (örn. paylaşılan bir cache)."""
+    global _entity_cache
+    _entity_cache = cache
+
+
+async def cached_json(
+    entity: str,
+    entity_id: Hashable,
+    variant: str,
+    build: Callable[[], Awaitable[CachedPayload]],
+    cache: Optional[CacheInterface] = None,
+) -> Response:
+    """
+    Kaydın serileştirilmiş yanıtını cache'ten döndürür; yoksa üretip saklar.
+
+    Args:
+        entity: Kayıt türü ("stock", "user", "order")
+        entity_id: Kayıt kimliği
+        variant: Aynı kaydın farklı gösterimleri için anahtar (örn. include)
+        build: Cache'te yoksa yanıtı üreten fonksiyon (404 fırlatabilir)
+        cache: Kullanılacak cache (varsayılan: entity cache)
+
+    Returns:
+        Response: application/json yanıtı; X-Cache HIT veya MISS
+    """
+    if cache is None:
+        cache = get_entity_cache()
+    payload = cache.get(entity, entity_id, variant)
+    status = "HIT"
+    if payload is None:
+        # Üretim sırasında commit edilen yazım varsa sonuç saklanmaz
+        generation = cache.generation()
+        payload = await build()
+        cache.set(entity, entity_id, payload, variant, generation)
+        status = "MISS"
+    headers = {"X-Cache": status}
+    if payload.etag is not None:
+        headers["ETag"] = payload.etag
+    return Response(
+        content=payload.body, media_type="application/json", headers=headers
+    )
+
+
+def embedded_products(items: Iterable) -> Tuple[Tuple[str, Hashable], ...]:
+    """Yanıta gömülen sipariş kalemlerinin ürünleri (payload bağımlılıkları)."""
+    return tuple(sorted({("product", item.product_id) for item in items}))
+
+
+def invalidate_after_commit(
+    session, entity: str, entity_ids: Iterable[Hashable]
+) -> None:
+    """
+    Kayıtları oturum commit edildiğinde cache'ten düşürülecek olarak işaretler.
+    ORM event'lerini tetiklemeyen Core yazımları için kullanılır.
+    """
+    session = getattr(session, "sync_session", session)
+    pending = session.info.setdefault(_PENDING_KEY, set())
+    pending.update((entity, entity_id) for entity_id in entity_ids)
+
+
+async def invalidate_keys_after_commit(
+    db, model, column, keys: Iterable[Hashable]
+) -> None:
+    """
+    Benzersiz anahtarla (örn. product_name) Core üzerinden yazılan mevcut
+    kayıtları id'leri çözülerek commit sonrası düşürülecek olarak işaretler.
+    """
+    entity = CACHED_ENTITIES.get(model)
+    keys = list(keys)
+    if entity is None or not keys:
+        return
+    result = await db.execute(select(model.id).where(column.in_(keys)))
+    invalidate_after_commit(db, entity, result.scalars().all())
+
+
+# --- ORM event'leri: yazılan kayıtlar commit sonrası cache'ten düşer ---
+
+
+def _mark(target, *keys: Tuple[str, Hashable]) -> None:
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_PENDING_KEY, set()).update(
+            key for key in keys if key[1] is not None
+        )
+
+
+@event.listens_for(Product, "after_update")
+@event.listens_for(Product, "after_delete")
+def _product_written(mapper, connection, target):
+    # Ürünü gömen sipariş/kullanıcı yanıtları bağımlılık olarak düşer
+    _mark(target, ("product", target.id))
+
+
+@event.listens_for(Stock, "after_update")
+@event.listens_for(Stock, "after_delete")
+def _stock_written(mapper, connection, target):
+    _mark(target, ("stock", target.id))
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _user_written(mapper, connection, target):
+    _mark(target, ("user", target.id))
+
+
+@event.listens_for(Order, "after_insert")
+@event.listens_for(Order, "after_update")
+@event.listens_for(Order, "after_delete")
+def _order_written(mapper, connection, target):
+    # Kullanıcı detayı siparişleri de içerir
+    _mark(target, ("order", target.id), ("user", target.user_id))
+
+
+@event.listens_for(OrderItem, "after_insert")
+@event.listens_for(OrderItem, "after_update")
+@event.listens_for(OrderItem, "after_delete")
+def _order_item_written(mapper, connection, target):
+    _mark(target, ("order", target.order_id))
+
+
+@event.listens_for(Address, "after_insert")
+@event.listens_for(Address, "after_update")
+@event.listens_for(Address, "after_delete")
+def _address_written(mapper, connection, target):
+    _mark(target, ("user", target.user_id))
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_invalidations(session):
+    cache = get_entity_cache()
+    for entity, entity_id in session.info.pop(_PENDING_KEY, ()):
+        cache.invalidate(entity, entity_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_invalidations(session):
+    session.info.pop(_PENDING_KEY, None)
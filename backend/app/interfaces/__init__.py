@@ -4,7 +4,14 @@ Modüller arası bağımlılıkları azaltmak için interface'ler tanımlar.
 """
 
 from .auth_interface import AuthInterface
+from .cache_interface import CachedPayload, CacheInterface
 from .database_interface import DatabaseInterface
 from .settings_interface import SettingsInterface
 
-__all__ = ["AuthInterface", "DatabaseInterface", "SettingsInterface"]
+__all__ = [
+    "AuthInterface",
+    "CachedPayload",
+    "CacheInterface",
+    "DatabaseInterface",
+    "SettingsInterface",
+]
@@ -0,0 +1,64 @@
+"""
+Cache interface for loose coupling.
+"""
+
+from abc import ABC, abstractmethod
+from typing import Dict, Hashable, NamedTuple, Optional, Tuple
+
+
+class CachedPayload(NamedTuple):
+    """
+    Serialized response body and its ETag.
+
+    depends lists the (entity, id) pairs embedded in the body (e.g. nested
+    products); invalidating any of them drops the payload as well.
+    """
+
+    body: bytes
+    etag: Optional[str] = None
+    depends: Tuple[Tuple[str, Hashable], ...] = ()
+
+
+class CacheInterface(ABC):
+    """Entity cache interface for loose coupling."""
+
+    @abstractmethod
+    def get(
+        self, entity: str, entity_id: Hashable, variant: str = ""
+    ) -> Optional[CachedPayload]:
+        """Get a cached payload."""
+        pass
+
+    @abstractmethod
+    def set(
+        self,
+        entity: str,
+        entity_id: Hashable,
+        payload: CachedPayload,
+        variant: str = "",
+        generation: Optional[int] = None,
+    ) -> None:
+        """
+        Store a payload. If generation is given and invalidations happened
+        since it was read, the payload may be stale and is not stored.
+        """
+        pass
+
+    def generation(self) -> Optional[int]:
+        """Invalidation counter read before building a payload (None: untracked)."""
+        return None
+
+    @abstractmethod
+    def invalidate(self, entity: str, entity_id: Hashable) -> None:
+        """Drop every cached variant of an entity."""
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Drop all entries."""
+        pass
+
+    @abstractmethod
+    def stats(self) -> Dict[str, int]:
+        """Get hit/miss/eviction counters."""
+        pass
@@ -0,0 +1,240 @@
+"""
+Stok defteri.
+Stok hareketlerini (IN/OUT/TRANSFER) ürün/konum bakiyelerine uygular ve
+periyodik olarak stock_snapshots tablosuna anlık görüntü yazar. Bir
+zamandaki miktar, o zamandan önceki son görüntü ile sonrasındaki hareket
+kuyruğu toplanarak hesaplanır; tüm geçmiş taranmaz.
+
+Görüntü sınırı (watermark) hareket id'sidir. Id'ler INSERT anında
+dağıtılır, commit sırası farklı olabilir: küçük id'li bir hareket, daha
+büyük id'li bir hareketten sonra görünür hale gelebilir. Bu yüzden görüntü
+yalnızca LEDGER_SETTLE_SECONDS'tan eski hareketlere kadar ilerler; bu süre
+en uzun yazma transaction'ından uzun tutulmalıdır.
+
+Hareketlerin konumlara etkisi:
+    IN:       +|quantity| hedef konuma (yoksa kaynak)
+    OUT:      -|quantity| kaynak konumdan (yoksa hedef)
+    TRANSFER: -|quantity| kaynaktan, +|quantity| hedefe
+    diğer:    işaretli quantity hedef konuma (yoksa kaynak), örn. düzeltmeler
+"""
+
+import datetime
+import logging
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import and_, case, func, insert, literal, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .core.settings import settings
+from .models import StockMovement, StockSnapshot
+
+logger = logging.getLogger(__name__)
+
+# (product_id, location) -> miktar
+Balances = Dict[Tuple[int, Optional[str]], int]
+
+
+def naive_utc(value: datetime.datetime) -> datetime.datetime:
+    """Zaman dilimli değeri UTC'ye çevirip tzinfo'yu atar (kolonlar naive UTC)."""
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+
+
+def movement_legs(*where):
+    """
+    Hareketleri konum bacaklarına ayıran sorgu.
+
+    Her satır (id, product_id, location, delta, created_at) döner; TRANSFER
+    hareketleri kaynak ve hedef için iki satır üretir.
+    """
+    m = StockMovement
+    magnitude = func.abs(m.quantity)
+    primary = select(
+        m.id,
+        m.product_id,
+        case(
+            (
+                m.movement_type == "OUT",
+                func.coalesce(m.source_location, m.dest_location),
+            ),
+            (m.movement_type == "TRANSFER", m.source_location),
+            else_=func.coalesce(m.dest_location, m.source_location),
+        ).label("location"),
+        case(
+            (m.movement_type == "IN", magnitude),
+            (m.movement_type.in_(("OUT", "TRANSFER")), -magnitude),
+            else_=m.quantity,
+        ).label("delta"),
+        m.created_at,
+    ).where(*where)
+    transfer_in = select(
+        m.id,
+        m.product_id,
+        m.dest_location.label("location"),
+        magnitude.label("delta"),
+        m.created_at,
+    ).where(m.movement_type == "TRANSFER", *where)
+    return union_all(primary, transfer_in).subquery("legs")
+
+
+def latest_snapshots(upto: int, *where):
+    """movement_id <= upto olan son görüntüleri (ürün, konum başına) seçer."""
+    s = StockSnapshot
+    latest_ids = (
+        select(func.max(s.id))
+        .where(s.movement_id <= upto, *where)
+        .group_by(s.product_id, s.location)
+    )
+    return select(s.product_id, s.location, s.quantity).where(s.id.in_(latest_ids))
+
+
+async def _snapshot_chunk(
+    db: AsyncSession, after: int, upto: int, taken_at: datetime.datetime
+) -> int:
+    """(after, upto] aralığındaki hareketleri son görüntülere uygulayıp yazar."""
+    legs = movement_legs(StockMovement.id > after, StockMovement.id <= upto)
+    deltas = (
+        select(
+            legs.c.product_id,
+            legs.c.location,
+            func.sum(legs.c.delta).label("delta"),
+        )
+        .group_by(legs.c.product_id, legs.c.location)
+        .having(func.sum(legs.c.delta) != 0)
+        .subquery("deltas")
+    )
+    previous = latest_snapshots(after).subquery("previous")
+    rows = select(
+        deltas.c.product_id,
+        deltas.c.location,
+        func.coalesce(previous.c.quantity, 0) + deltas.c.delta,
+        literal(upto),
+        literal(taken_at),
+    ).select_from(
+        deltas.outerjoin(
+            previous,
+            and_(
+                previous.c.product_id == deltas.c.product_id,
+                previous.c.location.is_not_distinct_from(deltas.c.location),
+            ),
+        )
+    )
+    result = await db.execute(
+        insert(StockSnapshot).from_select(
+            ["product_id", "location", "quantity", "movement_id", "taken_at"], rows
+        )
+    )
+    return result.rowcount
+
+
+async def take_snapshots(
+    db: AsyncSession,
+    chunk_size: Optional[int] = None,
+    now: Optional[datetime.datetime] = None,
+) -> int:
+    """
+    Son görüntüden bu yana gelen hareketleri uygular ve yeni görüntü yazar.
+
+    Hareketler id aralıkları halinde, her aralık ayrı transaction'da
+    işlenir; yarıda kesilen çalışma kaldığı yerden devam eder. Yalnızca
+    bakiyesi değişen (ürün, konum) çiftleri için satır yazılır. Son
+    LEDGER_SETTLE_SECONDS içinde eklenen hareketler, önlerinde henüz commit
+    edilmemiş id'ler olabileceği için sonraki çalışmaya bırakılır.
+
+    Args:
+        db: Async veritabanı oturumu
+        chunk_size: Aralık başına hareket id'si (varsayılan: LEDGER_CHUNK_SIZE)
+        now: Görüntü zamanı (varsayılan: şimdi, UTC)
+
+    Returns:
+        int: Yazılan görüntü satırı sayısı
+    """
+    chunk_size = chunk_size or settings.LEDGER_CHUNK_SIZE
+    now = naive_utc(now or datetime.datetime.utcnow())
+    settled = now - datetime.timedelta(seconds=settings.LEDGER_SETTLE_SECONDS)
+    after = await db.scalar(select(func.max(StockSnapshot.movement_id))) or 0
+    last = (
+        await db.scalar(
+            select(func.max(StockMovement.id)).where(
+                StockMovement.created_at <= settled
+            )
+        )
+        or 0
+    )
+
+    written = 0
+    while after < last:
+        upto = min(after + chunk_size, last)
+        written += await _snapshot_chunk(db, after, upto, now)
+        await db.commit()
+        after = upto
+        logger.info(f"Stok defteri {upto} numaralı harekete kadar işlendi.")
+    return written
+
+
+async def quantities_at(
+    db: AsyncSession,
+    at: Optional[datetime.datetime] = None,
+    product_id: Optional[int] = None,
+    location: Optional[str] = None,
+) -> Balances:
+    """
+    Verilen zamandaki (ürün, konum) bakiyelerini hesaplar.
+
+    Zamandan önce alınmış son görüntü ile o görüntüden sonraki ve zamandan
+    önceki hareketler toplanır.
+
+    Args:
+        db: Async veritabanı oturumu
+        at: Sorgulanan zaman (varsayılan: şimdi, UTC; zaman dilimli değerler
+            UTC'ye çevrilir)
+        product_id: Yalnızca bu ürün
+        location: Yalnızca bu konum
+
+    Returns:
+        Balances: Sıfır olmayan bakiyeler
+    """
+    at = naive_utc(at or datetime.datetime.utcnow())
+    snapshot_filters = []
+    if product_id is not None:
+        snapshot_filters.append(StockSnapshot.product_id == product_id)
+    if location is not None:
+        snapshot_filters.append(StockSnapshot.location == location)
+    upto = (
+        await db.scalar(
+            select(func.max(StockSnapshot.movement_id)).where(
+                StockSnapshot.taken_at <= at
+            )
+        )
+        or 0
+    )
+
+    balances: Balances = {}
+    snapshots = await db.execute(latest_snapshots(upto, *snapshot_filters))
+    for pid, loc, quantity in snapshots:
+        balances[(pid, loc)] = quantity
+
+    movement_filters = [StockMovement.id > upto, StockMovement.created_at <= at]
+    if product_id is not None:
+        movement_filters.append(StockMovement.product_id == product_id)
+    legs = movement_legs(*movement_filters)
+    tail = select(legs.c.product_id, legs.c.location, func.sum(legs.c.delta))
+    if location is not None:
+        tail = tail.where(legs.c.location == location)
+    tail = tail.group_by(legs.c.product_id, legs.c.location)
+    for pid, loc, delta in await db.execute(tail):
+        balances[(pid, loc)] = balances.get((pid, loc), 0) + delta
+
+    return {key: quantity for key, quantity in balances.items() if quantity}
+
+
+async def quantity_at(
+    db: AsyncSession,
+    product_id: int,
+    location: Optional[str],
+    at: Optional[datetime.datetime] = None,
+) -> int:
+    """Ürünün konumdaki miktarını verilen zamanda döndürür."""
+    balances = await quantities_at(db, at, product_id, location)
+    return balances.get((product_id, location), 0)
@@ -3,9 +3,10 @@ FastAPI uygulaması ana dosyası.
 ERP sistemi için API endpoint'lerini sağlar.
 """
 
+import asyncio
 import logging
 import os
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 
 from fastapi import FastAPI, HTTPException, Request, status
 from fastapi.middleware.cors import CORSMiddleware
@@ -13,8 +14,11 @@ from fastapi.responses import JSONResponse
 from pydantic import ValidationError
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 
+from .alerts import run_scanner, scanner
+from .core.security import password_pool
 from .core.settings import settings
 from .database import Base
+from .entity_cache import get_entity_cache
 from .middleware import (
     LoggingMiddleware,
     RateLimitingMiddleware,
@@ -25,7 +29,18 @@ from .middleware.header_validation import (
     ContentTypeValidationMiddleware,
     HeaderValidationMiddleware,
 )
-from .routes import orders_router, stocks_router, users_router
+from .refresh_tokens import refresh_index
+from .revocation import revocation_list, run_revocation_refresh
+from .routes import (
+    auth_router,
+    imports_router,
+    orders_router,
+    stocks_router,
+    users_router,
+)
+from .routes.pagination import NEXT_CURSOR_HEADER
+from .token_cache import token_cache
+from .valuation import report_cache
 
 # Logging konfigürasyonu
 logging.basicConfig(level=logging.INFO)
@@ -42,6 +57,8 @@ async def lifespan(app: FastAPI):
     from .core.settings import settings
 
     is_testing = os.getenv("TESTING") or os.getenv("PYTEST_CURRENT_TEST")
+    scan_task = None
+    revocation_task = None
 
     if not settings.USE_MOCK and not is_testing:
         from .database import get_engine
@@ -49,6 +66,29 @@ async def lifespan(app: FastAPI):
         engine = get_engine()
         Base.metadata.create_all(bind=engine)
         logger.info("Veritabanı tabloları oluşturuldu.")
+
+        from .catalog import warm_catalog
+        from .database import AsyncSessionLocal
+
+        async with AsyncSessionLocal() as db:
+            count = await warm_catalog(db)
+        logger.info(f"Ürün kataloğu ısıtıldı: {count} ürün.")
+
+        async with AsyncSessionLocal() as db:
+            count = await revocation_list.refresh(db)
+        logger.info(f"Token iptal listesi yüklendi: {count} kayıt.")
+        if settings.REVOCATION_REFRESH_INTERVAL > 0:
+            revocation_task = asyncio.create_task(
+                run_revocation_refresh(
+                    AsyncSessionLocal, settings.REVOCATION_REFRESH_INTERVAL
+                )
+            )
+
+        if settings.LOW_STOCK_SCAN_INTERVAL > 0:
+            scan_task = asyncio.create_task(
+                run_scanner(AsyncSessionLocal, settings.LOW_STOCK_SCAN_INTERVAL)
+            )
+            logger.info("Düşük stok tarayıcısı başlatıldı.")
     else:
         if settings.USE_MOCK:
             logger.info("Mock modu aktif - veritabanı bağlantısı atlanıyor.")
@@ -59,6 +99,12 @@ async def lifespan(app: FastAPI):
 
     # Shutdown
     logger.info("Uygulama kapatılıyor...")
+    for task in (scan_task, revocation_task):
+        if task is not None:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+    password_pool.shutdown()
 
 
 app = FastAPI(
@@ -93,8 +139,10 @@ app = FastAPI(
             "description": "Monitoring ve health check endpoint'leri",
         },
         {"name": "users", "description": "Kullanıcı yönetimi endpoint'leri"},
+        {"name": "auth", "description": "Token yenileme endpoint'leri"},
         {"name": "orders", "description": "Sipariş yönetimi endpoint'leri"},
         {"name": "stocks", "description": "Stok yönetimi endpoint'leri"},
+        {"name": "imports", "description": "CSV içe aktarma endpoint'leri"},
     ],
 )
 
@@ -105,6 +153,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 # Production middleware'leri ekle
@@ -147,6 +196,7 @@ async def http_exception_handler(request: Request, exc: HTTPException):
             "status_code": exc.status_code,
             "path": str(request.url),
         },
+        headers=exc.headers,
     )
 
 
@@ -210,8 +260,10 @@ async def general_exception_handler(request: Request, exc: Exception):
 
 # Router'ları ekle
 app.include_router(users_router, prefix="/users", tags=["users"])
+app.include_router(auth_router, prefix="/auth", tags=["auth"])
 app.include_router(orders_router, prefix="/orders", tags=["orders"])
 app.include_router(stocks_router, prefix="/stocks", tags=["stocks"])
+app.include_router(imports_router, prefix="/imports", tags=["imports"])
 
 # Mock router'ı ekle (sadece USE_MOCK=true ise)
 if settings.USE_MOCK:
@@ -270,11 +322,31 @@ async def metrics():
             "process_create_time": process.create_time(),
         },
         "service": {"name": "GORU ERP API", "version": "1.0.0", "status": "healthy"},
+        "caches": cache_metrics(),
+        "low_stock_scanner": scanner.stats(),
+        "password_pool": password_pool.stats(),
+        "refresh_tokens": refresh_index.stats(),
+        "revocation": revocation_list.stats(),
     }
 
     return metrics_data
 
 
+def cache_metrics():
+    """Süreç içi cache sayaçları (hit/miss/eviction)."""
+    return {
+        "entity": get_entity_cache().stats(),
+        "report": report_cache.stats(),
+        "token": token_cache.stats(),
+    }
+
+
+@app.get("/metrics/cache", tags=["monitoring"])
+async def cache_metrics_endpoint():
+    """Cache hit/miss/eviction sayaçları"""
+    return cache_metrics()
+
+
 @app.get("/status", tags=["monitoring"])
 async def service_status():
     """Detaylı servis durumu endpoint'i"""
@@ -10,6 +10,9 @@ from fastapi import HTTPException, Request, Response, status
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.types import ASGIApp
 
+# POST/PUT/PATCH için kabul edilen gövde tipleri (text/csv: /imports/ yüklemeleri)
+ACCEPTED_CONTENT_TYPES = ("application/json", "text/csv")
+
 
 class HeaderValidationMiddleware(BaseHTTPMiddleware):
     """
@@ -108,8 +111,8 @@ class HeaderValidationMiddleware(BaseHTTPMiddleware):
         if not content_type:
             return False, "Missing Content-Type header"
 
-        # JSON Content-Type kontrolü
-        if not content_type.lower().startswith("application/json"):
+        # JSON Content-Type kontrolü (CSV içe aktarma hariç)
+        if not content_type.lower().startswith(ACCEPTED_CONTENT_TYPES):
             return False, "Invalid Content-Type. Expected: application/json"
 
         return True, ""
@@ -317,8 +320,8 @@ class ContentTypeValidationMiddleware(BaseHTTPMiddleware):
         if not content_type:
             return not self.strict_mode
 
-        # JSON Content-Type kontrolü
-        return content_type.lower().startswith("application/json")
+        # JSON Content-Type kontrolü (CSV içe aktarma hariç)
+        return content_type.lower().startswith(ACCEPTED_CONTENT_TYPES)
 
     async def dispatch(self, request: Request, call_next: Callable) -> Response:
         """Request'i işler ve Content-Type validation uygular."""
@@ -82,6 +82,12 @@ class LoggingMiddleware(BaseHTTPMiddleware):
         if not self.log_request_body:
             return ""
 
+        # Yalnızca JSON gövdeler okunur; CSV gibi büyük yüklemeler endpoint
+        # tarafından stream edildiği için burada belleğe alınmaz
+        content_type = request.headers.get("content-type", "")
+        if content_type and not content_type.lower().startswith("application/json"):
+            return f"[NOT LOGGED - {content_type}]"
+
         try:
             body = await request.body()
             if body:
@@ -10,10 +10,12 @@ from sqlalchemy import (
     DateTime,
     Float,
     ForeignKey,
+    Index,
     Integer,
     String,
     UniqueConstraint,
     func,
+    text,
 )
 from sqlalchemy.orm import declarative_base, relationship
 
@@ -54,6 +56,11 @@ class User(Base):
         "Address", back_populates="user", cascade="all, delete-orphan"
     )
 
+    __table_args__ = (
+        # Giriş ve e-posta tekillik kontrolü büyük/küçük harf duyarsız arar
+        Index("ix_users_email_lower", func.lower(email)),
+    )
+
 
 class Address(Base):
     """
@@ -113,9 +120,21 @@ class Product(Base):
         description: Ürün açıklaması
         is_active: Ürün aktif mi (1: evet, 0: hayır)
         created_at: Ürün oluşturma tarihi
+        updated_at: Son güncelleme tarihi (uyarı taraması için)
+        reorder_threshold: Yeniden sipariş eşiği (stock altına düşünce uyarı)
+        version: İyimser eşzamanlılık sürümü (her güncellemede artar)
     """
 
     __tablename__ = "products"
+    __table_args__ = (
+        # Yalnızca eşiğin altındaki satırlar indekslenir
+        Index(
+            "ix_products_below_reorder",
+            "id",
+            sqlite_where=text("stock < reorder_threshold"),
+            postgresql_where=text("stock < reorder_threshold"),
+        ),
+    )
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, unique=True, nullable=False, index=True)
     sku = Column(String, unique=True, nullable=False)
@@ -125,7 +144,17 @@ class Product(Base):
     description = Column(String)
     is_active = Column(Integer, default=1)
     created_at = Column(DateTime, server_default=func.now(), nullable=False)
+    updated_at = Column(
+        DateTime,
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+        index=True,
+    )
+    reorder_threshold = Column(Integer, nullable=True)
+    version = Column(Integer, nullable=False, default=1, server_default="1")
     category = relationship("Category")
+    __mapper_args__ = {"version_id_col": version}
 
 
 class Order(Base):
@@ -139,9 +168,15 @@ class Order(Base):
         total_amount: Toplam sipariş tutarı
         created_at: Sipariş oluşturma tarihi
         shipping_address_id: Teslimat adresi
+        version: İyimser eşzamanlılık sürümü (her güncellemede artar)
     """
 
     __tablename__ = "orders"
+    # Liste filtreleri (user_id/status + created_at aralığı) için
+    __table_args__ = (
+        Index("ix_orders_user_id_created_at", "user_id", "created_at"),
+        Index("ix_orders_status_created_at", "status", "created_at"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     status = Column(String, default="pending", nullable=False)
@@ -153,6 +188,8 @@ class Order(Base):
     )
     shipping_address_id = Column(Integer, ForeignKey("addresses.id"))
     shipping_address = relationship("Address")
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+    __mapper_args__ = {"version_id_col": version}
 
 
 class OrderItem(Base):
@@ -179,6 +216,60 @@ class OrderItem(Base):
     product = relationship("Product")
 
 
+class OrderArchive(Base):
+    """
+    Arşivlenmiş sipariş modeli.
+    Kapanmış (delivered, cancelled) eski siparişler orders tablosundan
+    aynı id ile buraya taşınır. PostgreSQL'de created_at'e göre range
+    partition olarak oluşturulabilir; bu yüzden birincil anahtar
+    (id, created_at) çiftidir. user_id ve shipping_address_id FK değil
+    yalnızca değerdir; arşiv, kullanıcı adresleriyle birlikte silindikten
+    sonra da korunur.
+
+    Attributes:
+        id: Orijinal sipariş kimliği
+        created_at: Sipariş oluşturma tarihi (partition anahtarı)
+        archived_at: Arşivlenme tarihi
+    """
+
+    __tablename__ = "orders_archive"
+    id = Column(Integer, primary_key=True)
+    created_at = Column(DateTime, primary_key=True)
+    user_id = Column(Integer, nullable=False, index=True)
+    status = Column(String, nullable=False)
+    total_amount = Column(Float, nullable=False)
+    shipping_address_id = Column(Integer)
+    archived_at = Column(DateTime, server_default=func.now(), nullable=False)
+    order_items = relationship(
+        "OrderItemArchive",
+        primaryjoin="OrderArchive.id == foreign(OrderItemArchive.order_id)",
+        order_by="OrderItemArchive.id",
+        viewonly=True,
+    )
+    shipping_address = relationship(
+        "Address",
+        primaryjoin="foreign(OrderArchive.shipping_address_id) == Address.id",
+        viewonly=True,
+    )
+
+
+class OrderItemArchive(Base):
+    """
+    Arşivlenmiş sipariş kalemi modeli.
+    order_id, partition'lı arşiv tablosuna FK tanımlanamadığı için yalnızca
+    indekslidir.
+    """
+
+    __tablename__ = "order_items_archive"
+    id = Column(Integer, primary_key=True)
+    order_id = Column(Integer, nullable=False, index=True)
+    product_id = Column(Integer, ForeignKey("products.id"), nullable=False)
+    quantity = Column(Integer, nullable=False)
+    unit_price = Column(Float, nullable=False)
+    total_price = Column(Float, nullable=False)
+    product = relationship("Product")
+
+
 class StockMovement(Base):
     """
     Stok hareketi modeli.
@@ -203,6 +294,39 @@ class StockMovement(Base):
     product = relationship("Product")
 
 
+class StockSnapshot(Base):
+    """
+    Stok defteri anlık görüntüsü.
+
+    Bir ürünün bir konumdaki miktarını, movement_id'ye kadar (dahil) olan
+    tüm stok hareketleri uygulanmış haliyle saklar.
+
+    Attributes:
+        id: Benzersiz kimlik
+        product_id: Ürün kimliği
+        location: Stok konumu
+        quantity: Konumdaki miktar
+        movement_id: Uygulanan son stok hareketi kimliği
+        taken_at: Görüntünün alındığı zaman
+    """
+
+    __tablename__ = "stock_snapshots"
+    __table_args__ = (
+        Index(
+            "ix_stock_snapshots_product_location",
+            "product_id",
+            "location",
+            "movement_id",
+        ),
+    )
+    id = Column(Integer, primary_key=True)
+    product_id = Column(Integer, ForeignKey("products.id"), nullable=False)
+    location = Column(String, nullable=True)
+    quantity = Column(Integer, nullable=False)
+    movement_id = Column(Integer, nullable=False)
+    taken_at = Column(DateTime, server_default=func.now(), nullable=False, index=True)
+
+
 class Stock(Base):
     """
     Stok modeli.
@@ -210,19 +334,165 @@ class Stock(Base):
     Attributes:
         id: Benzersiz stok kimliği
         product_name: Ürün adı (benzersiz)
+        product_id: Bağlı ürün kimliği (ürün adından çözülür)
         quantity: Stok miktarı
         unit_price: Birim fiyat
         supplier: Tedarikçi
         location: Stok konumu
         created_at: Stok kaydı oluşturma tarihi
+        updated_at: Son güncelleme tarihi (uyarı taraması için)
+        reorder_threshold: Yeniden sipariş eşiği (quantity altına düşünce uyarı)
+        version: İyimser eşzamanlılık sürümü (her güncellemede artar)
     """
 
     __tablename__ = "stocks"
-    __table_args__ = (UniqueConstraint("product_name", name="uq_product_name"),)
+    __table_args__ = (
+        UniqueConstraint("product_name", name="uq_product_name"),
+        Index("ix_stocks_location", "location"),
+        # Yalnızca eşiğin altındaki satırlar indekslenir
+        Index(
+            "ix_stocks_below_reorder",
+            "id",
+            sqlite_where=text("quantity < reorder_threshold"),
+            postgresql_where=text("quantity < reorder_threshold"),
+        ),
+    )
     id = Column(Integer, primary_key=True, index=True)
     product_name = Column(String, unique=True, nullable=False, index=True)
+    product_id = Column(Integer, ForeignKey("products.id"), nullable=True, index=True)
     quantity = Column(Integer, nullable=False, default=0)
     unit_price = Column(Float, nullable=False, default=0.0)
     supplier = Column(String, nullable=True)
     location = Column(String, nullable=True)
     created_at = Column(DateTime, server_default=func.now(), nullable=False)
+    updated_at = Column(
+        DateTime,
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+        index=True,
+    )
+    reorder_threshold = Column(Integer, nullable=True)
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+    __mapper_args__ = {"version_id_col": version}
+
+
+class LowStockAlert(Base):
+    """
+    Düşük stok uyarısı.
+
+    Eşiğin altına düşen stok veya ürün satırı başına bir kayıt; satır eşiğin
+    üstüne çıkınca tarayıcı kaydı siler.
+
+    Attributes:
+        id: Benzersiz uyarı kimliği
+        item_type: Kaynak tablo ("stock" veya "product")
+        item_id: Kaynak satır kimliği
+        name: Ürün adı
+        quantity: Son taramadaki miktar
+        reorder_threshold: Son taramadaki eşik
+        detected_at: Uyarının ilk tespit edildiği zaman
+    """
+
+    __tablename__ = "low_stock_alerts"
+    __table_args__ = (
+        UniqueConstraint("item_type", "item_id", name="uq_low_stock_alerts_item"),
+    )
+    id = Column(Integer, primary_key=True)
+    item_type = Column(String, nullable=False)
+    item_id = Column(Integer, nullable=False)
+    name = Column(String, nullable=False)
+    quantity = Column(Integer, nullable=False)
+    reorder_threshold = Column(Integer, nullable=False)
+    detected_at = Column(DateTime, server_default=func.now(), nullable=False)
+
+
+class StockValuationSummary(Base):
+    """
+    Stok değerleme özet tablosu.
+
+    Boyut (location/supplier) ve değer başına stok satırlarının toplamını
+    tutar; yalnızca değişen gruplar yeniden hesaplanır.
+
+    Attributes:
+        id: Benzersiz kimlik
+        dimension: Gruplama kolonu ("location" veya "supplier")
+        key: Grup değeri (tanımsızsa NULL)
+        items: Gruptaki stok satırı sayısı
+        quantity: Toplam miktar
+        value: Toplam değer (sum(quantity * unit_price))
+        refreshed_at: Grubun son hesaplandığı zaman
+    """
+
+    __tablename__ = "stock_valuation_summary"
+    __table_args__ = (
+        Index("ix_stock_valuation_summary_dimension_key", "dimension", "key"),
+    )
+    id = Column(Integer, primary_key=True)
+    dimension = Column(String, nullable=False)
+    key = Column(String, nullable=True)
+    items = Column(Integer, nullable=False)
+    quantity = Column(Integer, nullable=False)
+    value = Column(Float, nullable=False)
+    refreshed_at = Column(DateTime, server_default=func.now(), nullable=False)
+
+
+class JobCheckpoint(Base):
+    """
+    Artımlı çalışan periyodik işlerin kaldığı yer.
+
+    Attributes:
+        name: İş adı (örn. "stock_reconciliation")
+        checkpoint: Son tamamlanan çalışmanın başladığı zaman
+        updated_at: Kaydın son yazıldığı zaman
+    """
+
+    __tablename__ = "job_checkpoints"
+    name = Column(String, primary_key=True)
+    checkpoint = Column(DateTime, nullable=False)
+    updated_at = Column(
+        DateTime, server_default=func.now(), onupdate=func.now(), nullable=False
+    )
+
+
+class RefreshToken(Base):
+    """
+    Refresh token rotasyon kaydı.
+
+    Her yenilemede kullanılan token used_at ile işaretlenir ve aynı aileden
+    yeni token üretilir. Kullanılmış bir token tekrar gelirse aile iptal edilir.
+
+    Attributes:
+        jti: Token kimliği (JWT jti claim'i)
+        user_id: Token'ın ait olduğu kullanıcı
+        family_id: Aynı girişten türeyen token zincirinin kimliği
+        expires_at: Ailenin mutlak geçerlilik sonu (UTC)
+        used_at: Token'ın yenilemede kullanıldığı zaman
+        revoked_at: Ailenin iptal edildiği zaman
+        created_at: Oluşturma zamanı
+    """
+
+    __tablename__ = "refresh_tokens"
+    jti = Column(String, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    family_id = Column(String, nullable=False, index=True)
+    expires_at = Column(DateTime, nullable=False)
+    used_at = Column(DateTime, nullable=True)
+    revoked_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+
+
+class RevokedToken(Base):
+    """
+    İptal edilmiş access token.
+
+    Attributes:
+        jti: Token kimliği (JWT jti claim'i)
+        expires_at: Token'ın exp zamanı (UTC); sonrasında kayıt silinebilir
+        revoked_at: İptal zamanı (artımlı yenileme bu kolona bakar)
+    """
+
+    __tablename__ = "revoked_tokens"
+    jti = Column(String, primary_key=True)
+    expires_at = Column(DateTime, nullable=False, index=True)
+    revoked_at = Column(DateTime, server_default=func.now(), nullable=False, index=True)
@@ -0,0 +1,253 @@
+"""
+Product.stock ile Stock.quantity mutabakatı.
+products.stock satılabilir miktardır: siparişler verilirken düşülür, stok
+satırlarına dokunulmaz; teslim edilen sipariş de stok satırlarından
+düşülmez. Bu yüzden ürüne bağlı (product_id) stok satırlarının toplamından
+iptal edilmemiş tüm siparişlerin (arşive taşınmış teslim edilenler dahil)
+kalem miktarları çıkarılarak products.stock ile karşılaştırılır; fark
+SQL'de, ürün id aralıkları halinde hesaplanır.
+
+Rapor modunda farklar yalnızca döndürülür. Düzeltme modunda stok satırları
+esas alınır: products.stock stok toplamı eksi rezervasyona eşitlenir ve
+farkı kadar işaretli ADJUST stok hareketi yazılır (defter bunu konumsuz
+düzeltme olarak uygular).
+
+Artımlı çalışmada yalnızca son checkpoint'ten beri updated_at'i değişen
+ürünler ve ürünü bu satırlara bağlı stoklar ziyaret edilir. Silinen veya
+başka ürüne bağlanan stok satırlarının eski ürünü bu yolla görülmez;
+periyodik olarak tam çalışma (full) yapılmalıdır.
+"""
+
+import datetime
+import logging
+from typing import AsyncIterator, Callable, List, NamedTuple, Optional
+
+from sqlalchemy import func, insert, select, union, union_all, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .core.settings import settings
+from .entity_cache import invalidate_after_commit
+from .models import (
+    JobCheckpoint,
+    Order,
+    OrderArchive,
+    OrderItem,
+    OrderItemArchive,
+    Product,
+    Stock,
+    StockMovement,
+)
+from .routes.common import upsert_statement, version_bump
+from .routes.inventory import CANCELLED_STATUS
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_NAME = "stock_reconciliation"
+ADJUSTMENT_TYPE = "ADJUST"
+
+# updated_at saniye çözünürlüklü olabilir ve PostgreSQL'de now() transaction
+# başlangıcıdır; checkpoint sınırındaki satırlar kaçmasın diye pencere örtüşür.
+CHECKPOINT_OVERLAP = datetime.timedelta(seconds=5)
+
+
+class Drift(NamedTuple):
+    """Bir ürünün products.stock değeri ile beklenen değer arasındaki fark."""
+
+    product_id: int
+    product_stock: int
+    stock_quantity: int
+    reserved: int = 0
+
+    @property
+    def expected(self) -> int:
+        """Stok satırları toplamı eksi siparişlerin rezerve ettiği miktar."""
+        return self.stock_quantity - self.reserved
+
+    @property
+    def delta(self) -> int:
+        return self.expected - self.product_stock
+
+
+class ReconcileReport(NamedTuple):
+    """Mutabakat çalışmasının sonucu."""
+
+    chunks: int
+    drifts: List[Drift]
+    corrected: int
+
+
+def drift_query(scope: Callable):
+    """
+    Kapsamdaki ürünler için stok toplamı eksi rezervasyon products.stock'tan
+    farklı olanlar.
+
+    Rezervasyon, iptal edilmemiş siparişlerin sıcak ve arşiv tablolarındaki
+    kalemleridir; arşivleme teslim edilen siparişin düşümünü geri almaz.
+
+    Args:
+        scope: Ürün id kolonunu alıp kapsam koşulunu döndüren fonksiyon;
+            ürün, stok ve (arşiv) sipariş kalemi product_id'leri için uygulanır
+    """
+    totals = (
+        select(Stock.product_id, func.sum(Stock.quantity).label("quantity"))
+        .where(scope(Stock.product_id))
+        .group_by(Stock.product_id)
+        .subquery("totals")
+    )
+    items = union_all(
+        select(OrderItem.product_id, OrderItem.quantity)
+        .join(Order, Order.id == OrderItem.order_id)
+        .where(scope(OrderItem.product_id), Order.status != CANCELLED_STATUS),
+        select(OrderItemArchive.product_id, OrderItemArchive.quantity)
+        .join(OrderArchive, OrderArchive.id == OrderItemArchive.order_id)
+        .where(
+            scope(OrderItemArchive.product_id),
+            OrderArchive.status != CANCELLED_STATUS,
+        ),
+    ).subquery("items")
+    reservations = (
+        select(items.c.product_id, func.sum(items.c.quantity).label("quantity"))
+        .group_by(items.c.product_id)
+        .subquery("reservations")
+    )
+    reserved = func.coalesce(reservations.c.quantity, 0)
+    return (
+        select(Product.id, Product.stock, totals.c.quantity, reserved)
+        .join(totals, totals.c.product_id == Product.id)
+        .outerjoin(reservations, reservations.c.product_id == Product.id)
+        .where(scope(Product.id), Product.stock != totals.c.quantity - reserved)
+        .order_by(Product.id)
+    )
+
+
+async def _correct(db: AsyncSession, drifts: List[Drift]) -> int:
+    """
+    Farkları stok satırları (eksi rezervasyon) lehine düzeltir ve ADJUST
+    hareketi yazar.
+
+    products.stock okunduğu değerdeyse güncellenir; arada sipariş vb. ile
+    değişen ürün atlanır ve bir sonraki çalışmada yeniden değerlendirilir.
+    """
+    movements = []
+    for drift in drifts:
+        result = await db.execute(
+            update(Product)
+            .where(
+                Product.id == drift.product_id,
+                Product.stock == drift.product_stock,
+            )
+            .values(stock=drift.expected, **version_bump(Product.__table__))
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount == 1:
+            invalidate_after_commit(db, "product", [drift.product_id])
+            movements.append(
+                {
+                    "product_id": drift.product_id,
+                    "movement_type": ADJUSTMENT_TYPE,
+                    "quantity": drift.delta,
+                }
+            )
+    if movements:
+        await db.execute(insert(StockMovement), movements)
+    return len(movements)
+
+
+async def _changed_product_ids(db: AsyncSession, since, after: int, limit: int):
+    """since'ten beri değişen ürün/stok satırlarının ürün id'leri (keyset)."""
+    changed = union(
+        select(Product.id.label("id")).where(Product.updated_at >= since),
+        select(Stock.product_id.label("id")).where(
+            Stock.updated_at >= since, Stock.product_id.is_not(None)
+        ),
+    ).subquery("changed")
+    result = await db.execute(
+        select(changed.c.id)
+        .where(changed.c.id > after)
+        .order_by(changed.c.id)
+        .limit(limit)
+    )
+    return result.scalars().all()
+
+
+async def _scopes(
+    db: AsyncSession, since: Optional[datetime.datetime], chunk_size: int
+) -> AsyncIterator[Callable]:
+    """
+    Ziyaret edilecek ürün parçalarının kapsam koşullarını üretir.
+
+    since None ise tüm ürün id aralığı, değilse yalnızca since'ten beri
+    değişen ürün id'leri parça parça döner.
+    """
+    if since is None:
+        low, high = (
+            await db.execute(select(func.min(Product.id), func.max(Product.id)))
+        ).one()
+        if low is None:
+            return
+        for lo in range(low, high + 1, chunk_size):
+            yield lambda column, lo=lo: column.between(lo, lo + chunk_size - 1)
+        return
+    after = 0
+    while True:
+        ids = await _changed_product_ids(
+            db, since - CHECKPOINT_OVERLAP, after, chunk_size
+        )
+        if not ids:
+            return
+        after = ids[-1]
+        yield lambda column, ids=ids: column.in_(ids)
+
+
+async def reconcile_stock(
+    db: AsyncSession,
+    fix: bool = False,
+    full: bool = False,
+    chunk_size: Optional[int] = None,
+) -> ReconcileReport:
+    """
+    Product.stock ile Stock.quantity toplamı eksi rezervasyonları karşılaştırır.
+
+    Ürünler id aralıkları halinde işlenir; her aralık ayrı transaction'dır.
+    Checkpoint yalnızca çalışma tamamlanınca ilerler, yarıda kalan çalışma
+    tekrarlandığında düzeltilmiş ürünler yeniden fark vermez.
+
+    Args:
+        db: Async veritabanı oturumu
+        fix: Farkları ADJUST hareketiyle düzelt (False: yalnızca rapor)
+        full: Checkpoint'i yok sayıp tüm ürünleri ziyaret et
+        chunk_size: Parça başına ürün id'si (varsayılan: RECONCILE_CHUNK_SIZE)
+
+    Returns:
+        ReconcileReport: İşlenen parça sayısı, farklar, düzeltilenler
+    """
+    chunk_size = chunk_size or settings.RECONCILE_CHUNK_SIZE
+    started = (await db.execute(select(func.now()))).scalar_one()
+    since = None
+    if not full:
+        since = await db.scalar(
+            select(JobCheckpoint.checkpoint).where(
+                JobCheckpoint.name == CHECKPOINT_NAME
+            )
+        )
+
+    chunks, corrected, drifts = 0, 0, []
+    async for scope in _scopes(db, since, chunk_size):
+        rows = await db.execute(drift_query(scope))
+        found = [Drift(*row) for row in rows]
+        drifts.extend(found)
+        if fix and found:
+            corrected += await _correct(db, found)
+        await db.commit()
+        chunks += 1
+
+    await db.execute(
+        upsert_statement(db, JobCheckpoint.__table__, ["name"], ["checkpoint"]),
+        {"name": CHECKPOINT_NAME, "checkpoint": started},
+    )
+    await db.commit()
+    if drifts:
+        logger.warning(
+            f"Stok mutabakatı: {len(drifts)} farklı ürün, {corrected} düzeltildi"
+        )
+    return ReconcileReport(chunks, drifts, corrected)
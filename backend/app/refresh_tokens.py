@@ -0,0 +1,297 @@
+"""
+Refresh token rotasyonu.
+Her refresh token refresh_tokens tablosunda bir satırdır; yenilemede
+kullanılan token used_at ile işaretlenir ve aynı aileden (family_id) yeni
+token üretilir. Kullanılmış veya iptal edilmiş bir token tekrar gelirse
+(çalınmış token belirtisi) tüm aile iptal edilir.
+
+Token durumları süreç içi bir indekste (jti -> durum) tutulur; indekste
+bulunan token için tablo okunmaz. Kullanıldı/iptal durumları kesindir ve
+indeksten doğrudan reddedilir. "Kullanılmadı" görünen token ise koşullu
+UPDATE (used_at IS NULL) ile işaretlenir; başka bir süreç token'ı önce
+kullandıysa UPDATE satır etkilemez ve yeniden kullanım olarak ele alınır.
+Yeni token'lar indekse ancak satırları commit edildikten sonra eklenir.
+"""
+
+import datetime
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Dict, NamedTuple, Optional, Set
+
+from fastapi import HTTPException, status
+from sqlalchemy import event, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from .auth import USER_ROLES
+from .core.security import create_access_token, create_refresh_token, verify_token
+from .core.settings import settings
+from .models import RefreshToken, User
+
+INVALID_REFRESH_DETAIL = "Geçersiz refresh token / Invalid refresh token"
+REUSED_REFRESH_DETAIL = (
+    "Refresh token yeniden kullanıldı, oturum kapatıldı / "
+    "Refresh token reuse detected, session revoked"
+)
+
+# Commit bekleyen indeks kayıtlarının tutulduğu session.info anahtarı
+_PENDING_KEY = "refresh_index_puts"
+
+
+class TokenState(NamedTuple):
+    """İndekslenen refresh token durumu."""
+
+    user_id: int
+    family_id: str
+    expires_at: datetime.datetime
+    used: bool = False
+    revoked: bool = False
+
+
+class RefreshTokenIndex:
+    """
+    refresh_tokens tablosunun süreç içi, boyut sınırlı jti indeksi.
+
+    Tablo esastır; indeksten düşen token gerektiğinde tablodan yeniden okunur.
+    """
+
+    def __init__(self, max_size: int = 100000):
+        self.max_size = max_size
+        self._states: "OrderedDict[str, TokenState]" = OrderedDict()
+        self._families: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+        self._counters = dict.fromkeys(("hits", "misses", "rotations", "reuses"), 0)
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def get(self, jti: str) -> Optional[TokenState]:
+        with self._lock:
+            state = self._states.get(jti)
+            self._counters["hits" if state is not None else "misses"] += 1
+            if state is not None:
+                self._states.move_to_end(jti)
+            return state
+
+    def put(self, jti: str, state: TokenState) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._states[jti] = state
+            self._states.move_to_end(jti)
+            self._families.setdefault(state.family_id, set()).add(jti)
+            while len(self._states) > self.max_size:
+                old_jti, old = self._states.popitem(last=False)
+                self._discard_family_member(old.family_id, old_jti)
+
+    def _discard_family_member(self, family_id: str, jti: str) -> None:
+        members = self._families.get(family_id)
+        if members is not None:
+            members.discard(jti)
+            if not members:
+                del self._families[family_id]
+
+    def mark_used(self, jti: str) -> None:
+        with self._lock:
+            state = self._states.get(jti)
+            if state is not None:
+                self._states[jti] = state._replace(used=True)
+            self._counters["rotations"] += 1
+
+    def revoke_family(self, family_id: str) -> None:
+        with self._lock:
+            for jti in self._families.get(family_id, ()):
+                self._states[jti] = self._states[jti]._replace(revoked=True)
+            self._counters["reuses"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._states.clear()
+            self._families.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                **self._counters,
+                "size": len(self._states),
+                "max_size": self.max_size,
+            }
+
+
+refresh_index = RefreshTokenIndex(settings.REFRESH_TOKEN_INDEX_SIZE)
+
+
+def _utcnow() -> datetime.datetime:
+    return datetime.datetime.utcnow()
+
+
+def access_claims(user: User) -> dict:
+    """Kullanıcı için access token claim'leri."""
+    return {
+        "sub": str(user.id),
+        "email": user.email,
+        "role": user.role,
+        "permissions": USER_ROLES.get(user.role, USER_ROLES["user"]),
+    }
+
+
+def issue_refresh_token(
+    db: AsyncSession,
+    user_id: int,
+    family_id: Optional[str] = None,
+    expires_at: Optional[datetime.datetime] = None,
+) -> str:
+    """
+    Yeni bir refresh token satırı ekler ve imzalı token'ı döndürür.
+    Commit çağırana aittir; token indekse commit sonrasında eklenir.
+
+    Args:
+        db: Async veritabanı oturumu
+        user_id: Token sahibi
+        family_id: Rotasyon ailesi (None: yeni giriş, yeni aile)
+        expires_at: Ailenin mutlak geçerlilik sonu (None: REFRESH_TOKEN_EXPIRE_DAYS)
+
+    Returns:
+        str: Encoded JWT refresh token
+    """
+    jti = uuid.uuid4().hex
+    family_id = family_id or uuid.uuid4().hex
+    expires_at = expires_at or _utcnow() + datetime.timedelta(
+        days=settings.REFRESH_TOKEN_EXPIRE_DAYS
+    )
+    db.add(
+        RefreshToken(
+            jti=jti, user_id=user_id, family_id=family_id, expires_at=expires_at
+        )
+    )
+    db.sync_session.info.setdefault(_PENDING_KEY, []).append(
+        (jti, TokenState(user_id, family_id, expires_at))
+    )
+    return create_refresh_token(
+        {"sub": str(user_id), "jti": jti, "fam": family_id},
+        expires_delta=expires_at - _utcnow(),
+    )
+
+
+async def _load_state(db: AsyncSession, jti: str) -> Optional[TokenState]:
+    state = refresh_index.get(jti)
+    if state is not None:
+        return state
+    row = await db.get(RefreshToken, jti)
+    if row is None:
+        return None
+    state = TokenState(
+        row.user_id,
+        row.family_id,
+        row.expires_at,
+        used=row.used_at is not None,
+        revoked=row.revoked_at is not None,
+    )
+    refresh_index.put(jti, state)
+    return state
+
+
+async def _revoke_family(db: AsyncSession, family_id: str) -> None:
+    await db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.family_id == family_id, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=_utcnow())
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    refresh_index.revoke_family(family_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_index_puts(session):
+    for jti, state in session.info.pop(_PENDING_KEY, ()):
+        refresh_index.put(jti, state)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_index_puts(session):
+    session.info.pop(_PENDING_KEY, None)
+
+
+def _unauthorized(detail: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail=detail,
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+async def rotate_refresh_token(db: AsyncSession, token: str) -> dict:
+    """
+    Refresh token'ı tek kullanımlık olarak tüketir; yeni access ve refresh
+    token döndürür. Şifre doğrulaması yapılmaz.
+
+    Args:
+        db: Async veritabanı oturumu
+        token: İstemcinin elindeki refresh token
+
+    Returns:
+        dict: access_token, refresh_token, token_type
+
+    Raises:
+        HTTPException: 401, token geçersiz/süresi dolmuş/yeniden kullanılmışsa
+    """
+    payload = verify_token(token)
+    jti = payload.get("jti")
+    if payload.get("type") != "refresh" or not jti:
+        raise _unauthorized(INVALID_REFRESH_DETAIL)
+
+    state = await _load_state(db, jti)
+    if state is None or state.expires_at <= _utcnow():
+        raise _unauthorized(INVALID_REFRESH_DETAIL)
+    if state.used or state.revoked:
+        await _revoke_family(db, state.family_id)
+        raise _unauthorized(REUSED_REFRESH_DETAIL)
+
+    consumed = await db.execute(
+        update(RefreshToken)
+        .where(
+            RefreshToken.jti == jti,
+            RefreshToken.used_at.is_(None),
+            RefreshToken.revoked_at.is_(None),
+        )
+        .values(used_at=_utcnow())
+        .execution_options(synchronize_session=False)
+    )
+    if consumed.rowcount != 1:
+        # Başka bir süreç/istek token'ı önce kullandı veya aile iptal edildi
+        await db.rollback()
+        await _revoke_family(db, state.family_id)
+        raise _unauthorized(REUSED_REFRESH_DETAIL)
+
+    user = (
+        await db.execute(
+            select(User).where(User.id == state.user_id, User.is_active == 1)
+        )
+    ).scalar_one_or_none()
+    if user is None:
+        await db.rollback()
+        raise _unauthorized(INVALID_REFRESH_DETAIL)
+
+    refresh_token = issue_refresh_token(db, user.id, state.family_id, state.expires_at)
+    await db.commit()
+    refresh_index.mark_used(jti)
+    return {
+        "access_token": create_access_token(access_claims(user)),
+        "refresh_token": refresh_token,
+        "token_type": "bearer",
+    }
+
+
+async def revoke_refresh_token(db: AsyncSession, token: str) -> None:
+    """
+    Refresh token'ın ailesini iptal eder (çıkış). Geçersiz veya süresi dolmuş
+    token'lar yok sayılır; zaten kullanılamazlar.
+    """
+    try:
+        payload = verify_token(token)
+    except HTTPException:
+        return
+    if payload.get("type") == "refresh" and payload.get("fam"):
+        await _revoke_family(db, payload["fam"])
@@ -0,0 +1,233 @@
+"""
+Access token iptal listesi.
+İptal edilen token'ların jti'leri revoked_tokens tablosunda tutulur ve
+süreç içinde bir Bloom filtresi ile kesin bir kümeye yansıtılır.
+
+İstek başına kontrol önce Bloom filtresine bakar; iptal edilmemiş token'ların
+neredeyse tamamı filtrede negatif döner ve veritabanına veya kümeye
+gidilmez. Filtre pozitifleri kesin kümede doğrulanır. Bit konumları Python'un
+str nesnesinde önbelleklenen hash'inden türetilir; filtre her süreçte
+yeniden kurulduğu için hash rastgeleleştirmesi sorun değildir.
+
+Liste başlangıçta tablodan kurulur, sonra yalnızca okunan en büyük
+revoked_at değerinden (filigran) sonraki satırlar okunur. Filigran
+yenilemenin saatinden değil okunan satırlardan alınır; böylece now()'u
+yenilemeden önce alınıp daha sonra commit edilen iptaller kaçmaz. Bu
+süreçte yapılan iptaller anında, başka süreçlerinkiler en geç bir
+yenileme aralığı sonra görülür.
+"""
+
+import asyncio
+import datetime
+import logging
+import math
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .core.settings import settings
+from .models import RevokedToken
+
+logger = logging.getLogger(__name__)
+
+# revoked_at saniye çözünürlüklü olabilir ve eşzamanlı transaction'lar
+# filigrandan biraz eski revoked_at ile commit edebilir; sınırdaki satırlar
+# kaçmasın
+REFRESH_OVERLAP = datetime.timedelta(seconds=5)
+
+
+class BloomFilter:
+    """
+    Sabit boyutlu Bloom filtresi (double hashing, bytearray bit dizisi).
+
+    Args:
+        capacity: Hedeflenen en fazla eleman sayısı
+        error_rate: capacity elemanda beklenen yanlış pozitif oranı
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        capacity = max(capacity, 1)
+        self.capacity = capacity
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def add(self, key: str) -> None:
+        h = hash(key)
+        step = (h >> 32) | 1
+        for i in range(self.hashes):
+            bit = (h + i * step) % self.size
+            self._bits[bit >> 3] |= 1 << (bit & 7)
+
+    def __contains__(self, key: str) -> bool:
+        h = hash(key)
+        step = (h >> 32) | 1
+        bits = self._bits
+        size = self.size
+        for i in range(self.hashes):
+            bit = (h + i * step) % size
+            if not bits[bit >> 3] & (1 << (bit & 7)):
+                return False
+        return True
+
+
+class RevocationList:
+    """
+    Bloom filtresi + kesin küme ile tutulan iptal edilmiş jti listesi.
+
+    Attributes:
+        since: Okunan en büyük revoked_at (henüz satır okunmadıysa None)
+        loaded: Liste tablodan kurulduysa True
+    """
+
+    def __init__(self):
+        self.since: Optional[datetime.datetime] = None
+        self.loaded = False
+        # (filtre, jti -> expires_at); yenilemede birlikte değiştirilir
+        self._state: Tuple[BloomFilter, Dict[str, datetime.datetime]] = (
+            self._new_filter(()),
+            {},
+        )
+        self._lock = asyncio.Lock()
+        self._counters = dict.fromkeys(("checks", "filter_positives", "revoked"), 0)
+
+    @staticmethod
+    def _new_filter(keys: Iterable[str], count: int = 0) -> BloomFilter:
+        bloom = BloomFilter(
+            max(settings.REVOCATION_BLOOM_CAPACITY, 2 * count),
+            settings.REVOCATION_BLOOM_ERROR_RATE,
+        )
+        for key in keys:
+            bloom.add(key)
+        return bloom
+
+    def __len__(self) -> int:
+        return len(self._state[1])
+
+    def is_revoked(self, jti: Optional[str]) -> bool:
+        """jti iptal edildiyse True (jti'siz token'lar iptal edilemez)."""
+        self._counters["checks"] += 1
+        if jti is None:
+            return False
+        bloom, exact = self._state
+        if jti not in bloom:
+            return False
+        self._counters["filter_positives"] += 1
+        if jti in exact:
+            self._counters["revoked"] += 1
+            return True
+        return False
+
+    def add(self, jti: str, expires_at: datetime.datetime) -> None:
+        """jti'yi süreç içi listeye ekler; filtre dolarsa büyütülerek kurulur."""
+        bloom, exact = self._state
+        exact[jti] = expires_at
+        if len(exact) > bloom.capacity:
+            self._rebuild(exact)
+        else:
+            bloom.add(jti)
+
+    def _rebuild(self, exact: Dict[str, datetime.datetime]) -> None:
+        now = datetime.datetime.utcnow()
+        live = {jti: exp for jti, exp in exact.items() if exp > now}
+        self._state = (self._new_filter(live, len(live)), live)
+
+    def clear(self) -> None:
+        self.since = None
+        self.loaded = False
+        self._state = (self._new_filter(()), {})
+
+    async def refresh(self, db: AsyncSession) -> int:
+        """
+        İlk çağrıda listeyi tablodan kurar, sonrakilerde yalnızca filigrandan
+        (okunan en büyük revoked_at) sonra eklenen satırları okur.
+
+        Args:
+            db: Async veritabanı oturumu
+
+        Returns:
+            int: Okunan satır sayısı
+        """
+        async with self._lock:
+            stmt = select(
+                RevokedToken.jti, RevokedToken.expires_at, RevokedToken.revoked_at
+            ).where(RevokedToken.expires_at > datetime.datetime.utcnow())
+            if self.since is not None:
+                stmt = stmt.where(
+                    RevokedToken.revoked_at >= self.since - REFRESH_OVERLAP
+                )
+            rows = (await db.execute(stmt)).all()
+            if not self.loaded:
+                self._rebuild({jti: expires_at for jti, expires_at, _ in rows})
+                self.loaded = True
+            else:
+                for jti, expires_at, _ in rows:
+                    self.add(jti, expires_at)
+            if rows:
+                latest = max(revoked_at for _, _, revoked_at in rows)
+                self.since = max(latest, self.since or latest)
+            return len(rows)
+
+    def stats(self) -> Dict[str, object]:
+        bloom, exact = self._state
+        return {
+            **self._counters,
+            "size": len(exact),
+            "filter_capacity": bloom.capacity,
+            "since": self.since.isoformat() if self.since else None,
+        }
+
+
+revocation_list = RevocationList()
+
+
+async def revoke_token(
+    db: AsyncSession, jti: str, expires_at: datetime.datetime
+) -> None:
+    """
+    jti'yi iptal eder: tabloya yazar ve süreç içi listeye hemen ekler.
+    İdempotenttir; aynı jti'yi eşzamanlı iptal eden istekten sonra gelen
+    istek çakışmayı zaten iptal edilmiş olarak ele alır.
+
+    Args:
+        db: Async veritabanı oturumu
+        jti: İptal edilecek token kimliği
+        expires_at: Token'ın exp zamanı (UTC); sonrasında kayıt temizlenir
+    """
+    db.add(RevokedToken(jti=jti, expires_at=expires_at))
+    try:
+        await db.commit()
+    except IntegrityError:
+        # Aynı jti zaten tabloda
+        await db.rollback()
+    revocation_list.add(jti, expires_at)
+
+
+async def purge_expired(db: AsyncSession) -> int:
+    """Süresi dolmuş (artık doğrulanamayan) token kayıtlarını siler."""
+    result = await db.execute(
+        delete(RevokedToken).where(
+            RevokedToken.expires_at <= datetime.datetime.utcnow()
+        )
+    )
+    await db.commit()
+    return result.rowcount
+
+
+async def run_revocation_refresh(
+    session_factory: Callable[[], AsyncSession], interval: float
+) -> None:
+    """
+    İptal listesini uygulama kapanana kadar her interval saniyede bir yeniler.
+    Veritabanı hataları loglanır, sonraki turda tekrar denenir.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            async with session_factory() as db:
+                await revocation_list.refresh(db)
+                await purge_expired(db)
+        except SQLAlchemyError:
+            logger.exception("İptal listesi yenilemesi başarısız")
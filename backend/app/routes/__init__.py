@@ -3,7 +3,9 @@ Route modülleri için paket.
 Tüm API endpoint'leri için modüller içerir.
 """
 
-from .common import create_tables_if_needed, get_db
+from .auth import router as auth_router
+from .common import create_tables_if_needed, get_async_db, get_db
+from .imports import router as imports_router
 from .orders import router as orders_router
 from .stocks import router as stocks_router
 from .users import router as users_router
@@ -0,0 +1,121 @@
+"""
+Kimlik doğrulama token endpoint'leri.
+Refresh token ile şifre doğrulaması yapmadan yeni access token alınmasını,
+çıkışta ve ele geçirilen token'lar için token iptalini sağlar.
+"""
+
+import datetime
+from typing import Optional
+
+from app.auth import check_permission, get_current_user, security, verify_token
+from app.core.settings import settings
+from app.refresh_tokens import revoke_refresh_token, rotate_refresh_token
+from app.revocation import revoke_token
+from app.routes.common import get_async_db
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+router = APIRouter()
+
+
+class RefreshRequest(BaseModel):
+    refresh_token: str
+
+
+class LogoutRequest(BaseModel):
+    refresh_token: Optional[str] = None
+
+
+class RevokeRequest(BaseModel):
+    jti: str
+    expires_at: Optional[datetime.datetime] = None
+
+
+@router.post(
+    "/refresh",
+    summary="Token yenile / Refresh token",
+    responses={
+        200: {"description": "Yeni token çifti / New token pair"},
+        401: {
+            "description": "Geçersiz, süresi dolmuş veya yeniden kullanılmış "
+            "refresh token / Invalid, expired or reused refresh token"
+        },
+    },
+)
+async def refresh(
+    refresh_data: RefreshRequest,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    TR: Refresh token'ı tüketir, yeni access ve refresh token döndürür.
+    Kullanılmış token tekrar gönderilirse aynı girişten türeyen tüm
+    refresh token'lar iptal edilir.
+    EN: Consumes the refresh token and returns a new access and refresh token.
+    Replaying a used token revokes every refresh token of that login.
+    """
+    return await rotate_refresh_token(db, refresh_data.refresh_token)
+
+
+@router.post(
+    "/logout",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Çıkış / Logout",
+    responses={
+        204: {"description": "Token'lar iptal edildi / Tokens revoked"},
+        401: {"description": "Yetkisiz / Unauthorized"},
+    },
+)
+async def logout(
+    logout_data: Optional[LogoutRequest] = None,
+    db: AsyncSession = Depends(get_async_db),
+    user_auth=Depends(get_current_user),
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
+):
+    """
+    TR: İstekteki access token'ı iptal eder; refresh token gönderildiyse
+    o girişin tüm refresh token'larını da iptal eder.
+    EN: Revokes the presented access token and, when a refresh token is sent,
+    every refresh token of that login.
+    """
+    try:
+        claims = verify_token(credentials.credentials) if credentials else {}
+    except HTTPException:
+        # jti'siz eski token'lar iptal edilemez
+        claims = {}
+    if claims.get("jti") and claims.get("exp"):
+        expires_at = datetime.datetime.utcfromtimestamp(claims["exp"])
+        await revoke_token(db, claims["jti"], expires_at)
+    if logout_data and logout_data.refresh_token:
+        await revoke_refresh_token(db, logout_data.refresh_token)
+
+
+@router.post(
+    "/revoke",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Token iptal et / Revoke token",
+    responses={
+        204: {"description": "Token iptal edildi / Token revoked"},
+        401: {"description": "Yetkisiz / Unauthorized"},
+        403: {"description": "Yetersiz yetki / Insufficient permissions"},
+    },
+)
+async def revoke(
+    revoke_data: RevokeRequest,
+    db: AsyncSession = Depends(get_async_db),
+    user_auth=Depends(check_permission("admin")),
+):
+    """
+    TR: jti'si verilen access token'ı iptal eder (ele geçirilen token'lar).
+    expires_at verilmezse ACCESS_TOKEN_EXPIRE_MINUTES sonrası kabul edilir.
+    EN: Revokes the access token with the given jti (compromised tokens).
+    Without expires_at, ACCESS_TOKEN_EXPIRE_MINUTES from now is assumed.
+    """
+    expires_at = revoke_data.expires_at or (
+        datetime.datetime.utcnow()
+        + datetime.timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    )
+    if expires_at.tzinfo is not None:
+        expires_at = expires_at.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    await revoke_token(db, revoke_data.jti, expires_at)
@@ -4,10 +4,31 @@ Tüm route modülleri tarafından kullanılan ortak işlevleri içerir.
 """
 
 import os
-from typing import Generator
+from typing import (
+    Any,
+    AsyncGenerator,
+    Dict,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+)
 
-from app.database import Base, SessionLocal, get_engine
+from app.database import AsyncSessionLocal, Base, SessionLocal, get_engine
+from fastapi import Header, HTTPException, Response
+from pydantic import ValidationError
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import flag_modified
+from sqlalchemy.orm.exc import StaleDataError
+
+PRECONDITION_FAILED_DETAIL = (
+    "Kayıt başka bir istekle değiştirildi / Record was modified by another request"
+)
 
 
 def get_db() -> Generator[Session, None, None]:
@@ -25,6 +46,180 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    TR: Her istek için async veritabanı oturumu sağlar.
+    EN: Provides an async database session per request.
+
+    Yields:
+        AsyncSession: Async veritabanı oturumu
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def chunked(items: Sequence[Any], size: int) -> Iterator[List[Any]]:
+    """
+    Listeyi sabit boyutlu parçalara böler.
+
+    Args:
+        items: Bölünecek liste
+        size: Parça boyutu
+
+    Yields:
+        List: Sıradaki parça
+    """
+    for start in range(0, len(items), size):
+        yield list(items[start : start + size])
+
+
+async def existing_ids(
+    db: AsyncSession, column: Any, ids: Iterable[Any], chunk_size: int = 500
+) -> Set[Any]:
+    """
+    Verilen değerlerden veritabanında bulunanları set-based IN sorgusuyla döndürür.
+
+    Args:
+        db: Async veritabanı oturumu
+        column: Aranacak kolon (örn. models.User.id)
+        ids: Aranacak değerler
+        chunk_size: Tek IN sorgusundaki en fazla değer
+
+    Returns:
+        Set: Bulunan değerler
+    """
+    found = set()
+    for chunk in chunked(sorted(set(ids)), chunk_size):
+        result = await db.execute(select(column).where(column.in_(chunk)))
+        found.update(result.scalars().all())
+    return found
+
+
+def format_validation_error(error: ValidationError) -> str:
+    """Pydantic doğrulama hatasını tek satırlık mesaja çevirir."""
+    return "; ".join(
+        f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}"
+        for err in error.errors()
+    )
+
+
+def upsert_statement(
+    db: AsyncSession, table: Any, conflict_columns: List[str], update_columns: List[str]
+):
+    """
+    Dialect'e uygun INSERT ... ON CONFLICT DO UPDATE ifadesi üretir.
+
+    Args:
+        db: Async veritabanı oturumu (dialect tespiti için)
+        table: Hedef tablo
+        conflict_columns: Benzersiz kısıtı oluşturan kolonlar
+        update_columns: Çakışmada güncellenecek kolonlar (boşsa DO NOTHING)
+
+    Returns:
+        Insert: executemany ile çalıştırılabilecek ifade
+
+    Raises:
+        RuntimeError: Dialect PostgreSQL veya SQLite değilse
+    """
+    dialect = db.bind.dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise RuntimeError(
+            f"Upsert yalnızca PostgreSQL ve SQLite'ta desteklenir, dialect: "
+            f"{dialect} / Upsert is only supported on PostgreSQL and SQLite, "
+            f"got dialect: {dialect}"
+        )
+    stmt = insert(table)
+    if not update_columns:
+        return stmt.on_conflict_do_nothing(index_elements=conflict_columns)
+    return stmt.on_conflict_do_update(
+        index_elements=conflict_columns,
+        set_={
+            **{name: stmt.excluded[name] for name in update_columns},
+            **version_bump(table),
+        },
+    )
+
+
+def version_bump(table: Any) -> Dict[str, Any]:
+    """
+    Core UPDATE'lerin değerlerine eklenecek sürüm artışı.
+
+    ORM dışı güncellemeler version_id_col'u kendiliğinden artırmaz; eski
+    sürümü tutan istemcilerin değişikliği ezmemesi için açıkça artırılır.
+    ON CONFLICT DO UPDATE onupdate'i uygulamadığından updated_at da yazılır.
+    """
+    values = {}
+    if "version" in table.c:
+        values["version"] = table.c.version + 1
+    if "updated_at" in table.c:
+        values["updated_at"] = func.now()
+    return values
+
+
+def if_match_version(
+    if_match: Optional[str] = Header(
+        None,
+        description='Beklenen sürüm (ETag) / Expected version (ETag), örn. "3"',
+    ),
+) -> Optional[int]:
+    """If-Match header'ını sürüm numarasına çevirir; yoksa veya * ise None."""
+    if if_match is None or if_match.strip() == "*":
+        return None
+    value = if_match.strip()
+    if value.startswith("W/"):
+        value = value[2:]
+    try:
+        return int(value.strip('"'))
+    except ValueError:
+        raise HTTPException(
+            status_code=400, detail=f"Geçersiz If-Match / Invalid If-Match: {if_match}"
+        )
+
+
+def etag_for(obj: Any) -> Optional[str]:
+    """Kaydın sürümünden ETag değeri üretir; sürümsüz kayıtlar için None."""
+    version = getattr(obj, "version", None)
+    return None if version is None else f'"{version}"'
+
+
+def set_etag(response: Response, obj: Any) -> None:
+    """Kaydın sürümünü ETag header'ı olarak yazar."""
+    etag = etag_for(obj)
+    if etag is not None:
+        response.headers["ETag"] = etag
+
+
+def ensure_version(obj: Any, expected: Optional[int]) -> None:
+    """Beklenen sürüm verildiyse kaydın sürümüyle eşleşmesini ister (412)."""
+    if expected is not None and obj.version != expected:
+        raise HTTPException(status_code=412, detail=PRECONDITION_FAILED_DETAIL)
+
+
+async def commit_versioned(db: AsyncSession, obj: Any, touch: str) -> None:
+    """
+    Sürümlü kaydı commit eder.
+
+    UPDATE ... WHERE id = ? AND version = ? olarak yazılır; bu arada başka
+    bir istek kaydı güncellediyse satır eşleşmez ve 412 döner. touch alanı
+    değişmiş sayılır, böylece yalnızca ilişkiler değişse de sürüm artar.
+
+    Args:
+        db: Async veritabanı oturumu
+        obj: Güncellenen ORM nesnesi
+        touch: Değişmiş işaretlenecek kolon adı
+    """
+    flag_modified(obj, touch)
+    try:
+        await db.commit()
+    except StaleDataError:
+        await db.rollback()
+        raise HTTPException(status_code=412, detail=PRECONDITION_FAILED_DETAIL)
+
+
 def create_tables_if_needed():
     """Tabloları sadece production ortamında oluşturur."""
     if (
@@ -0,0 +1,174 @@
+"""
+Liste endpoint'leri için filtre ve sıralama parametreleri.
+
+Filtreler `alan=değer` veya `alan[op]=değer` biçiminde verilir, örn.
+`?status=pending&created_at[gte]=2024-01-01&sort=-created_at`. Her model
+için izin verilen alanlar, operatörler ve sıralama anahtarları açıkça
+listelenir; listede olmayan alan veya operatör 400 döner.
+"""
+
+import datetime
+import re
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional
+
+from app import models
+from fastapi import HTTPException, Query, Request
+from sqlalchemy import inspect
+
+COMPARISON_OPS = ("eq", "gt", "gte", "lt", "lte")
+EQUALITY_OPS = ("eq", "in")
+
+_OPERATORS = {
+    "eq": lambda column, value: column == value,
+    "gt": lambda column, value: column > value,
+    "gte": lambda column, value: column >= value,
+    "lt": lambda column, value: column < value,
+    "lte": lambda column, value: column <= value,
+    "in": lambda column, values: column.in_(values),
+}
+
+_FILTER_KEY = re.compile(r"^(\w+)(?:\[(\w+)\])?$")
+
+
+class SortKey(NamedTuple):
+    """Sıralama anahtarı; token cursor'a yazılan `-alan` biçimidir."""
+
+    name: str
+    column: object
+    descending: bool
+
+    @property
+    def token(self) -> str:
+        return f"-{self.name}" if self.descending else self.name
+
+
+class ListQuery(NamedTuple):
+    """Çözülmüş filtre koşulları ve sıralama anahtarı."""
+
+    clauses: List
+    sort: Optional[SortKey]
+
+
+def coerce_value(column, raw: str):
+    """
+    Query string değerini kolon tipine çevirir.
+
+    Raises:
+        ValueError: Değer kolon tipine uymuyorsa
+    """
+    python_type = column.type.python_type
+    if python_type is datetime.datetime:
+        return datetime.datetime.fromisoformat(raw)
+    if python_type is datetime.date:
+        return datetime.date.fromisoformat(raw)
+    return python_type(raw)
+
+
+def _invalid(detail: str) -> HTTPException:
+    return HTTPException(
+        status_code=400, detail=f"Geçersiz filtre / Invalid filter: {detail}"
+    )
+
+
+def list_query_param(
+    model, filters: Dict[str, Iterable[str]], sorts: Iterable[str]
+) -> Callable[..., ListQuery]:
+    """
+    Filtre ve ?sort= parametreleri için dependency üretir.
+
+    Args:
+        model: Filtrelenecek ORM modeli
+        filters: Alan adı -> izin verilen operatörler
+        sorts: Sıralanabilir alan adları (id dışında null olmayan kolonlar)
+
+    Returns:
+        Callable: ListQuery döndüren FastAPI dependency'si
+    """
+    columns = inspect(model).columns
+    filters = {name: frozenset(ops) for name, ops in filters.items()}
+    sorts = frozenset(sorts)
+    filter_help = ", ".join(
+        f"{name}[{'|'.join(sorted(ops))}]" for name, ops in sorted(filters.items())
+    )
+
+    def parse_list_query(
+        request: Request,
+        sort: Optional[str] = Query(
+            None,
+            description="Sıralama, azalan için '-' öneki / Sort key, '-' prefix "
+            f"for descending: {', '.join(sorted(sorts))}. "
+            f"Filtreler / Filters: {filter_help}",
+        ),
+    ) -> ListQuery:
+        clauses = []
+        for key, raw in request.query_params.multi_items():
+            match = _FILTER_KEY.match(key)
+            if not match:
+                continue
+            name, op = match.group(1), match.group(2)
+            if name not in filters:
+                # Köşeli parantezli anahtar her zaman filtredir; düz
+                # anahtarlar diğer parametreler (limit, cursor...) olabilir
+                if op is not None:
+                    raise _invalid(key)
+                continue
+            op = op or "eq"
+            if op not in filters[name]:
+                raise _invalid(key)
+            column = columns[name]
+            try:
+                if op == "in":
+                    value = [coerce_value(column, v) for v in raw.split(",") if v]
+                else:
+                    value = coerce_value(column, raw)
+            except ValueError:
+                raise _invalid(f"{key}={raw}")
+            clauses.append(_OPERATORS[op](column, value))
+
+        sort_key = None
+        if sort:
+            name = sort.lstrip("-")
+            if name not in sorts:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Geçersiz sıralama / Invalid sort: {sort}",
+                )
+            sort_key = SortKey(name, columns[name], sort.startswith("-"))
+        return ListQuery(clauses, sort_key)
+
+    return parse_list_query
+
+
+# Model bazlı izinler; filtrelenen alanlar indekslerle desteklenir
+# (orders(user_id, created_at), orders(status, created_at), stocks(location))
+ORDER_LIST_QUERY = list_query_param(
+    models.Order,
+    {
+        "status": EQUALITY_OPS,
+        "user_id": EQUALITY_OPS,
+        "created_at": COMPARISON_OPS,
+        "total_amount": COMPARISON_OPS,
+    },
+    ("id", "created_at", "total_amount"),
+)
+STOCK_LIST_QUERY = list_query_param(
+    models.Stock,
+    {
+        "location": EQUALITY_OPS,
+        "supplier": EQUALITY_OPS,
+        "product_name": EQUALITY_OPS,
+        "product_id": EQUALITY_OPS,
+        "quantity": COMPARISON_OPS,
+        "unit_price": COMPARISON_OPS,
+    },
+    ("id", "product_name", "quantity", "unit_price", "created_at"),
+)
+USER_LIST_QUERY = list_query_param(
+    models.User,
+    {
+        "role": EQUALITY_OPS,
+        "is_active": EQUALITY_OPS,
+        "created_at": COMPARISON_OPS,
+    },
+    ("id", "name", "created_at"),
+)
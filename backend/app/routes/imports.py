@@ -0,0 +1,267 @@
+"""
+Stok ve ürünler için streaming CSV içe aktarma.
+Dosya istek gövdesinden (veya CLI'da diskten) parça parça okunur, satırlar
+partiler halinde doğrulanıp toplu upsert ile yazılır. Bellek kullanımı
+dosya boyutundan bağımsız olarak parti boyutuyla sınırlıdır.
+"""
+
+import codecs
+import csv
+import datetime
+import logging
+import uuid
+from collections import OrderedDict
+from typing import AsyncIterable, AsyncIterator, Dict, List, Tuple
+
+from app import models, schemas
+from app.auth import get_current_user
+from app.catalog import product_catalog
+from app.core.settings import settings
+from app.routes.common import format_validation_error, get_async_db
+from app.routes.inventory import link_stock_products
+from app.routes.upserts import Row, drop_duplicates, reject, upsert_rows
+from fastapi import APIRouter, Depends, HTTPException, Request
+from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+# Tür -> (doğrulama şeması, model, upsert anahtarı)
+IMPORT_KINDS = {
+    "stocks": (schemas.StockCreate, models.Stock, "product_name"),
+    "products": (schemas.ProductCreate, models.Product, "name"),
+}
+
+# İş geçmişinde tutulan en fazla iş ve iş başına saklanan en fazla hata
+MAX_JOBS = 50
+MAX_JOB_ERRORS = 100
+# Tek kaydın en fazla uzunluğu; kapanmamış tırnak belleği şişirmesin
+MAX_RECORD_CHARS = 1_000_000
+
+_jobs: "OrderedDict[str, schemas.ImportJobRead]" = OrderedDict()
+
+
+def start_job(kind: str) -> schemas.ImportJobRead:
+    """Yeni bir içe aktarma işi kaydeder; en eski işler düşürülür."""
+    job = schemas.ImportJobRead(
+        id=uuid.uuid4().hex, kind=kind, started_at=datetime.datetime.utcnow()
+    )
+    _jobs[job.id] = job
+    while len(_jobs) > MAX_JOBS:
+        _jobs.popitem(last=False)
+    return job
+
+
+async def csv_records(chunks: AsyncIterable[bytes]) -> AsyncIterator[List[str]]:
+    """
+    Byte parçalarından CSV kayıtlarını artımlı olarak üretir.
+
+    Bir kayıt, tırnak sayısı çift olana kadar satırlar birleştirilerek
+    tamamlanır; böylece tırnak içindeki satır sonları parça sınırına denk
+    gelse de kayıt bölünmez. Satırlar sonlandırıcılarıyla birlikte
+    csv.reader'a verilir; tırnak içindeki CRLF korunur, tırnak dışındaki
+    sonlandırıcıyı csv.reader kendisi ayıklar.
+
+    Args:
+        chunks: Byte parçaları (istek gövdesi veya dosya)
+
+    Yields:
+        List[str]: Sıradaki kaydın alanları
+    """
+    iterator = chunks.__aiter__()
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    buffer = ""
+    record: List[str] = []
+    quotes = record_chars = 0
+    final = False
+    while not final:
+        try:
+            chunk = await iterator.__anext__()
+            buffer += decoder.decode(chunk)
+        except StopAsyncIteration:
+            buffer += decoder.decode(b"", final=True)
+            final = True
+        *lines, buffer = buffer.split("\n")
+        lines = [line + "\n" for line in lines]
+        if final and buffer:
+            lines.append(buffer)
+        complete = []
+        for line in lines:
+            record.append(line)
+            record_chars += len(line)
+            quotes += line.count('"')
+            if quotes % 2 == 0:
+                complete.append("".join(record))
+                record, quotes, record_chars = [], 0, 0
+        if record_chars + len(buffer) > MAX_RECORD_CHARS:
+            raise csv.Error("Kayıt çok uzun / Record too long")
+        for fields in csv.reader(complete):
+            if fields:
+                yield fields
+    if record:
+        raise csv.Error("Kapanmamış tırnak / Unterminated quoted field")
+
+
+def _validate(kind: str, batch: List[Tuple[int, Dict[str, str]]], summary) -> List[Row]:
+    """Parti satırlarını türün şemasıyla doğrular."""
+    schema, _, _ = IMPORT_KINDS[kind]
+    valid = []
+    for index, payload in batch:
+        try:
+            values = schema.model_validate(payload).model_dump(exclude_unset=True)
+        except ValidationError as e:
+            reject(summary, index, format_validation_error(e))
+            continue
+        if "is_active" in values:
+            # Model kolonu Integer (1/0)
+            values["is_active"] = int(values["is_active"])
+        valid.append((index, values))
+    return valid
+
+
+async def _write_batch(
+    db: AsyncSession,
+    kind: str,
+    batch: List[Tuple[int, Dict[str, str]]],
+    job: schemas.ImportJobRead,
+) -> None:
+    _, model, key = IMPORT_KINDS[kind]
+    summary = schemas.BulkUpsertResponse()
+    rows = drop_duplicates(_validate(kind, batch, summary), key, summary)
+    if model is models.Stock:
+        rows = await link_stock_products(db, rows, summary)
+    await upsert_rows(db, model, key, rows, summary)
+    if model is models.Product:
+        # Core upsert ORM event'lerini tetiklemez; katalog kayıtlarını düşür
+        for _, values in rows:
+            product_catalog.discard_name(values[key])
+    job.rows += len(batch)
+    job.inserted += summary.inserted
+    job.updated += summary.updated
+    job.rejected += summary.rejected
+    room = MAX_JOB_ERRORS - len(job.errors)
+    job.errors.extend(sorted(summary.errors, key=lambda e: e.index)[:room])
+
+
+async def run_import(
+    db: AsyncSession,
+    kind: str,
+    chunks: AsyncIterable[bytes],
+    job: schemas.ImportJobRead,
+) -> schemas.ImportJobRead:
+    """
+    CSV içeriğini partiler halinde doğrulayıp upsert eder.
+
+    İlk kayıt başlık satırıdır. Boş hücreler gönderilmemiş sayılır.
+    İlerleme job üzerinde anlık güncellenir.
+
+    Args:
+        db: Async veritabanı oturumu
+        kind: IMPORT_KINDS anahtarı
+        chunks: CSV byte parçaları
+        job: İlerlemenin yazılacağı iş
+
+    Returns:
+        schemas.ImportJobRead: Tamamlanan (veya başarısız) iş
+    """
+    header = None
+    batch = []
+    try:
+        index = 0
+        async for fields in csv_records(chunks):
+            if header is None:
+                header = [name.strip() for name in fields]
+                continue
+            index += 1
+            if len(fields) != len(header):
+                job.rows += 1
+                job.rejected += 1
+                if len(job.errors) < MAX_JOB_ERRORS:
+                    job.errors.append(
+                        schemas.BulkRowError(
+                            index=index,
+                            error="Kolon sayısı uyuşmuyor / Column count mismatch",
+                        )
+                    )
+                continue
+            batch.append(
+                (index, {name: v for name, v in zip(header, fields) if v != ""})
+            )
+            if len(batch) >= settings.BULK_CHUNK_SIZE:
+                await _write_batch(db, kind, batch, job)
+                batch = []
+        if batch:
+            await _write_batch(db, kind, batch, job)
+        job.status = "completed"
+    except (csv.Error, UnicodeDecodeError, SQLAlchemyError) as e:
+        logger.error(f"CSV içe aktarma başarısız ({job.id}): {e}")
+        job.status = "failed"
+        job.error = str(e)
+    finally:
+        if job.status == "running":
+            job.status = "failed"
+        job.finished_at = datetime.datetime.utcnow()
+    return job
+
+
+@router.post(
+    "/{kind}",
+    response_model=schemas.ImportJobRead,
+    summary="CSV içe aktar / Import CSV",
+    responses={
+        200: {"description": "İş sonucu / Job result."},
+        404: {"description": "Bilinmeyen tür / Unknown kind."},
+        401: {"description": "Yetkisiz / Unauthorized"},
+    },
+)
+async def import_csv(
+    kind: str,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    user_auth=Depends(get_current_user),
+):
+    """
+    TR: text/csv gövdesini okurken içe aktarır (stocks veya products).
+    İş sürerken ilerleme GET /imports/ ile izlenebilir.
+    EN: Imports a text/csv body while it is being read (stocks or products).
+    Progress can be followed with GET /imports/ while the job runs.
+    """
+    if kind not in IMPORT_KINDS:
+        raise HTTPException(
+            status_code=404, detail="Bilinmeyen tür / Unknown kind: " + kind
+        )
+    job = start_job(kind)
+    return await run_import(db, kind, request.stream(), job)
+
+
+@router.get(
+    "/",
+    response_model=List[schemas.ImportJobRead],
+    summary="İçe aktarma işleri / Import jobs",
+)
+async def list_import_jobs(user_auth=Depends(get_current_user)):
+    """
+    TR: Son içe aktarma işlerini en yeniden eskiye listeler.
+    EN: Lists recent import jobs, newest first.
+    """
+    return list(reversed(_jobs.values()))
+
+
+@router.get(
+    "/{job_id}",
+    response_model=schemas.ImportJobRead,
+    summary="İçe aktarma işi / Import job",
+    responses={404: {"description": "İş bulunamadı / Job not found."}},
+)
+async def get_import_job(job_id: str, user_auth=Depends(get_current_user)):
+    """
+    TR: İçe aktarma işinin durumunu döndürür.
+    EN: Returns the status of an import job.
+    """
+    job = _jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="İş bulunamadı / Job not found")
+    return job
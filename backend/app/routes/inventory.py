@@ -0,0 +1,376 @@
+"""
+Sipariş verilirken stok rezervasyonu ve konumlar arası stok transferi.
+Stok, okuma-değiştirme-yazma yerine koşullu UPDATE ile tek adımda düşülür;
+böylece eşzamanlı siparişler ve transferler stoğu eksiye düşüremez.
+"""
+
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app import models, schemas
+from app.catalog import product_catalog
+from app.core.settings import settings
+from app.entity_cache import invalidate_after_commit
+from app.routes.common import existing_ids, version_bump
+from app.routes.upserts import Row, reject
+from fastapi import HTTPException
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+OUT_OF_STOCK_DETAIL = "Yetersiz stok / Insufficient stock"
+PRODUCT_NOT_FOUND_DETAIL = "Ürün bulunamadı / Product not found"
+PRODUCT_MISMATCH_DETAIL = (
+    "Kaynak ve hedef farklı ürünlere ait / "
+    "Source and destination belong to different products"
+)
+
+# İptal edilen siparişin rezervasyonu serbest bırakılır; teslim edilen
+# siparişin stoğu tüketilmiştir, silinse de geri eklenmez.
+CANCELLED_STATUS = "cancelled"
+DELIVERED_STATUS = "delivered"
+
+
+def aggregate_quantities(items: Iterable[Tuple[int, int]]) -> Dict[int, int]:
+    """(product_id, quantity) çiftlerini ürün bazında toplar."""
+    quantities = defaultdict(int)
+    for product_id, quantity in items:
+        quantities[product_id] += quantity
+    return dict(quantities)
+
+
+async def _decrement(db: AsyncSession, product_id: int, quantity: int) -> bool:
+    """
+    Stok yeterliyse düşer.
+
+    Returns:
+        bool: Stok düşüldüyse True
+    """
+    result = await db.execute(
+        update(models.Product)
+        .where(models.Product.id == product_id, models.Product.stock >= quantity)
+        .values(
+            stock=models.Product.stock - quantity,
+            **version_bump(models.Product.__table__),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount == 1:
+        invalidate_after_commit(db, "product", [product_id])
+        return True
+    return False
+
+
+async def _increment(db: AsyncSession, product_id: int, quantity: int) -> None:
+    await db.execute(
+        update(models.Product)
+        .where(models.Product.id == product_id)
+        .values(
+            stock=models.Product.stock + quantity,
+            **version_bump(models.Product.__table__),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    invalidate_after_commit(db, "product", [product_id])
+
+
+def _movement(product_id: int, quantity: int) -> models.StockMovement:
+    return models.StockMovement(
+        product_id=product_id, movement_type="OUT", quantity=-quantity
+    )
+
+
+def _release_movement(product_id: int, quantity: int) -> models.StockMovement:
+    return models.StockMovement(
+        product_id=product_id, movement_type="IN", quantity=quantity
+    )
+
+
+def held_quantities(status: str, items: Iterable[models.OrderItem]) -> Dict[int, int]:
+    """Siparişin rezerve ettiği miktarlar (iptal edilmişse boş)."""
+    if status == CANCELLED_STATUS:
+        return {}
+    return aggregate_quantities((item.product_id, item.quantity) for item in items)
+
+
+async def adjust_reservations(
+    db: AsyncSession, held: Dict[int, int], wanted: Dict[int, int]
+) -> Optional[int]:
+    """
+    Siparişin rezervasyonunu held'den wanted'a taşır.
+
+    Ürün başına yalnızca fark uygulanır: artışlar koşullu düşülür (OUT),
+    azalışlar stoğa geri eklenir (IN). Satırlar ürün id sırasıyla
+    kilitlenir, reserve_stock ile aynı sıra.
+
+    Returns:
+        Optional[int]: Stoğu yetmeyen ilk ürün id'si, hepsi uygulandıysa None.
+        None dışı dönüşte transaction geri alınmalıdır.
+    """
+    for product_id in sorted(set(held) | set(wanted)):
+        delta = wanted.get(product_id, 0) - held.get(product_id, 0)
+        if delta > 0:
+            if not await _decrement(db, product_id, delta):
+                return product_id
+            db.add(_movement(product_id, delta))
+        elif delta < 0:
+            await _increment(db, product_id, -delta)
+            db.add(_release_movement(product_id, -delta))
+    return None
+
+
+async def adjust_or_409(
+    db: AsyncSession, held: Dict[int, int], wanted: Dict[int, int]
+) -> None:
+    """adjust_reservations; stok yetmezse rollback yapıp 409 döndürür."""
+    product_id = await adjust_reservations(db, held, wanted)
+    if product_id is not None:
+        await db.rollback()
+        raise HTTPException(
+            status_code=409,
+            detail=f"{OUT_OF_STOCK_DETAIL}: product_id={product_id}",
+        )
+
+
+async def release_order(db: AsyncSession, order: models.Order) -> None:
+    """Silinen siparişin rezervasyonunu bırakır (teslim edilmemişse)."""
+    if order.status != DELIVERED_STATUS:
+        await adjust_reservations(
+            db, held_quantities(order.status, order.order_items), {}
+        )
+
+
+async def reserve_stock(db: AsyncSession, quantities: Dict[int, int]) -> Optional[int]:
+    """
+    Ürün stoklarını mevcut transaction içinde rezerve eder.
+
+    Satırlar ürün id sırasıyla kilitlenir; çok kalemli siparişler aynı
+    sırayla kilit aldığından birbirini deadlock'a sokamaz. Başarılı her
+    düşüm için OUT StockMovement eklenir.
+
+    Args:
+        db: Async veritabanı oturumu
+        quantities: product_id -> miktar
+
+    Returns:
+        Optional[int]: Stoğu yetmeyen ilk ürün id'si, hepsi rezerve edildiyse None.
+        None dışı dönüşte transaction geri alınmalıdır.
+    """
+    for product_id in sorted(quantities):
+        quantity = quantities[product_id]
+        if not await _decrement(db, product_id, quantity):
+            return product_id
+        db.add(_movement(product_id, quantity))
+    return None
+
+
+async def reserve_or_409(db: AsyncSession, quantities: Dict[int, int]) -> None:
+    """reserve_stock; stok yetmezse rollback yapıp 409 döndürür."""
+    product_id = await reserve_stock(db, quantities)
+    if product_id is not None:
+        await db.rollback()
+        raise HTTPException(
+            status_code=409,
+            detail=f"{OUT_OF_STOCK_DETAIL}: product_id={product_id}",
+        )
+
+
+async def reserve_stock_rows(
+    db: AsyncSession, rows: List[Tuple[int, Dict[int, int]]]
+) -> Dict[int, int]:
+    """
+    Birden çok siparişin stoklarını satır bazında rezerve eder.
+
+    Tüm talepler ürün id sırasıyla işlenir, böylece kilit sırası tek
+    siparişteki gibi deterministiktir. Stoğu yetmeyen siparişin daha önce
+    düşülen kalemleri (zaten kilitli satırlar) geri eklenir.
+
+    Args:
+        db: Async veritabanı oturumu
+        rows: (satır anahtarı, product_id -> miktar) listesi
+
+    Returns:
+        Dict[int, int]: Reddedilen satır anahtarı -> stoğu yetmeyen product_id
+    """
+    demands = sorted(
+        (product_id, key, quantity)
+        for key, quantities in rows
+        for product_id, quantity in quantities.items()
+    )
+    reserved = defaultdict(list)
+    failed: Dict[int, int] = {}
+    for product_id, key, quantity in demands:
+        if key in failed:
+            continue
+        if await _decrement(db, product_id, quantity):
+            reserved[key].append((product_id, quantity))
+        else:
+            failed[key] = product_id
+    for key, items in reserved.items():
+        if key in failed:
+            for product_id, quantity in items:
+                await _increment(db, product_id, quantity)
+        else:
+            db.add_all(
+                _movement(product_id, quantity) for product_id, quantity in items
+            )
+    return failed
+
+
+async def product_ids_by_name(db: AsyncSession, names: Iterable[str]) -> Dict[str, int]:
+    """Ürün adlarını id'lere çevirir; önce katalog, sonra veritabanı."""
+    ids: Dict[str, int] = {}
+    missing = []
+    for name in set(names):
+        entry = product_catalog.get_by_name(name)
+        if entry is not None:
+            ids[name] = entry.id
+        else:
+            missing.append(name)
+    for start in range(0, len(missing), settings.BULK_CHUNK_SIZE):
+        chunk = missing[start : start + settings.BULK_CHUNK_SIZE]
+        rows = await db.execute(
+            select(models.Product.id, models.Product.name).where(
+                models.Product.name.in_(chunk)
+            )
+        )
+        ids.update((name, product_id) for product_id, name in rows)
+    return ids
+
+
+async def product_id_for(
+    db: AsyncSession, product_id: Optional[int], product_name: str
+) -> Optional[int]:
+    """
+    Stok satırının bağlanacağı ürün id'sini döndürür.
+
+    Verilen product_id doğrulanır; verilmemişse ürün adından çözülür
+    (eşleşen ürün yoksa None).
+
+    Raises:
+        HTTPException: Verilen product_id'li ürün yoksa 422
+    """
+    if product_id is None:
+        return (await product_ids_by_name(db, [product_name])).get(product_name)
+    if not await existing_ids(db, models.Product.id, [product_id]):
+        raise HTTPException(
+            status_code=422,
+            detail=f"{PRODUCT_NOT_FOUND_DETAIL}: product_id={product_id}",
+        )
+    return product_id
+
+
+async def link_stock_products(
+    db: AsyncSession,
+    rows: List[Row],
+    summary: schemas.BulkUpsertResponse,
+    resolve: bool = True,
+) -> List[Row]:
+    """
+    Toplu stok satırlarının product_id'lerini doğrular ve eksikleri doldurur.
+
+    Args:
+        db: Async veritabanı oturumu
+        rows: Doğrulanmış stok satırları
+        summary: Bilinmeyen product_id'li satırların reddedileceği özet
+        resolve: product_id verilmeyen satırlar ürün adından bağlansın mı
+
+    Returns:
+        List[Row]: Reddedilmeyen satırlar
+    """
+    known = await existing_ids(
+        db,
+        models.Product.id,
+        (v["product_id"] for _, v in rows if v.get("product_id") is not None),
+    )
+    by_name = {}
+    if resolve:
+        by_name = await product_ids_by_name(
+            db, (v["product_name"] for _, v in rows if v.get("product_id") is None)
+        )
+    linked = []
+    for index, values in rows:
+        product_id = values.get("product_id")
+        if product_id is not None and product_id not in known:
+            reject(
+                summary, index, f"{PRODUCT_NOT_FOUND_DETAIL}: product_id={product_id}"
+            )
+            continue
+        if product_id is None and values["product_name"] in by_name:
+            values["product_id"] = by_name[values["product_name"]]
+        linked.append((index, values))
+    return linked
+
+
+async def _adjust_stock_row(db: AsyncSession, stock_id: int, delta: int) -> bool:
+    """
+    Stok satırının miktarını değiştirir; azaltmada miktar yeterli olmalıdır.
+
+    Returns:
+        bool: Satır güncellendiyse True
+    """
+    stock = models.Stock
+    stmt = update(stock).where(stock.id == stock_id)
+    if delta < 0:
+        stmt = stmt.where(stock.quantity >= -delta)
+    result = await db.execute(
+        stmt.values(
+            quantity=stock.quantity + delta, **version_bump(stock.__table__)
+        ).execution_options(synchronize_session=False)
+    )
+    return result.rowcount == 1
+
+
+async def transfer_stock(
+    db: AsyncSession,
+    transfers: List[schemas.StockTransfer],
+    stocks: Dict[int, Tuple[str, Optional[str]]],
+    product_ids: Dict[int, int],
+) -> Optional[int]:
+    """
+    Transferleri mevcut transaction içinde uygular.
+
+    Kaynak ve hedef satırlar aynı ürüne bağlı olmalıdır (çağıran doğrular).
+    Transferler stok satırı başına net değişime indirgenir ve satırlar id
+    sırasıyla güncellenir; aynı satırlara dokunan eşzamanlı transfer
+    partileri kilitleri aynı sırayla aldığından deadlock oluşmaz. Her
+    transfer için ürünün TRANSFER StockMovement'ı yazılır.
+
+    Args:
+        db: Async veritabanı oturumu
+        transfers: Uygulanacak transferler
+        stocks: stock_id -> (product_name, location)
+        product_ids: stock_id -> product_id (hareket kaydı için)
+
+    Returns:
+        Optional[int]: Miktarı yetmeyen ilk stok id'si, hepsi uygulandıysa None.
+        None dışı dönüşte transaction geri alınmalıdır.
+    """
+    deltas = aggregate_quantities(
+        pair
+        for transfer in transfers
+        for pair in (
+            (transfer.source_id, -transfer.quantity),
+            (transfer.dest_id, transfer.quantity),
+        )
+    )
+    for stock_id in sorted(deltas):
+        if deltas[stock_id] and not await _adjust_stock_row(
+            db, stock_id, deltas[stock_id]
+        ):
+            return stock_id
+    movements = [
+        {
+            "product_id": product_ids[transfer.source_id],
+            "movement_type": "TRANSFER",
+            "quantity": transfer.quantity,
+            "source_location": stocks[transfer.source_id][1],
+            "dest_location": stocks[transfer.dest_id][1],
+        }
+        for transfer in transfers
+    ]
+    for start in range(0, len(movements), settings.BULK_CHUNK_SIZE):
+        await db.execute(
+            insert(models.StockMovement),
+            movements[start : start + settings.BULK_CHUNK_SIZE],
+        )
+    return None
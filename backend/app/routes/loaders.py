@@ -0,0 +1,160 @@
+"""
+Response modelleriyle eşleşen eager-loading seçenekleri.
+İç içe ilişkiler ?include= parametresiyle açıkça talep edilir; talep
+edilmeyen ilişkiler hiç sorgulanmaz ve response'ta boş döner.
+Koleksiyonlar selectinload,
+many-to-one ilişkiler joinedload ile yüklenir, böylece istek başına sorgu
+sayısı dönen satır sayısından bağımsızdır.
+"""
+
+from typing import Callable, FrozenSet, Iterable, List, Optional
+
+from app import models
+from fastapi import HTTPException, Query
+from sqlalchemy import inspect
+from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+
+ORDER_INCLUDES = ("items", "items.product", "shipping_address")
+USER_INCLUDES = ("addresses", "orders") + tuple(
+    f"orders.{name}" for name in ORDER_INCLUDES
+)
+
+# Endpoint bazlı varsayılanlar: listeler sığ, detaylar daha derin
+ORDER_LIST_DEFAULT = ("items", "shipping_address")
+ORDER_DETAIL_DEFAULT = ORDER_INCLUDES
+USER_LIST_DEFAULT = ("addresses",)
+USER_DETAIL_DEFAULT = ("addresses", "orders", "orders.items")
+
+# Silme işlemlerinde delete-orphan cascade için yüklenmesi gereken ilişkiler
+ORDER_DELETE_OPTIONS = (selectinload(models.Order.order_items),)
+USER_DELETE_OPTIONS = (
+    selectinload(models.User.addresses),
+    selectinload(models.User.orders).selectinload(models.Order.order_items),
+)
+
+
+def expand_includes(names: Iterable[str]) -> FrozenSet[str]:
+    """
+    Include isimlerini üst yollarıyla birlikte döndürür.
+
+    Örn. "orders.items.product" -> {"orders", "orders.items",
+    "orders.items.product"}
+    """
+    expanded = set()
+    for name in names:
+        parts = name.split(".")
+        for i in range(1, len(parts) + 1):
+            expanded.add(".".join(parts[:i]))
+    return frozenset(expanded)
+
+
+def include_param(
+    allowed: Iterable[str], default: Iterable[str]
+) -> Callable[[Optional[str]], FrozenSet[str]]:
+    """
+    ?include= query parametresi için dependency üretir.
+
+    Args:
+        allowed: İzin verilen include isimleri
+        default: Parametre gönderilmezse kullanılacak isimler
+
+    Returns:
+        Callable: Include kümesini döndüren FastAPI dependency'si
+    """
+    allowed = frozenset(allowed)
+    default = expand_includes(default)
+
+    def parse_include(
+        include: Optional[str] = Query(
+            None,
+            description="Virgülle ayrılmış ilişkiler / Comma separated relations: "
+            + ", ".join(sorted(allowed)),
+        ),
+    ) -> FrozenSet[str]:
+        if include is None:
+            return default
+        requested = {name.strip() for name in include.split(",") if name.strip()}
+        unknown = requested - allowed
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail="Geçersiz include / Invalid include: "
+                + ", ".join(sorted(unknown)),
+            )
+        return expand_includes(requested)
+
+    return parse_include
+
+
+def order_load_options(
+    include: FrozenSet[str],
+    order_model=models.Order,
+    item_model=models.OrderItem,
+) -> List:
+    """
+    OrderRead için include kümesine göre loader seçenekleri.
+    Arşiv modelleri (OrderArchive, OrderItemArchive) aynı ilişki adlarını
+    kullandığından onlar için de geçerlidir.
+    """
+    options = []
+    if "items.product" in include:
+        options.append(
+            selectinload(order_model.order_items)
+            .joinedload(item_model.product)
+            .joinedload(models.Product.category)
+        )
+    elif "items" in include:
+        options.append(selectinload(order_model.order_items))
+    if "shipping_address" in include:
+        options.append(joinedload(order_model.shipping_address))
+    return options
+
+
+def user_load_options(include: FrozenSet[str]) -> List:
+    """UserRead için include kümesine göre loader seçenekleri."""
+    options = []
+    if "addresses" in include:
+        options.append(selectinload(models.User.addresses))
+    if "orders" in include:
+        order_include = frozenset(
+            name[len("orders.") :] for name in include if name.startswith("orders.")
+        )
+        options.append(
+            selectinload(models.User.orders).options(*order_load_options(order_include))
+        )
+    return options
+
+
+def fill_unloaded(objects: Iterable) -> List:
+    """
+    Yüklenmemiş ilişkileri boş değerle işaretler.
+
+    Async session lazy load yapamadığından, serileştirme sırasında talep
+    edilmemiş ilişkilere erişim sorgu yerine boş liste/None görmelidir.
+    Yalnızca response olarak dönecek nesnelerde kullanılmalıdır.
+
+    Args:
+        objects: Kök ORM nesneleri
+
+    Returns:
+        List: Aynı nesneler
+    """
+    objects = list(objects)
+    stack = list(objects)
+    seen = set()
+    while stack:
+        obj = stack.pop()
+        if obj is None or id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        state = inspect(obj)
+        for relationship in state.mapper.relationships:
+            key = relationship.key
+            if key in state.unloaded:
+                set_committed_value(obj, key, [] if relationship.uselist else None)
+            elif relationship.uselist:
+                stack.extend(state.dict.get(key) or ())
+            else:
+                stack.append(state.dict.get(key))
+    return objects
@@ -4,17 +4,116 @@ ERP sistemi için sipariş yönetimi CRUD işlemlerini sağlar.
 """
 
 import uuid
-from typing import List
-
-from app.auth import get_current_user
-from app.routes.common import get_db
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from typing import Any, Dict, FrozenSet, List, Optional
 
 from app import models, schemas
+from app.auth import get_current_user
+from app.catalog import CatalogEntry, entry_for, product_catalog
+from app.core.settings import settings
+from app.entity_cache import cached_json, embedded_products, invalidate_after_commit
+from app.interfaces import CachedPayload
+from app.routes.common import (
+    chunked,
+    commit_versioned,
+    ensure_version,
+    etag_for,
+    existing_ids,
+    format_validation_error,
+    get_async_db,
+    if_match_version,
+    set_etag,
+)
+from app.routes.filters import ORDER_LIST_QUERY, ListQuery
+from app.routes.inventory import (
+    OUT_OF_STOCK_DETAIL,
+    adjust_or_409,
+    held_quantities,
+    release_order,
+    reserve_or_409,
+    reserve_stock_rows,
+)
+from app.routes.loaders import (
+    ORDER_DELETE_OPTIONS,
+    ORDER_DETAIL_DEFAULT,
+    ORDER_INCLUDES,
+    ORDER_LIST_DEFAULT,
+    expand_includes,
+    fill_unloaded,
+    include_param,
+    order_load_options,
+)
+from app.routes.pagination import PageParams, paginate
+from app.routes.streaming import stream_ndjson, stream_param
+from fastapi import APIRouter, Body, Depends, HTTPException, Response, status
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
 
 router = APIRouter()
 
+ORDER_DETAIL_OPTIONS = order_load_options(expand_includes(ORDER_DETAIL_DEFAULT))
+
+
+async def _get_order(db: AsyncSession, order_id: int, *options):
+    """Siparişi verilen loader seçenekleriyle getirir."""
+    result = await db.execute(
+        select(models.Order)
+        .options(*options)
+        .where(models.Order.id == order_id)
+        .execution_options(populate_existing=True)
+    )
+    return result.scalars().first()
+
+
+async def _get_archived_order(db: AsyncSession, order_id: int, *options):
+    """Arşivlenmiş siparişi verilen loader seçenekleriyle getirir."""
+    result = await db.execute(
+        select(models.OrderArchive)
+        .options(*options)
+        .where(models.OrderArchive.id == order_id)
+    )
+    return result.scalars().first()
+
+
+async def _resolve_product(db: AsyncSession, name: str, price: float) -> CatalogEntry:
+    """
+    Ürünü adına göre çözer, yoksa mevcut transaction içinde oluşturur.
+    Katalogda bilinen ürünler için veritabanına gidilmez. Yeni ürünün id'si
+    commit edilmeden flush (INSERT ... RETURNING) ile alınır; katalog commit
+    sonrası ORM event'leriyle güncellenir.
+    """
+    entry = product_catalog.get_by_name(name)
+    if entry is not None:
+        return entry
+    result = await db.execute(select(models.Product).where(models.Product.name == name))
+    product = result.scalars().first()
+    if product:
+        entry = entry_for(product)
+        product_catalog.put(entry)
+        return entry
+    product = models.Product(
+        name=name,
+        sku=str(uuid.uuid4()),
+        price=price,
+        stock=100,
+    )
+    db.add(product)
+    await db.flush()
+    return entry_for(product)
+
+
+async def _product_name(db: AsyncSession, product_id: int):
+    """Ürün adını önce katalogdan, yoksa veritabanından döndürür."""
+    name = product_catalog.get_name(product_id)
+    if name is None:
+        product = await db.get(models.Product, product_id)
+        if product is None:
+            return None
+        product_catalog.put(entry_for(product))
+        name = product.name
+    return name
+
 
 @router.post(
     "/",
@@ -29,17 +128,23 @@ router = APIRouter()
         404: {"description": "Kullanıcı bulunamadı / User not found."},
         400: {"description": "Geçersiz veri / Invalid data."},
         401: {"description": "Yetkisiz / Unauthorized"},
+        409: {"description": "Yetersiz stok / Insufficient stock."},
     },
 )
 async def create_order(
     order: dict,  # raw dict alıyoruz
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_auth=Depends(get_current_user),
 ):
     """
-    TR: Yeni sipariş oluşturur. Kullanıcı ID geçerli olmalıdır.
-    EN: Creates a new order. User ID must be valid.
+    TR: Yeni sipariş oluşturur. Kullanıcı ID geçerli olmalıdır; kalemlerin
+    stoğu aynı transaction'da rezerve edilir, yetmezse 409 döner.
+    EN: Creates a new order. User ID must be valid; item stock is reserved in
+    the same transaction and 409 is returned when it runs out.
     """
+    # Ürün, sipariş başlığı ve kalemler tek transaction'da yazılır; hata
+    # durumunda session kapanırken rollback olur, yarım sipariş kalmaz.
+    product_name = None
     # Testler product_name ve amount ile gönderiyor, bunları order_items'e dönüştürelim
     if "product_name" in order and "amount" in order:
         # amount string olarak gelebilir, float'a çevir
@@ -51,22 +156,9 @@ async def create_order(
             )
         if amount < 0:
             raise HTTPException(status_code=422, detail="Amount cannot be negative")
-        product = (
-            db.query(models.Product)
-            .filter(models.Product.name == order["product_name"])
-            .first()
-        )
-        if not product:
-            # Ürün yoksa otomatik ekle
-            product = models.Product(
-                name=order["product_name"],
-                sku=str(uuid.uuid4()),
-                price=amount,
-                stock=100,
-            )
-            db.add(product)
-            db.commit()
-            db.refresh(product)
+        # Ürün yoksa otomatik ekle
+        product = await _resolve_product(db, order["product_name"], amount)
+        product_name = product.name
         order_item = {
             "product_id": product.id,
             "quantity": 1,
@@ -80,7 +172,7 @@ async def create_order(
         )
     else:
         order_obj = schemas.OrderCreate(**order)
-    user = db.query(models.User).filter(models.User.id == order_obj.user_id).first()
+    user = await db.get(models.User, order_obj.user_id)
     if not user:
         raise HTTPException(
             status_code=404, detail="Kullanıcı bulunamadı. / User not found."
@@ -91,34 +183,158 @@ async def create_order(
         status=getattr(order_obj, "status", "pending"),
         shipping_address_id=getattr(order_obj, "shipping_address_id", None),
     )
-    db.add(db_order)
-    db.commit()
-    db.refresh(db_order)
-    # OrderItem ekle
+    # Kalemler ilişki üzerinden eklenir; order_id flush sırasında atanır
     for item in order_obj.order_items:
-        db_item = models.OrderItem(
-            order_id=db_order.id,
-            product_id=item.product_id,
-            quantity=getattr(item, "quantity", 1),
-            unit_price=item.unit_price,
-            total_price=item.total_price,
+        db_order.order_items.append(
+            models.OrderItem(
+                product_id=item.product_id,
+                quantity=getattr(item, "quantity", 1),
+                unit_price=item.unit_price,
+                total_price=item.total_price,
+            )
         )
-        db.add(db_item)
-    db.commit()
-    db.refresh(db_order)
-    result = db_order.__dict__.copy()
+    db.add(db_order)
+    # İptal durumunda oluşturulan sipariş stok tutmaz (held_quantities ile aynı)
+    await reserve_or_409(db, held_quantities(db_order.status, order_obj.order_items))
+    await db.commit()
     # product_name'i response'a ekle
-    if order_obj.order_items and hasattr(order_obj.order_items[0], "product_id"):
-        product = (
-            db.query(models.Product)
-            .filter(models.Product.id == order_obj.order_items[0].product_id)
-            .first()
-        )
-        if product:
-            result["product_name"] = product.name
+    if product_name is None and order_obj.order_items:
+        product_name = await _product_name(db, order_obj.order_items[0].product_id)
+    fill_unloaded([db_order])
+    result = db_order.__dict__.copy()
+    if product_name is not None:
+        result["product_name"] = product_name
     return result
 
 
+@router.post(
+    "/bulk",
+    response_model=schemas.OrderBulkResponse,
+    summary="Toplu sipariş oluştur / Bulk create orders",
+    responses={
+        200: {"description": "Satır bazlı sonuçlar / Per-row results."},
+        413: {"description": "Çok fazla satır / Too many rows."},
+        401: {"description": "Yetkisiz / Unauthorized"},
+    },
+)
+async def create_orders_bulk(
+    orders: List[Dict[str, Any]] = Body(...),
+    db: AsyncSession = Depends(get_async_db),
+    user_auth=Depends(get_current_user),
+):
+    """
+    TR: Siparişleri toplu olarak oluşturur. Her satır ayrı doğrulanır;
+    kullanıcı ve ürünler IN sorgularıyla çözülür, stok satır bazında rezerve
+    edilir, başlık ve kalemler parça parça executemany ile yazılır.
+    EN: Creates orders in bulk. Each row is validated on its own; users and
+    products are resolved with IN queries, stock is reserved per row and
+    headers and items are written with executemany in chunked transactions.
+    """
+    if len(orders) > settings.BULK_MAX_ROWS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"En fazla {settings.BULK_MAX_ROWS} satır / "
+            f"At most {settings.BULK_MAX_ROWS} rows",
+        )
+    results: Dict[int, schemas.OrderBulkResult] = {}
+    valid = []
+    for index, payload in enumerate(orders):
+        try:
+            valid.append((index, schemas.OrderCreate.model_validate(payload)))
+        except ValidationError as e:
+            results[index] = schemas.OrderBulkResult(
+                index=index,
+                status="rejected",
+                error=format_validation_error(e),
+            )
+
+    known_users = await existing_ids(
+        db, models.User.id, (order.user_id for _, order in valid)
+    )
+    # Katalogda bilinen ürünler için IN sorgusuna gerek yok
+    product_ids = {item.product_id for _, order in valid for item in order.order_items}
+    known_products = {pid for pid in product_ids if product_catalog.get_name(pid)}
+    known_products |= await existing_ids(
+        db, models.Product.id, product_ids - known_products
+    )
+    accepted = []
+    for index, order in valid:
+        missing = {item.product_id for item in order.order_items} - known_products
+        if order.user_id not in known_users:
+            error = "Kullanıcı bulunamadı / User not found"
+        elif missing:
+            error = f"Ürün bulunamadı / Product not found: {sorted(missing)}"
+        else:
+            accepted.append((index, order))
+            continue
+        results[index] = schemas.OrderBulkResult(
+            index=index, status="rejected", error=error
+        )
+
+    for chunk in chunked(accepted, settings.BULK_CHUNK_SIZE):
+        try:
+            out_of_stock = await reserve_stock_rows(
+                db,
+                [
+                    (index, held_quantities(order.status, order.order_items))
+                    for index, order in chunk
+                ],
+            )
+            for index, product_id in out_of_stock.items():
+                results[index] = schemas.OrderBulkResult(
+                    index=index,
+                    status="rejected",
+                    error=f"{OUT_OF_STOCK_DETAIL}: product_id={product_id}",
+                )
+            chunk = [row for row in chunk if row[0] not in out_of_stock]
+            if not chunk:
+                await db.commit()
+                continue
+            # sort_by_parameter_order: RETURNING satırları parametre sırasıyla döner
+            inserted = await db.execute(
+                insert(models.Order).returning(
+                    models.Order.id, sort_by_parameter_order=True
+                ),
+                [
+                    {
+                        "user_id": order.user_id,
+                        "status": order.status,
+                        "total_amount": order.total_amount,
+                        "shipping_address_id": order.shipping_address_id,
+                    }
+                    for _, order in chunk
+                ],
+            )
+            order_ids = inserted.scalars().all()
+            item_rows = [
+                {"order_id": order_id, **item.model_dump()}
+                for order_id, (_, order) in zip(order_ids, chunk)
+                for item in order.order_items
+            ]
+            if item_rows:
+                await db.execute(insert(models.OrderItem), item_rows)
+            # Kullanıcı detayı siparişleri içerir
+            invalidate_after_commit(db, "user", {order.user_id for _, order in chunk})
+            await db.commit()
+        except SQLAlchemyError as e:
+            await db.rollback()
+            for index, _ in chunk:
+                results[index] = schemas.OrderBulkResult(
+                    index=index, status="rejected", error=str(e.__class__.__name__)
+                )
+            continue
+        for order_id, (index, _) in zip(order_ids, chunk):
+            results[index] = schemas.OrderBulkResult(
+                index=index, status="created", order_id=order_id
+            )
+
+    ordered = [results[index] for index in range(len(orders))]
+    created = sum(1 for result in ordered if result.status == "created")
+    return schemas.OrderBulkResponse(
+        created=created, rejected=len(ordered) - created, results=ordered
+    )
+
+
 @router.get(
     "/",
     response_model=List[schemas.OrderRead],
@@ -129,13 +345,32 @@ async def create_order(
     },
 )
 async def list_orders(
-    db: Session = Depends(get_db), user_auth=Depends(get_current_user)
+    response: Response,
+    page: PageParams = Depends(),
+    query: ListQuery = Depends(ORDER_LIST_QUERY),
+    stream: bool = Depends(stream_param),
+    include: FrozenSet[str] = Depends(
+        include_param(ORDER_INCLUDES, ORDER_LIST_DEFAULT)
+    ),
+    db: AsyncSession = Depends(get_async_db),
+    user_auth=Depends(get_current_user),
 ):
     """
-    TR: Tüm siparişleri listeler.
-    EN: Lists all orders.
+    TR: Siparişleri cursor ile sayfalayarak listeler; filtre ve sıralama
+    parametrelerini destekler. stream=1 ile tüm sonuç NDJSON olarak akar.
+    EN: Lists orders page by page using a cursor, with filter and sort
+    parameters. stream=1 streams the whole result as NDJSON.
     """
-    return db.query(models.Order).all()
+    stmt = (
+        select(models.Order).options(*order_load_options(include)).where(*query.clauses)
+    )
+    if stream:
+        return stream_ndjson(
+            db, stmt, models.Order, schemas.OrderRead, query.sort, fill_unloaded
+        )
+    return fill_unloaded(
+        await paginate(db, stmt, models.Order, page, response, query.sort)
+    )
 
 
 @router.get(
@@ -150,19 +385,44 @@ async def list_orders(
 )
 async def get_order(
     order_id: int,
-    db: Session = Depends(get_db),
+    include: FrozenSet[str] = Depends(
+        include_param(ORDER_INCLUDES, ORDER_DETAIL_DEFAULT)
+    ),
+    db: AsyncSession = Depends(get_async_db),
     user_auth=Depends(get_current_user),
 ):
     """
-    TR: Sipariş detayını getirir.
-    EN: Returns order detail.
+    TR: Sipariş detayını getirir; sıcak tabloda yoksa arşive bakar. Yanıt
+    entity cache'ten okunur, yazımlarda geçersiz kılınır.
+    EN: Returns order detail, falling back to the archive on a miss. The
+    response is served from the entity cache and invalidated on writes.
     """
-    order = db.query(models.Order).filter(models.Order.id == order_id).first()
-    if not order:
-        raise HTTPException(
-            status_code=404, detail="Sipariş bulunamadı. / Order not found."
+
+    async def build() -> CachedPayload:
+        order = await _get_order(db, order_id, *order_load_options(include))
+        if not order:
+            order = await _get_archived_order(
+                db,
+                order_id,
+                *order_load_options(
+                    include, models.OrderArchive, models.OrderItemArchive
+                ),
+            )
+        if not order:
+            raise HTTPException(
+                status_code=404, detail="Sipariş bulunamadı. / Order not found."
+            )
+        fill_unloaded([order])
+        products = ()
+        if "items.product" in include:
+            products = embedded_products(order.order_items)
+        return CachedPayload(
+            schemas.OrderRead.model_validate(order).model_dump_json().encode(),
+            etag_for(order),
+            products,
         )
-    return order
+
+    return await cached_json("order", order_id, ",".join(sorted(include)), build)
 
 
 @router.put(
@@ -173,67 +433,75 @@ async def get_order(
         200: {"description": "Sipariş güncellendi / Order updated."},
         404: {"description": "Sipariş bulunamadı / Order not found."},
         400: {"description": "Geçersiz veri / Invalid data."},
+        409: {"description": "Yetersiz stok / Insufficient stock."},
+        412: {"description": "Sürüm uyuşmuyor / Version mismatch (If-Match)."},
         401: {"description": "Yetkisiz / Unauthorized"},
     },
 )
 async def update_order(
     order_id: int,
     order: dict,
-    db: Session = Depends(get_db),
+    response: Response,
+    expected_version: Optional[int] = Depends(if_match_version),
+    db: AsyncSession = Depends(get_async_db),
     user_auth=Depends(get_current_user),
 ):
     """
-    TR: Sipariş bilgilerini günceller.
-    EN: Updates order information.
+    TR: Sipariş bilgilerini günceller. If-Match ile gönderilen sürüm
+    kayıttakiyle eşleşmezse 412 döner. Kalem veya durum değişince stok
+    rezervasyonu aynı transaction'da düzeltilir (iptal: serbest bırakılır);
+    ek stok yetmezse 409 döner.
+    EN: Updates order information. Returns 412 if the version sent with
+    If-Match does not match the record. Stock reservations follow item and
+    status changes in the same transaction (cancel releases them); 409 is
+    returned when additional stock runs out.
     """
-    db_order = db.query(models.Order).filter(models.Order.id == order_id).first()
+    db_order = await _get_order(db, order_id, *ORDER_DETAIL_OPTIONS)
     if not db_order:
         raise HTTPException(
             status_code=404, detail="Sipariş bulunamadı. / Order not found."
         )
+    ensure_version(db_order, expected_version)
+    held = held_quantities(db_order.status, db_order.order_items)
+    product = None
     if "product_name" in order and "amount" in order:
         if order["amount"] < 0:
             raise HTTPException(status_code=422, detail="Amount cannot be negative")
-        product = (
-            db.query(models.Product)
-            .filter(models.Product.name == order["product_name"])
-            .first()
-        )
-        if not product:
-            product = models.Product(
-                name=order["product_name"],
-                sku=str(uuid.uuid4()),
-                price=order["amount"],
-                stock=100,
-            )
-            db.add(product)
-            db.commit()
-            db.refresh(product)
+        product = await _resolve_product(db, order["product_name"], order["amount"])
         db_order.total_amount = order["amount"]
         db_order.status = order.get("status", db_order.status)
         db_order.shipping_address_id = order.get(
             "shipping_address_id", db_order.shipping_address_id
         )
-        # OrderItem güncelle
-        db.query(models.OrderItem).filter(
-            models.OrderItem.order_id == db_order.id
-        ).delete()
-        db_item = models.OrderItem(
-            order_id=db_order.id,
-            product_id=product.id,
-            quantity=1,
-            unit_price=order["amount"],
-            total_price=order["amount"],
-        )
-        db.add(db_item)
-        db.commit()
-        db.refresh(db_order)
-        result = db_order.__dict__.copy()
-        result["product_name"] = product.name
-        return result
+        # OrderItem güncelle: eski kalemler delete-orphan ile silinir,
+        # ürün, başlık ve kalemler tek commit ile yazılır
+        db_order.order_items = [
+            models.OrderItem(
+                product_id=product.id,
+                quantity=1,
+                unit_price=order["amount"],
+                total_price=order["amount"],
+            )
+        ]
+    elif "status" in order:
+        db_order.status = order["status"]
     else:
         # Eski mantıkla devam
+        fill_unloaded([db_order])
+        set_etag(response, db_order)
         return db_order
+    # Rezervasyon yeni kalemlere/duruma göre aynı transaction'da düzeltilir
+    await adjust_or_409(
+        db, held, held_quantities(db_order.status, db_order.order_items)
+    )
+    await commit_versioned(db, db_order, "status")
+    fill_unloaded([db_order])
+    set_etag(response, db_order)
+    if product is None:
+        return db_order
+    result = db_order.__dict__.copy()
+    result["product_name"] = product.name
+    return result
 
 
 @router.delete(
@@ -248,18 +516,20 @@ async def update_order(
 )
 async def delete_order(
     order_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_auth=Depends(get_current_user),
 ):
     """
-    TR: Siparişi siler.
-    EN: Deletes an order.
+    TR: Siparişi siler; teslim edilmemiş siparişin stok rezervasyonu bırakılır.
+    EN: Deletes an order; stock reserved by an undelivered order is released.
     """
-    db_order = db.query(models.Order).filter(models.Order.id == order_id).first()
+    # delete-orphan cascade için kalemler önceden yüklenmeli
+    db_order = await _get_order(db, order_id, *ORDER_DELETE_OPTIONS)
     if not db_order:
         raise HTTPException(
             status_code=404, detail="Sipariş bulunamadı. / Order not found."
         )
-    db.delete(db_order)
-    db.commit()
+    await release_order(db, db_order)
+    await db.delete(db_order)
+    await db.commit()
     return
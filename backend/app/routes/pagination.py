@@ -0,0 +1,167 @@
+"""
+Keyset (cursor) sayfalama yardımcıları.
+Liste endpoint'leri için OFFSET kullanmadan, sayfa boyutuyla orantılı
+maliyette sayfalama sağlar.
+"""
+
+import base64
+import binascii
+import datetime
+import json
+from typing import Any, List, Optional
+
+from app.routes.filters import SortKey, coerce_value
+from fastapi import HTTPException, Query, Response
+from sqlalchemy import Select, and_, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+# Sonraki sayfanın cursor'ı response header'ında döner; body liste olarak kalır
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(values: dict) -> str:
+    """
+    Cursor değerlerini opak bir string'e çevirir.
+
+    Args:
+        values: Son satırın sıralama anahtarı değerleri
+
+    Returns:
+        str: URL-safe base64 cursor
+    """
+    raw = json.dumps(values, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict:
+    """
+    Opak cursor'ı çözer.
+
+    Args:
+        cursor: encode_cursor ile üretilmiş string
+
+    Returns:
+        dict: Sıralama anahtarı değerleri
+
+    Raises:
+        HTTPException: Cursor geçersiz ise 400
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (binascii.Error, UnicodeError, ValueError):
+        values = None
+    if not isinstance(values, dict) or not isinstance(values.get("id"), int):
+        raise _invalid_cursor()
+    return values
+
+
+def _invalid_cursor() -> HTTPException:
+    return HTTPException(status_code=400, detail="Geçersiz cursor / Invalid cursor")
+
+
+def _cursor_value(value: Any) -> Any:
+    """Sıralama anahtarı değerini JSON'a yazılabilir hale getirir."""
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    return value
+
+
+def _after(model: Any, after: dict, sort: Optional[SortKey]):
+    """Cursor'dan sonraki satırlar için keyset koşulu."""
+    if after.get("s") != (sort.token if sort else None):
+        # Cursor başka bir sıralamayla üretilmiş
+        raise _invalid_cursor()
+    if sort is None:
+        return model.id > after["id"]
+    try:
+        value = coerce_value(sort.column, after["k"])
+    except (KeyError, TypeError, ValueError):
+        raise _invalid_cursor()
+    if sort.descending:
+        return or_(
+            sort.column < value, and_(sort.column == value, model.id < after["id"])
+        )
+    return or_(sort.column > value, and_(sort.column == value, model.id > after["id"]))
+
+
+class PageParams:
+    """
+    Liste endpoint'leri için sayfalama dependency'si.
+
+    Attributes:
+        limit: Sayfa boyutu
+        cursor: Bir önceki sayfanın döndürdüğü opak cursor
+        after: Çözülmüş cursor değerleri (ilk sayfada None)
+    """
+
+    def __init__(
+        self,
+        limit: int = Query(
+            DEFAULT_PAGE_SIZE,
+            ge=1,
+            le=MAX_PAGE_SIZE,
+            description="Sayfa boyutu / Page size",
+        ),
+        cursor: Optional[str] = Query(
+            None,
+            description="Sonraki sayfa cursor'ı / Cursor of the next page "
+            f"(returned in the {NEXT_CURSOR_HEADER} header)",
+        ),
+    ):
+        self.limit = limit
+        self.cursor = cursor
+        self.after = decode_cursor(cursor) if cursor else None
+
+
+def order_by_sort(stmt: Select, model: Any, sort: Optional[SortKey]) -> Select:
+    """Sorguyu (sıralama anahtarı, id) ile sıralar; id eşitlik bozucudur."""
+    if sort is None:
+        return stmt.order_by(model.id)
+    if sort.descending:
+        return stmt.order_by(sort.column.desc(), model.id.desc())
+    return stmt.order_by(sort.column, model.id)
+
+
+async def paginate(
+    db: AsyncSession,
+    stmt: Select,
+    model: Any,
+    page: PageParams,
+    response: Response,
+    sort: Optional[SortKey] = None,
+) -> List[Any]:
+    """
+    Sorguyu (sıralama anahtarı, id) üzerinden keyset ile sayfalar.
+
+    Bir fazla satır okunarak sonraki sayfanın varlığı anlaşılır; varsa
+    cursor NEXT_CURSOR_HEADER header'ına yazılır. Cursor sıralama anahtarının
+    değerini de taşır, böylece sıralı sayfalar da OFFSET kullanmaz.
+
+    Args:
+        db: Async veritabanı oturumu
+        stmt: Model üzerinde select sorgusu
+        model: Sayfalanan ORM modeli
+        page: Sayfalama parametreleri
+        response: Header yazılacak response
+        sort: Sıralama anahtarı (None ise id artan)
+
+    Returns:
+        List: Sayfadaki ORM nesneleri
+    """
+    if page.after is not None:
+        stmt = stmt.where(_after(model, page.after, sort))
+    stmt = order_by_sort(stmt, model, sort).limit(page.limit + 1)
+    rows = list((await db.execute(stmt)).scalars().all())
+    if len(rows) > page.limit:
+        rows = rows[: page.limit]
+        last = rows[-1]
+        values = {"id": last.id}
+        if sort is not None:
+            values["s"] = sort.token
+            values["k"] = _cursor_value(getattr(last, sort.name))
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(values)
+    return rows
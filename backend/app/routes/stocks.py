@@ -3,17 +3,57 @@ Stok endpoint'leri.
 ERP sistemi için stok yönetimi CRUD işlemlerini sağlar.
 """
 
-from typing import List
+import datetime
+from typing import Any, Dict, List, Optional
 
 from app.auth import get_current_user
-from app.models import Stock
-from app.routes.common import get_db
-from app.schemas import StockCreate, StockRead, StockUpdate
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from app.core.settings import settings
+from app.entity_cache import cached_json, invalidate_after_commit
+from app.interfaces import CachedPayload
+from app.ledger import quantities_at
+from app.models import LowStockAlert, Stock
+from app.routes.common import (
+    commit_versioned,
+    ensure_version,
+    etag_for,
+    format_validation_error,
+    get_async_db,
+    if_match_version,
+    set_etag,
+)
+from app.routes.filters import STOCK_LIST_QUERY, ListQuery
+from app.routes.inventory import (
+    OUT_OF_STOCK_DETAIL,
+    PRODUCT_MISMATCH_DETAIL,
+    PRODUCT_NOT_FOUND_DETAIL,
+    link_stock_products,
+    product_id_for,
+    product_ids_by_name,
+    transfer_stock,
+)
+from app.routes.pagination import PageParams, paginate
+from app.routes.streaming import stream_ndjson, stream_param
+from app.routes.upserts import drop_duplicates, reject, update_rows, upsert_rows
+from app.schemas import (
+    BulkUpsertResponse,
+    LowStockAlertRead,
+    StockCreate,
+    StockLedgerBalance,
+    StockRead,
+    StockTransfer,
+    StockUpdate,
+    StockValuationRow,
+)
+from app.valuation import DIMENSIONS, report_cache, valuation_report
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Response, status
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 router = APIRouter()
 
+_VALUATION_ROWS = TypeAdapter(List[StockValuationRow])
+
 
 @router.post(
     "/",
@@ -26,30 +66,197 @@ router = APIRouter()
             "description": "Benzersiz ürün adı veya geçersiz veri / "
             "Unique product name or invalid data."
         },
+        422: {"description": "Ürün bulunamadı / Product not found."},
         401: {"description": "Yetkisiz / Unauthorized"},
     },
 )
-def create_stock(
+async def create_stock(
     stock: StockCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_auth=Depends(get_current_user),
 ):
     """
-    TR: Yeni stok kaydı ekler. Ürün adı benzersiz olmalıdır.
-    EN: Creates a new stock record. Product name must be unique.
+    TR: Yeni stok kaydı ekler. Ürün adı benzersiz olmalıdır. product_id
+    verilmezse aynı adlı ürüne bağlanır.
+    EN: Creates a new stock record. Product name must be unique. Without a
+    product_id the record is linked to the product with the same name.
     """
-    if db.query(Stock).filter(Stock.product_name == stock.product_name).first():
+    existing = await db.execute(
+        select(Stock.id).where(Stock.product_name == stock.product_name)
+    )
+    if existing.first():
         raise HTTPException(
             status_code=400,
             detail="Product name already exists",
         )
-    db_stock = Stock(**stock.model_dump())
+    values = stock.model_dump()
+    values["product_id"] = await product_id_for(
+        db, stock.product_id, stock.product_name
+    )
+    db_stock = Stock(**values)
     db.add(db_stock)
-    db.commit()
-    db.refresh(db_stock)
+    await db.commit()
+    await db.refresh(db_stock)
     return db_stock
 
 
+@router.post(
+    "/bulk",
+    response_model=BulkUpsertResponse,
+    summary="Toplu stok upsert / Bulk upsert stocks",
+    responses={
+        200: {"description": "Özet / Summary."},
+        413: {"description": "Çok fazla satır / Too many rows."},
+        401: {"description": "Yetkisiz / Unauthorized"},
+    },
+)
+async def upsert_stocks_bulk(
+    rows: List[Dict[str, Any]] = Body(...),
+    db: AsyncSession = Depends(get_async_db),
+    user_auth=Depends(get_current_user),
+):
+    """
+    TR: Stokları product_name üzerinden toplu ekler veya günceller.
+    quantity içeren satırlar StockCreate olarak upsert edilir; içermeyenler
+    StockUpdate olarak yalnızca mevcut kayıtları günceller.
+    EN: Bulk inserts or updates stocks keyed on product_name. Rows with a
+    quantity are upserted as StockCreate; rows without one are applied as
+    StockUpdate to existing records only.
+    """
+    if len(rows) > settings.BULK_MAX_ROWS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"En fazla {settings.BULK_MAX_ROWS} satır / "
+            f"At most {settings.BULK_MAX_ROWS} rows",
+        )
+    summary = BulkUpsertResponse()
+    valid = []
+    for index, payload in enumerate(rows):
+        schema = StockCreate if "quantity" in payload else StockUpdate
+        try:
+            values = schema.model_validate(payload).model_dump(exclude_unset=True)
+        except ValidationError as e:
+            reject(summary, index, format_validation_error(e))
+            continue
+        if not values.get("product_name"):
+            reject(summary, index, "product_name: Field required")
+        elif len(values) == 1:
+            reject(summary, index, "Güncellenecek alan yok / Nothing to update")
+        else:
+            valid.append((index, values))
+
+    full, partial = [], []
+    for index, values in drop_duplicates(valid, "product_name", summary):
+        (full if "quantity" in values else partial).append((index, values))
+    full = await link_stock_products(db, full, summary)
+    partial = await link_stock_products(db, partial, summary, resolve=False)
+    await upsert_rows(db, Stock, "product_name", full, summary)
+    await update_rows(db, Stock, "product_name", partial, summary)
+    summary.errors.sort(key=lambda error: error.index)
+    return summary
+
+
+@router.post(
+    "/transfers",
+    response_model=List[StockRead],
+    summary="Stok transferi / Transfer stock",
+    responses={
+        200: {"description": "Güncellenen stoklar / Updated stocks."},
+        404: {"description": "Stok bulunamadı / Stock not found."},
+        409: {"description": "Yetersiz stok / Insufficient stock."},
+        413: {"description": "Çok fazla transfer / Too many transfers."},
+        422: {
+            "description": "Stoğun ürünü yok veya ürünler farklı / "
+            "Stock has no product or products differ."
+        },
+        401: {"description": "Yetkisiz / Unauthorized"},
+    },
+)
+async def transfer_stocks(
+    transfers: List[StockTransfer] = Body(...),
+    db: AsyncSession = Depends(get_async_db),
+    user_auth=Depends(get_current_user),
+):
+    """
+    TR: Aynı ürüne bağlı stok satırları (konumlar) arasında transferleri tek
+    transaction'da uygular; kaynak azalır, hedef artar ve her transfer için
+    TRANSFER hareketi yazılır. Farklı ürünlere bağlı satırlar arasında
+    transfer 422 döner. Bir transfer bile yapılamazsa hiçbiri uygulanmaz.
+    EN: Applies transfers between stock rows (locations) of the same product
+    in one transaction; the source is decremented, the destination
+    incremented and a TRANSFER movement is written per transfer. Transfers
+    between rows of different products return 422. If any transfer fails,
+    none is applied.
+    """
+    if len(transfers) > settings.BULK_MAX_ROWS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"En fazla {settings.BULK_MAX_ROWS} transfer / "
+            f"At most {settings.BULK_MAX_ROWS} transfers",
+        )
+    ids = sorted({t.source_id for t in transfers} | {t.dest_id for t in transfers})
+    stocks, product_ids = {}, {}
+    for start in range(0, len(ids), settings.BULK_CHUNK_SIZE):
+        rows = await db.execute(
+            select(
+                Stock.id, Stock.product_name, Stock.location, Stock.product_id
+            ).where(Stock.id.in_(ids[start : start + settings.BULK_CHUNK_SIZE]))
+        )
+        for id, name, location, product_id in rows:
+            stocks[id] = (name, location)
+            if product_id is not None:
+                product_ids[id] = product_id
+    missing = [id for id in ids if id not in stocks]
+    if missing:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Stok bulunamadı / Stock not found: {missing[:20]}",
+        )
+    # Ürüne bağlanmamış satırlar ürün adından çözülür
+    unlinked = set(ids) - product_ids.keys()
+    by_name = await product_ids_by_name(db, (stocks[id][0] for id in unlinked))
+    product_ids.update(
+        (id, by_name[stocks[id][0]]) for id in unlinked if stocks[id][0] in by_name
+    )
+    unknown = sorted({stocks[id][0] for id in unlinked - product_ids.keys()})
+    if unknown:
+        raise HTTPException(
+            status_code=422,
+            detail=f"{PRODUCT_NOT_FOUND_DETAIL}: {unknown[:20]}",
+        )
+    # product_name benzersiz olduğundan konum başına stok ayrı satırlardadır;
+    # transfer yalnızca aynı ürüne bağlı satırlar arasında anlamlıdır
+    mismatched = [
+        (t.source_id, t.dest_id)
+        for t in transfers
+        if product_ids[t.source_id] != product_ids[t.dest_id]
+    ]
+    if mismatched:
+        raise HTTPException(
+            status_code=422,
+            detail=f"{PRODUCT_MISMATCH_DETAIL}: {mismatched[:20]}",
+        )
+
+    stock_id = await transfer_stock(db, transfers, stocks, product_ids)
+    if stock_id is not None:
+        await db.rollback()
+        raise HTTPException(
+            status_code=409, detail=f"{OUT_OF_STOCK_DETAIL}: stock_id={stock_id}"
+        )
+    invalidate_after_commit(db, "stock", ids)
+    await db.commit()
+
+    updated = []
+    for start in range(0, len(ids), settings.BULK_CHUNK_SIZE):
+        result = await db.execute(
+            select(Stock)
+            .where(Stock.id.in_(ids[start : start + settings.BULK_CHUNK_SIZE]))
+            .order_by(Stock.id)
+        )
+        updated.extend(result.scalars())
+    return updated
+
+
 @router.get(
     "/",
     response_model=List[StockRead],
@@ -59,12 +266,122 @@ def create_stock(
         401: {"description": "Yetkisiz / Unauthorized"},
     },
 )
-def list_stocks(db: Session = Depends(get_db), user_auth=Depends(get_current_user)):
+async def list_stocks(
+    response: Response,
+    page: PageParams = Depends(),
+    query: ListQuery = Depends(STOCK_LIST_QUERY),
+    stream: bool = Depends(stream_param),
+    db: AsyncSession = Depends(get_async_db),
+    user_auth=Depends(get_current_user),
+):
+    """
+    TR: Stokları cursor ile sayfalayarak listeler; filtre ve sıralama
+    parametrelerini destekler. stream=1 ile tüm sonuç NDJSON olarak akar.
+    EN: Lists stocks page by page using a cursor, with filter and sort
+    parameters. stream=1 streams the whole result as NDJSON.
+    """
+    stmt = select(Stock).where(*query.clauses)
+    if stream:
+        return stream_ndjson(db, stmt, Stock, StockRead, query.sort)
+    return await paginate(db, stmt, Stock, page, response, query.sort)
+
+
+@router.get(
+    "/ledger",
+    response_model=List[StockLedgerBalance],
+    summary="Stok defteri bakiyesi / Stock ledger balance",
+    responses={
+        200: {"description": "Ürün/konum bakiyeleri / Product/location balances."},
+        401: {"description": "Yetkisiz / Unauthorized"},
+    },
+)
+async def get_stock_ledger(
+    product_id: Optional[int] = Query(None, description="Ürün / Product id"),
+    location: Optional[str] = Query(None, description="Konum / Location"),
+    at: Optional[datetime.datetime] = Query(
+        None, description="Sorgulanan zaman / Point in time (default: now)"
+    ),
+    db: AsyncSession = Depends(get_async_db),
+    user_auth=Depends(get_current_user),
+):
+    """
+    TR: Stok hareketlerinden hesaplanan ürün/konum bakiyelerini verilen
+    zamanda döndürür (son anlık görüntü + sonraki hareketler).
+    EN: Returns product/location balances derived from stock movements at
+    the given time (latest snapshot + the movements after it).
+    """
+    balances = await quantities_at(db, at, product_id, location)
+    return [
+        StockLedgerBalance(product_id=pid, location=loc, quantity=quantity)
+        for (pid, loc), quantity in sorted(
+            balances.items(), key=lambda item: (item[0][0], item[0][1] or "")
+        )
+    ]
+
+
+@router.get(
+    "/alerts",
+    response_model=List[LowStockAlertRead],
+    summary="Düşük stok uyarıları / Low-stock alerts",
+    responses={
+        200: {"description": "Güncel uyarılar / Current alerts."},
+        401: {"description": "Yetkisiz / Unauthorized"},
+    },
+)
+async def list_stock_alerts(
+    response: Response,
+    item_type: Optional[str] = Query(
+        None, pattern="^(stock|product)$", description="stock | product"
+    ),
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_async_db),
+    user_auth=Depends(get_current_user),
+):
     """
-    TR: Tüm stokları listeler.
-    EN: Lists all stocks.
+    TR: Yeniden sipariş eşiğinin altındaki stok ve ürünleri cursor ile
+    sayfalayarak listeler. Uyarılar arka plandaki tarayıcı tarafından
+    güncellenir.
+    EN: Lists stocks and products below their reorder threshold page by page
+    using a cursor. Alerts are maintained by the background scanner.
     """
-    return db.query(Stock).all()
+    stmt = select(LowStockAlert)
+    if item_type is not None:
+        stmt = stmt.where(LowStockAlert.item_type == item_type)
+    return await paginate(db, stmt, LowStockAlert, page, response)
+
+
+@router.get(
+    "/reports/valuation",
+    response_model=List[StockValuationRow],
+    summary="Stok değerleme raporu / Stock valuation report",
+    responses={
+        200: {"description": "Grup toplamları / Group totals."},
+        401: {"description": "Yetkisiz / Unauthorized"},
+    },
+)
+async def stock_valuation_report(
+    group_by: str = Query(
+        "location",
+        pattern=f"^({'|'.join(DIMENSIONS)})$",
+        description="location | supplier",
+    ),
+    db: AsyncSession = Depends(get_async_db),
+    user_auth=Depends(get_current_user),
+):
+    """
+    TR: Stok değerini (sum(quantity * unit_price)), miktarı ve satır sayısını
+    konuma veya tedarikçiye göre gruplanmış döndürür. Toplama SQL'de yapılır,
+    yanıt REPORT_CACHE_TTL süresince cache'ten döner.
+    EN: Returns stock value (sum(quantity * unit_price)), quantity and row
+    count grouped by location or supplier. Aggregation runs in SQL and the
+    response is served from cache for REPORT_CACHE_TTL seconds.
+    """
+
+    async def build() -> CachedPayload:
+        rows = await valuation_report(db, group_by)
+        return CachedPayload(_VALUATION_ROWS.dump_json(rows))
+
+    return await cached_json("valuation", group_by, "", build, report_cache)
 
 
 @router.get(
@@ -77,17 +394,31 @@ def list_stocks(db: Session = Depends(get_db), user_auth=Depends(get_current_use
         401: {"description": "Yetkisiz / Unauthorized"},
     },
 )
-def get_stock(
-    id: int, db: Session = Depends(get_db), user_auth=Depends(get_current_user)
+async def get_stock(
+    id: int,
+    db: AsyncSession = Depends(get_async_db),
+    user_auth=Depends(get_current_user),
 ):
     """
-    TR: Tek stok kaydını getirir.
-    EN: Returns a single stock record.
+    TR: Tek stok kaydını getirir; sürüm ETag header'ında döner. Yanıt
+    entity cache'ten okunur, yazımlarda geçersiz kılınır.
+    EN: Returns a single stock record; its version is sent as the ETag
+    header. The response is served from the entity cache and invalidated
+    on writes.
     """
-    stock = db.query(Stock).filter(Stock.id == id).first()
-    if not stock:
-        raise HTTPException(status_code=404, detail="Stok bulunamadı / Stock not found")
-    return stock
+
+    async def build() -> CachedPayload:
+        stock = await db.get(Stock, id)
+        if not stock:
+            raise HTTPException(
+                status_code=404, detail="Stok bulunamadı / Stock not found"
+            )
+        return CachedPayload(
+            StockRead.model_validate(stock).model_dump_json().encode(),
+            etag_for(stock),
+        )
+
+    return await cached_json("stock", id, "", build)
 
 
 @router.put(
@@ -101,36 +432,57 @@ def get_stock(
             "description": "Benzersiz ürün adı veya geçersiz veri / "
             "Unique product name or invalid data."
         },
+        412: {"description": "Sürüm uyuşmuyor / Version mismatch (If-Match)."},
+        422: {"description": "Ürün bulunamadı / Product not found."},
         401: {"description": "Yetkisiz / Unauthorized"},
     },
 )
-def update_stock(
+async def update_stock(
     id: int,
     stock: StockUpdate,
-    db: Session = Depends(get_db),
+    response: Response,
+    expected_version: Optional[int] = Depends(if_match_version),
+    db: AsyncSession = Depends(get_async_db),
     user_auth=Depends(get_current_user),
 ):
     """
-    TR: Stok kaydını günceller.
-    EN: Updates a stock record.
+    TR: Stok kaydını günceller. If-Match ile gönderilen sürüm kayıttakiyle
+    eşleşmezse 412 döner. Ürün adı değişip product_id verilmezse kayıt
+    yeni adlı ürüne bağlanır.
+    EN: Updates a stock record. Returns 412 if the version sent with
+    If-Match does not match the record. When the product name changes
+    without a product_id, the record is linked to the newly named product.
     """
-    db_stock = db.query(Stock).filter(Stock.id == id).first()
+    db_stock = await db.get(Stock, id)
     if not db_stock:
         raise HTTPException(status_code=404, detail="Stok bulunamadı / Stock not found")
+    ensure_version(db_stock, expected_version)
     if (
         stock.product_name
-        and db.query(Stock)
-        .filter(Stock.product_name == stock.product_name, Stock.id != id)
-        .first()
+        and (
+            await db.execute(
+                select(Stock.id).where(
+                    Stock.product_name == stock.product_name, Stock.id != id
+                )
+            )
+        ).first()
     ):
         raise HTTPException(
             status_code=400,
             detail="Product name already exists",
         )
-    for key, value in stock.model_dump(exclude_unset=True).items():
+    values = stock.model_dump(exclude_unset=True)
+    if "product_id" in values or "product_name" in values:
+        values["product_id"] = await product_id_for(
+            db,
+            values.get("product_id"),
+            values.get("product_name") or db_stock.product_name,
+        )
+    for key, value in values.items():
         setattr(db_stock, key, value)
-    db.commit()
-    db.refresh(db_stock)
+    await commit_versioned(db, db_stock, "quantity")
+    await db.refresh(db_stock)
+    set_etag(response, db_stock)
     return db_stock
 
 
@@ -144,16 +496,18 @@ def update_stock(
         401: {"description": "Yetkisiz / Unauthorized"},
     },
 )
-def delete_stock(
-    id: int, db: Session = Depends(get_db), user_auth=Depends(get_current_user)
+async def delete_stock(
+    id: int,
+    db: AsyncSession = Depends(get_async_db),
+    user_auth=Depends(get_current_user),
 ):
     """
     TR: Stok kaydını siler.
     EN: Deletes a stock record.
     """
-    db_stock = db.query(Stock).filter(Stock.id == id).first()
+    db_stock = await db.get(Stock, id)
     if not db_stock:
         raise HTTPException(status_code=404, detail="Stok bulunamadı / Stock not found")
-    db.delete(db_stock)
-    db.commit()
+    await db.delete(db_stock)
+    await db.commit()
     return
@@ -0,0 +1,83 @@
+"""
+Liste endpoint'leri için NDJSON streaming yanıtları.
+Satırlar server-side cursor ile parça parça okunur ve satır satır
+serileştirilir; sonuç boyutu ne olursa olsun bellek kullanımı sabit kalır.
+"""
+
+from typing import AsyncIterator, Callable, Iterable, Optional, Type
+
+from app.core.settings import settings
+from app.routes.filters import SortKey
+from app.routes.pagination import order_by_sort
+from fastapi import Query, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def stream_param(
+    request: Request,
+    stream: bool = Query(
+        False,
+        description="Tüm sonucu NDJSON olarak akıt / Stream the whole result as "
+        f"NDJSON (or send Accept: {NDJSON_MEDIA_TYPE})",
+    ),
+) -> bool:
+    """?stream=1 veya Accept: application/x-ndjson ile streaming istenir."""
+    return stream or NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def stream_ndjson(
+    db: AsyncSession,
+    stmt: Select,
+    model,
+    schema: Type[BaseModel],
+    sort: Optional[SortKey] = None,
+    prepare: Optional[Callable[[Iterable], Iterable]] = None,
+) -> StreamingResponse:
+    """
+    Sorgu sonucunu NDJSON olarak akıtan response üretir.
+
+    Sayfalama uygulanmaz; satırlar (sıralama anahtarı, id) sırasıyla
+    settings.STREAM_BATCH_SIZE'lık parçalar halinde okunur (yield_per,
+    server-side cursor). Session identity map'i zayıf referans tuttuğundan
+    yazılan parçalar bellekte birikmez.
+
+    Gövde route döndükten sonra üretildiği için istek oturumu kullanılmaz
+    (dependency kapanışı sürüme göre gövdeden önce olabilir); generator
+    aynı engine üzerinde kendi oturumunu açar ve akış bitince kapatır.
+
+    Args:
+        db: İstek oturumu (yalnızca engine'i kullanılır)
+        stmt: Model üzerinde select sorgusu
+        model: Sorgulanan ORM modeli
+        schema: Satırları serileştirecek Pydantic şeması
+        sort: Sıralama anahtarı (None ise id artan)
+        prepare: Serileştirmeden önce her parçaya uygulanacak fonksiyon
+
+    Returns:
+        StreamingResponse: application/x-ndjson yanıtı
+    """
+    stmt = order_by_sort(stmt, model, sort).execution_options(
+        yield_per=settings.STREAM_BATCH_SIZE
+    )
+
+    bind = db.bind
+
+    async def lines() -> AsyncIterator[str]:
+        async with AsyncSession(
+            bind=bind, autoflush=False, expire_on_commit=False
+        ) as session:
+            result = await session.stream_scalars(stmt)
+            async for partition in result.partitions():
+                if prepare is not None:
+                    partition = prepare(partition)
+                yield "".join(
+                    schema.model_validate(row).model_dump_json() + "\n"
+                    for row in partition
+                )
+
+    return StreamingResponse(lines(), media_type=NDJSON_MEDIA_TYPE)
@@ -0,0 +1,154 @@
+"""
+Benzersiz anahtar üzerinden toplu upsert yardımcıları.
+Satırlar parça parça, parça başına tek INSERT ... ON CONFLICT DO UPDATE
+(executemany) ile yazılır; her parça ayrı transaction'dır.
+"""
+
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Tuple
+
+from app import schemas
+from app.core.settings import settings
+from app.entity_cache import invalidate_keys_after_commit
+from app.routes.common import chunked, existing_ids, upsert_statement, version_bump
+from app.valuation import mark_keys_before_write
+from sqlalchemy import bindparam, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+DUPLICATE_DETAIL = "Aynı anahtar tekrar ediyor, son satır geçerli / Duplicate key"
+NOT_FOUND_DETAIL = "Kayıt bulunamadı / Record not found"
+
+# (istekteki satır sırası, kolon -> değer)
+Row = Tuple[int, Dict[str, Any]]
+
+
+def reject(summary: schemas.BulkUpsertResponse, index: int, error: str) -> None:
+    summary.rejected += 1
+    summary.errors.append(schemas.BulkRowError(index=index, error=error))
+
+
+def drop_duplicates(
+    rows: Iterable[Row], key: str, summary: schemas.BulkUpsertResponse
+) -> List[Row]:
+    """Aynı anahtarlı satırlardan sonuncusunu tutar, öncekileri reddeder."""
+    last = {}
+    for index, values in rows:
+        previous = last.get(values[key])
+        if previous is not None:
+            reject(summary, previous[0], DUPLICATE_DETAIL)
+        last[values[key]] = (index, values)
+    return sorted(last.values(), key=lambda row: row[0])
+
+
+def _by_columns(rows: List[Row]) -> Dict[frozenset, List[Row]]:
+    """Satırları verilen kolon kümesine göre gruplar (tek ifade, tek şekil)."""
+    groups = defaultdict(list)
+    for row in rows:
+        groups[frozenset(row[1])].append(row)
+    return groups
+
+
+async def _write_chunks(db, rows, summary, write) -> List[Row]:
+    """
+    Satırları parça parça yazar; hata alan parçayı geri alıp reddeder.
+
+    Returns:
+        List[Row]: Başarıyla yazılan satırlar
+    """
+    written = []
+    for chunk in chunked(rows, settings.BULK_CHUNK_SIZE):
+        try:
+            for columns, group in _by_columns(chunk).items():
+                await write(columns, [values for _, values in group])
+            await db.commit()
+        except SQLAlchemyError as e:
+            await db.rollback()
+            for index, _ in chunk:
+                reject(summary, index, e.__class__.__name__)
+            continue
+        written.extend(chunk)
+    return written
+
+
+async def upsert_rows(
+    db: AsyncSession,
+    model: Any,
+    key: str,
+    rows: List[Row],
+    summary: schemas.BulkUpsertResponse,
+) -> None:
+    """
+    Tam satırları anahtar kolonu üzerinde upsert eder.
+
+    Args:
+        db: Async veritabanı oturumu
+        model: Hedef ORM modeli
+        key: Benzersiz kısıtlı kolon adı (örn. "product_name")
+        rows: Doğrulanmış, anahtarı tekil satırlar
+        summary: Sayaçların güncelleneceği özet
+    """
+    table = model.__table__
+    existing = await existing_ids(db, table.c[key], (v[key] for _, v in rows))
+
+    async def write(columns, values):
+        updated = [v[key] for v in values if v[key] in existing]
+        await mark_keys_before_write(db, model, table.c[key], updated)
+        stmt = upsert_statement(db, table, [key], sorted(columns - {key}))
+        await db.execute(stmt, values)
+        await invalidate_keys_after_commit(db, model, table.c[key], updated)
+
+    for _, values in await _write_chunks(db, rows, summary, write):
+        if values[key] in existing:
+            summary.updated += 1
+        else:
+            summary.inserted += 1
+
+
+async def update_rows(
+    db: AsyncSession,
+    model: Any,
+    key: str,
+    rows: List[Row],
+    summary: schemas.BulkUpsertResponse,
+) -> None:
+    """
+    Kısmi satırlarla yalnızca mevcut kayıtları günceller.
+
+    Args:
+        db: Async veritabanı oturumu
+        model: Hedef ORM modeli
+        key: Benzersiz kısıtlı kolon adı
+        rows: Doğrulanmış, anahtarı tekil kısmi satırlar
+        summary: Sayaçların güncelleneceği özet
+    """
+    table = model.__table__
+    existing = await existing_ids(db, table.c[key], (v[key] for _, v in rows))
+    found = []
+    for index, values in rows:
+        if values[key] in existing:
+            found.append((index, values))
+        else:
+            reject(summary, index, NOT_FOUND_DETAIL)
+
+    async def write(columns, values):
+        await mark_keys_before_write(db, model, table.c[key], (v[key] for v in values))
+        # bindparam adları kolon adlarıyla çakışamaz, "b_" önekiyle bağlanır
+        stmt = (
+            update(table)
+            .where(table.c[key] == bindparam(f"b_{key}"))
+            .values(
+                {
+                    **{name: bindparam(f"b_{name}") for name in columns - {key}},
+                    **version_bump(table),
+                }
+            )
+        )
+        await db.execute(
+            stmt, [{f"b_{name}": value for name, value in v.items()} for v in values]
+        )
+        await invalidate_keys_after_commit(
+            db, model, table.c[key], (v[key] for v in values)
+        )
+
+    summary.updated += len(await _write_chunks(db, found, summary, write))
@@ -3,19 +3,55 @@ Kullanıcı ve kimlik doğrulama endpoint'leri.
 ERP sistemi için kullanıcı yönetimi CRUD işlemlerini sağlar.
 """
 
-from typing import List
+from typing import FrozenSet, List
 
+from app import models, schemas
 from app.auth import get_current_user
-from app.core.security import create_access_token, hash_password
-from app.routes.common import get_db
-from fastapi import APIRouter, Depends, HTTPException, status
+from app.core.security import (
+    create_access_token,
+    dummy_verify_async,
+    hash_password_async,
+    password_needs_rehash,
+    verify_password_async,
+)
+from app.entity_cache import cached_json, embedded_products
+from app.interfaces import CachedPayload
+from app.refresh_tokens import access_claims, issue_refresh_token
+from app.routes.common import get_async_db
+from app.routes.filters import USER_LIST_QUERY, ListQuery
+from app.routes.inventory import release_order
+from app.routes.loaders import (
+    USER_DELETE_OPTIONS,
+    USER_DETAIL_DEFAULT,
+    USER_INCLUDES,
+    USER_LIST_DEFAULT,
+    expand_includes,
+    fill_unloaded,
+    include_param,
+    user_load_options,
+)
+from app.routes.pagination import PageParams, paginate
+from app.routes.streaming import stream_ndjson, stream_param
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
-
-from app import models, schemas
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 
 router = APIRouter()
 
+USER_DETAIL_OPTIONS = user_load_options(expand_includes(USER_DETAIL_DEFAULT))
+
+
+async def _get_user(db: AsyncSession, user_id: int, *options):
+    """Kullanıcıyı verilen loader seçenekleriyle getirir."""
+    result = await db.execute(
+        select(models.User)
+        .options(*options)
+        .where(models.User.id == user_id)
+        .execution_options(populate_existing=True)
+    )
+    return result.scalars().first()
+
 
 class LoginRequest(BaseModel):
     username: str
@@ -34,53 +70,83 @@ async def test_endpoint():
     responses={
         200: {"description": "Başarılı giriş / Successful login"},
         401: {"description": "Geçersiz kimlik bilgileri / Invalid credentials"},
+        503: {"description": "Şifre servisi yoğun / Password service busy"},
     },
 )
 async def login(
     login_data: LoginRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
-    TR: Kullanıcı girişi yapar ve JWT token döndürür.
-    EN: Performs user login and returns JWT token.
+    TR: E-posta (büyük/küçük harf duyarsız) ve şifreyle giriş yapar, JWT token
+    döndürür. Hash'in maliyeti BCRYPT_ROUNDS'tan farklıysa şifre yeniden hash'lenir.
+    EN: Logs in with a case-insensitive email and password and returns a JWT
+    token. The password is rehashed when its cost differs from BCRYPT_ROUNDS.
     """
-    # Test için basit bir kullanıcı kontrolü
-    # Gerçek uygulamada database'den kullanıcı kontrolü yapılır
-    if login_data.username == "admin" and login_data.password == "admin123":
-        # Token oluştur
-        access_token = create_access_token(
-            data={"sub": login_data.username, "role": "admin"}
-        )
-        return {
-            "access_token": access_token,
-            "token_type": "bearer",
-            "user": {
-                "username": login_data.username,
-                "role": "admin",
-                "permissions": ["read", "write", "delete", "admin"],
-            },
-        }
-    elif login_data.username == "user" and login_data.password == "user123":
-        # Normal kullanıcı token'ı
-        access_token = create_access_token(
-            data={"sub": login_data.username, "role": "user"}
+    email = login_data.username.strip().lower()
+    db_user = (
+        (
+            await db.execute(
+                select(models.User)
+                .where(func.lower(models.User.email) == email)
+                .order_by(models.User.id)
+                .limit(1)
+            )
         )
-        return {
-            "access_token": access_token,
-            "token_type": "bearer",
-            "user": {
-                "username": login_data.username,
-                "role": "user",
-                "permissions": ["read", "write"],
-            },
-        }
-    else:
+        .scalars()
+        .first()
+    )
+    if db_user is None:
+        await dummy_verify_async(login_data.password)
+    if (
+        db_user is None
+        or not await verify_password_async(login_data.password, db_user.password_hash)
+        or not db_user.is_active
+    ):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Geçersiz kullanıcı adı veya şifre / Invalid username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    if password_needs_rehash(db_user.password_hash):
+        await _rehash_password(db, db_user, login_data.password)
+
+    claims = access_claims(db_user)
+    refresh_token = issue_refresh_token(db, db_user.id)
+    await db.commit()
+    return {
+        "access_token": create_access_token(data=claims),
+        "refresh_token": refresh_token,
+        "token_type": "bearer",
+        "user": {
+            "id": db_user.id,
+            "username": db_user.email,
+            "role": db_user.role,
+            "permissions": claims["permissions"],
+        },
+    }
+
+
+async def _rehash_password(db: AsyncSession, db_user: models.User, password: str):
+    """
+    Başarılı girişte hash'i güncel BCRYPT_ROUNDS ile yeniden oluşturur.
+    Havuz doluysa atlanır (bir sonraki girişte tekrar denenir); arada şifre
+    değiştiyse eski hash'e koşullu güncelleme hiçbir satırı etkilemez.
+    """
+    old_hash = db_user.password_hash
+    try:
+        new_hash = await hash_password_async(password)
+    except HTTPException:
+        return
+    await db.execute(
+        update(models.User)
+        .where(models.User.id == db_user.id, models.User.password_hash == old_hash)
+        .values(password_hash=new_hash)
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+
 
 @router.post(
     "/",
@@ -97,11 +163,12 @@ async def login(
             "Email already registered or invalid data."
         },
         401: {"description": "Yetkisiz / Unauthorized"},
+        503: {"description": "Şifre servisi yoğun / Password service busy"},
     },
 )
 async def create_user(
     user: schemas.UserCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_auth=Depends(get_current_user),
 ):
     """
@@ -109,23 +176,34 @@ async def create_user(
     EN: Creates a new user. Email must be unique.
     """
     print(f"[DEBUG] Gelen kullanıcı verisi: {user.model_dump()}")
-    existing = db.query(models.User).filter(models.User.email == user.email).first()
+    existing = (
+        (
+            await db.execute(
+                select(models.User.id).where(
+                    func.lower(models.User.email) == user.email.lower()
+                )
+            )
+        )
+        .scalars()
+        .first()
+    )
     if existing:
         print(f"[DEBUG] E-posta zaten kayıtlı: {user.email}")
         raise HTTPException(
             status_code=400,
             detail="Email already exists",
         )
+    hashed_pw = await hash_password_async(user.password)
     try:
-        hashed_pw = hash_password(user.password)
         user_data = user.model_dump(exclude={"password"})
         if "is_active" in user_data:
             user_data["is_active"] = int(user_data["is_active"])
         db_user = models.User(**user_data, password_hash=hashed_pw)
         db.add(db_user)
-        db.commit()
-        db.refresh(db_user)
+        await db.commit()
         print(f"[DEBUG] Kullanıcı başarıyla oluşturuldu: {db_user.id}")
+        db_user = await _get_user(db, db_user.id, *USER_DETAIL_OPTIONS)
+        fill_unloaded([db_user])
         return db_user
     except Exception as e:
         print(f"[ERROR] Kullanıcı oluşturulurken hata: {e}")
@@ -142,13 +220,30 @@ async def create_user(
     },
 )
 async def list_users(
-    db: Session = Depends(get_db), user_auth=Depends(get_current_user)
+    response: Response,
+    page: PageParams = Depends(),
+    query: ListQuery = Depends(USER_LIST_QUERY),
+    stream: bool = Depends(stream_param),
+    include: FrozenSet[str] = Depends(include_param(USER_INCLUDES, USER_LIST_DEFAULT)),
+    db: AsyncSession = Depends(get_async_db),
+    user_auth=Depends(get_current_user),
 ):
     """
-    TR: Tüm kullanıcıları listeler.
-    EN: Lists all users.
+    TR: Kullanıcıları cursor ile sayfalayarak listeler; filtre ve sıralama
+    parametrelerini destekler. stream=1 ile tüm sonuç NDJSON olarak akar.
+    EN: Lists users page by page using a cursor, with filter and sort
+    parameters. stream=1 streams the whole result as NDJSON.
     """
-    return db.query(models.User).all()
+    stmt = (
+        select(models.User).options(*user_load_options(include)).where(*query.clauses)
+    )
+    if stream:
+        return stream_ndjson(
+            db, stmt, models.User, schemas.UserRead, query.sort, fill_unloaded
+        )
+    return fill_unloaded(
+        await paginate(db, stmt, models.User, page, response, query.sort)
+    )
 
 
 @router.get(
@@ -163,19 +258,37 @@ async def list_users(
 )
 async def get_user(
     user_id: int,
-    db: Session = Depends(get_db),
+    include: FrozenSet[str] = Depends(
+        include_param(USER_INCLUDES, USER_DETAIL_DEFAULT)
+    ),
+    db: AsyncSession = Depends(get_async_db),
     user_auth=Depends(get_current_user),
 ):
     """
-    TR: Kullanıcıyı ve siparişlerini getirir.
-    EN: Returns user and their orders.
+    TR: Kullanıcıyı ve siparişlerini getirir. Yanıt entity cache'ten okunur,
+    yazımlarda geçersiz kılınır.
+    EN: Returns user and their orders. The response is served from the
+    entity cache and invalidated on writes.
     """
-    user = db.query(models.User).filter(models.User.id == user_id).first()
-    if not user:
-        raise HTTPException(
-            status_code=404, detail="Kullanıcı bulunamadı. / User not found."
+
+    async def build() -> CachedPayload:
+        user = await _get_user(db, user_id, *user_load_options(include))
+        if not user:
+            raise HTTPException(
+                status_code=404, detail="Kullanıcı bulunamadı. / User not found."
+            )
+        fill_unloaded([user])
+        products = ()
+        if "orders.items.product" in include:
+            products = embedded_products(
+                item for order in user.orders for item in order.order_items
+            )
+        return CachedPayload(
+            schemas.UserRead.model_validate(user).model_dump_json().encode(),
+            depends=products,
         )
-    return user
+
+    return await cached_json("user", user_id, ",".join(sorted(include)), build)
 
 
 @router.put(
@@ -187,19 +300,20 @@ async def get_user(
         404: {"description": "Kullanıcı bulunamadı / User not found."},
         400: {"description": "Geçersiz veri / Invalid data."},
         401: {"description": "Yetkisiz / Unauthorized"},
+        503: {"description": "Şifre servisi yoğun / Password service busy"},
     },
 )
 async def update_user(
     user_id: int,
     user: schemas.UserUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_auth=Depends(get_current_user),
 ):
     """
     TR: Kullanıcı bilgilerini günceller.
     EN: Updates user information.
     """
-    db_user = db.query(models.User).filter(models.User.id == user_id).first()
+    db_user = await db.get(models.User, user_id)
     if not db_user:
         raise HTTPException(
             status_code=404, detail="Kullanıcı bulunamadı. / User not found."
@@ -208,11 +322,14 @@ async def update_user(
     if "is_active" in update_data:
         update_data["is_active"] = int(update_data["is_active"])
     if "password" in update_data:
-        update_data["password_hash"] = hash_password(update_data.pop("password"))
+        update_data["password_hash"] = await hash_password_async(
+            update_data.pop("password")
+        )
     for key, value in update_data.items():
         setattr(db_user, key, value)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    db_user = await _get_user(db, user_id, *USER_DETAIL_OPTIONS)
+    fill_unloaded([db_user])
     return db_user
 
 
@@ -228,18 +345,28 @@ async def update_user(
 )
 async def delete_user(
     user_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_auth=Depends(get_current_user),
 ):
     """
-    TR: Kullanıcıyı siler.
-    EN: Deletes a user.
+    TR: Kullanıcıyı siler; teslim edilmemiş siparişlerinin stok rezervasyonu
+    aynı transaction'da bırakılır.
+    EN: Deletes a user; stock reserved by their undelivered orders is released
+    in the same transaction.
     """
-    db_user = db.query(models.User).filter(models.User.id == user_id).first()
+    # delete-orphan cascade için siparişler ve adresler önceden yüklenmeli
+    db_user = await _get_user(db, user_id, *USER_DELETE_OPTIONS)
     if not db_user:
         raise HTTPException(
             status_code=404, detail="Kullanıcı bulunamadı. / User not found."
         )
-    db.delete(db_user)
-    db.commit()
+    # refresh_tokens ORM ilişkisi olmadan user_id'ye bağlıdır
+    await db.execute(
+        delete(models.RefreshToken).where(models.RefreshToken.user_id == user_id)
+    )
+    # Cascade ile silinecek teslim edilmemiş siparişlerin stoğu geri bırakılır
+    for order in db_user.orders:
+        await release_order(db, order)
+    await db.delete(db_user)
+    await db.commit()
     return
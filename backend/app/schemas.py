@@ -7,7 +7,14 @@ Kullanıcı, ürün, sipariş ve stok modelleri için Create, Read ve Update şe
 from datetime import datetime
 from typing import List, Optional
 
-from pydantic import BaseModel, ConfigDict, EmailStr, field_validator
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    EmailStr,
+    Field,
+    field_validator,
+    model_validator,
+)
 
 # --- User & Address Schemas ---
 
@@ -134,6 +141,7 @@ class ProductBase(BaseModel):
     stock: int
     description: Optional[str] = None
     is_active: bool = True
+    reorder_threshold: Optional[int] = None
 
 
 class ProductCreate(ProductBase):
@@ -143,6 +151,7 @@ class ProductCreate(ProductBase):
 class ProductRead(ProductBase):
     id: int
     created_at: datetime
+    version: int = 1
     category: Optional[CategoryRead] = None
     model_config = ConfigDict(from_attributes=True)
 
@@ -152,7 +161,8 @@ class ProductRead(ProductBase):
 
 class OrderItemBase(BaseModel):
     product_id: int
-    quantity: int
+    # Rezervasyon ve serbest bırakma aynı kuralla çalışsın diye pozitif olmalı
+    quantity: int = Field(..., gt=0)
     unit_price: float
     total_price: float
 
@@ -184,16 +194,44 @@ class OrderRead(OrderBase):
     order_items: List[OrderItemRead] = []
     shipping_address: Optional[AddressRead] = None
     product_name: Optional[str] = None
+    version: int = 1
     model_config = ConfigDict(from_attributes=True)
 
 
+class OrderBulkResult(BaseModel):
+    """
+    Toplu sipariş girişinde tek satırın sonucu.
+
+    Attributes:
+        index: İstekteki satır sırası
+        status: created veya rejected
+        order_id: Oluşturulan sipariş kimliği
+        error: Reddedilme nedeni
+    """
+
+    index: int
+    status: str
+    order_id: Optional[int] = None
+    error: Optional[str] = None
+
+
+class OrderBulkResponse(BaseModel):
+    created: int
+    rejected: int
+    results: List[OrderBulkResult]
+
+
 # --- Stock & StockMovement Schemas ---
 
 
 class StockBase(BaseModel):
     product_name: str
+    product_id: Optional[int] = None
     quantity: int
+    unit_price: float = 0.0
+    supplier: Optional[str] = None
     location: Optional[str] = None
+    reorder_threshold: Optional[int] = None
 
     @field_validator("product_name")
     @classmethod
@@ -215,6 +253,7 @@ class StockCreate(StockBase):
 class StockRead(StockBase):
     id: int
     created_at: datetime
+    version: int = 1
     model_config = ConfigDict(from_attributes=True)
 
 
@@ -239,8 +278,12 @@ class StockMovementRead(StockMovementBase):
 
 class StockUpdate(BaseModel):
     product_name: Optional[str] = None
+    product_id: Optional[int] = None
     quantity: Optional[int] = None
+    unit_price: Optional[float] = None
+    supplier: Optional[str] = None
     location: Optional[str] = None
+    reorder_threshold: Optional[int] = None
 
     @field_validator("product_name")
     @classmethod
@@ -250,4 +293,132 @@ class StockUpdate(BaseModel):
         return v
 
 
+class StockTransfer(BaseModel):
+    """
+    İki stok satırı arasında transfer.
+
+    Attributes:
+        source_id: Miktarın düşüleceği stok kimliği
+        dest_id: Miktarın ekleneceği stok kimliği
+        quantity: Transfer miktarı
+    """
+
+    source_id: int
+    dest_id: int
+    quantity: int
+
+    @field_validator("quantity")
+    @classmethod
+    def quantity_positive(cls, v):
+        if v <= 0:
+            raise ValueError("Quantity must be positive")
+        return v
+
+    @model_validator(mode="after")
+    def distinct_rows(self):
+        if self.source_id == self.dest_id:
+            raise ValueError(
+                "Kaynak ve hedef aynı / Source and destination are the same"
+            )
+        return self
+
+
+class StockLedgerBalance(BaseModel):
+    """
+    Stok defterinden hesaplanan ürün/konum bakiyesi.
+
+    Attributes:
+        product_id: Ürün kimliği
+        location: Stok konumu
+        quantity: Sorgulanan zamandaki miktar
+    """
+
+    product_id: int
+    location: Optional[str] = None
+    quantity: int
+
+
+class LowStockAlertRead(BaseModel):
+    """
+    Eşiğin altına düşmüş stok veya ürün uyarısı.
+
+    Attributes:
+        id: Uyarı kimliği
+        item_type: Kaynak tablo ("stock" veya "product")
+        item_id: Kaynak satır kimliği
+        name: Ürün adı
+        quantity: Son taramadaki miktar
+        reorder_threshold: Son taramadaki eşik
+        detected_at: Uyarının ilk tespit edildiği zaman
+    """
+
+    id: int
+    item_type: str
+    item_id: int
+    name: str
+    quantity: int
+    reorder_threshold: int
+    detected_at: datetime
+    model_config = ConfigDict(from_attributes=True)
+
+
+class StockValuationRow(BaseModel):
+    """
+    Stok değerleme raporunun bir grubu.
+
+    Attributes:
+        key: Grup değeri (konum veya tedarikçi; tanımsızsa None)
+        items: Gruptaki stok satırı sayısı
+        quantity: Toplam miktar
+        value: Toplam değer (sum(quantity * unit_price))
+    """
+
+    key: Optional[str] = None
+    items: int
+    quantity: int
+    value: float
+    model_config = ConfigDict(from_attributes=True)
+
+
+class BulkRowError(BaseModel):
+    """
+    Toplu yüklemede reddedilen satır.
+
+    Attributes:
+        index: İstekteki satır sırası
+        error: Reddedilme nedeni
+    """
+
+    index: int
+    error: str
+
+
+class BulkUpsertResponse(BaseModel):
+    inserted: int = 0
+    updated: int = 0
+    rejected: int = 0
+    errors: List[BulkRowError] = []
+
+
+class ImportJobRead(BulkUpsertResponse):
+    """
+    CSV içe aktarma işinin durumu.
+
+    Attributes:
+        id: İş kimliği
+        kind: İçe aktarılan kayıt türü (stocks, products)
+        status: running, completed veya failed
+        rows: Okunan veri satırı sayısı
+        error: İş başarısız olduysa nedeni
+    """
+
+    id: str
+    kind: str
+    status: str = "running"
+    rows: int = 0
+    error: Optional[str] = None
+    started_at: datetime
+    finished_at: Optional[datetime] = None
+
+
 UserRead.model_rebuild()
@@ -0,0 +1,32 @@
+"""
+Kapanmış eski siparişleri arşiv tablolarına taşır.
+Cron veya zamanlanmış görev olarak çalıştırılabilir.
+
+Kullanım:
+    python -m app.scripts.archive_orders --days 365 --chunk-size 500
+"""
+
+import argparse
+import asyncio
+
+from ..archive import archive_orders
+from ..core.settings import settings
+from ..database import get_async_session_local
+
+
+async def run(days: int, chunk_size: int) -> int:
+    async with get_async_session_local()() as db:
+        return await archive_orders(db, days, chunk_size)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--days", type=int, default=settings.ARCHIVE_AFTER_DAYS)
+    parser.add_argument("--chunk-size", type=int, default=settings.ARCHIVE_CHUNK_SIZE)
+    args = parser.parse_args()
+    total = asyncio.run(run(args.days, args.chunk_size))
+    print(f"{total} sipariş arşivlendi.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Tek bir sıcak ürün (SKU) üzerinde eşzamanlı stok rezervasyonu benchmark'ı.
+Çok sayıda worker aynı ürünü aynı anda rezerve etmeye çalışır; sonunda
+stoğun eksiye düşmediği ve OUT hareketlerinin rezervasyonlarla eşleştiği
+doğrulanır.
+
+Kullanım:
+    python -m app.scripts.benchmark_stock_reservation --workers 50 --orders 20
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+
+from sqlalchemy import func, select
+from sqlalchemy.exc import OperationalError
+
+from .. import models
+from ..database import get_async_session_local
+from ..routes.inventory import reserve_stock
+
+
+async def create_hot_product(session_factory, stock: int) -> int:
+    """Benchmark için stoklu bir ürün oluşturur ve id'sini döndürür."""
+    async with session_factory() as db:
+        product = models.Product(
+            name=f"Hot SKU {uuid.uuid4().hex[:8]}",
+            sku=str(uuid.uuid4()),
+            price=1.0,
+            stock=stock,
+        )
+        db.add(product)
+        await db.commit()
+        return product.id
+
+
+async def hammer(
+    session_factory,
+    product_id: int,
+    workers: int,
+    orders_per_worker: int,
+    quantity: int = 1,
+) -> dict:
+    """
+    Aynı ürünü workers * orders_per_worker kez rezerve etmeye çalışır.
+
+    Returns:
+        dict: reserved, rejected, errors, elapsed, per_second
+    """
+    stats = {"reserved": 0, "rejected": 0, "errors": 0}
+
+    async def worker():
+        for _ in range(orders_per_worker):
+            async with session_factory() as db:
+                try:
+                    if await reserve_stock(db, {product_id: quantity}) is None:
+                        await db.commit()
+                        stats["reserved"] += 1
+                    else:
+                        await db.rollback()
+                        stats["rejected"] += 1
+                except OperationalError:
+                    # SQLite'ta kilit zaman aşımı; PostgreSQL'de beklenmez
+                    await db.rollback()
+                    stats["errors"] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(workers)))
+    elapsed = time.perf_counter() - started
+    attempts = workers * orders_per_worker
+    stats["elapsed"] = elapsed
+    stats["per_second"] = attempts / elapsed if elapsed else 0.0
+    return stats
+
+
+async def verify(session_factory, product_id: int) -> dict:
+    """Ürünün kalan stoğunu ve OUT hareketlerinin toplamını döndürür."""
+    async with session_factory() as db:
+        stock = await db.scalar(
+            select(models.Product.stock).where(models.Product.id == product_id)
+        )
+        moved = await db.scalar(
+            select(func.coalesce(func.sum(-models.StockMovement.quantity), 0)).where(
+                models.StockMovement.product_id == product_id,
+                models.StockMovement.movement_type == "OUT",
+            )
+        )
+    return {"stock": stock, "moved": moved}
+
+
+async def run(workers: int, orders_per_worker: int, stock: int) -> None:
+    session_factory = get_async_session_local()
+    product_id = await create_hot_product(session_factory, stock)
+    stats = await hammer(session_factory, product_id, workers, orders_per_worker)
+    totals = await verify(session_factory, product_id)
+    print(
+        f"workers={workers} attempts={workers * orders_per_worker} "
+        f"reserved={stats['reserved']} rejected={stats['rejected']} "
+        f"errors={stats['errors']} elapsed={stats['elapsed']:.2f}s "
+        f"rate={stats['per_second']:.0f}/s"
+    )
+    print(f"kalan stok={totals['stock']} OUT toplamı={totals['moved']}")
+    if totals["stock"] < 0 or totals["stock"] + totals["moved"] != stock:
+        raise SystemExit("Stok tutarsız! / Stock mismatch!")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, default=50)
+    parser.add_argument("--orders", type=int, default=20, help="worker başına")
+    parser.add_argument("--stock", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(run(args.workers, args.orders, args.stock))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Stok veya ürün CSV dosyasını diskten parça parça okuyarak içe aktarır.
+Dosya belleğe tamamen yüklenmez; satırlar BULK_CHUNK_SIZE'lık partiler
+halinde doğrulanıp upsert edilir.
+
+Kullanım:
+    python -m app.scripts.import_csv stocks stocks.csv
+    python -m app.scripts.import_csv products products.csv --block-size 65536
+"""
+
+import argparse
+import asyncio
+from typing import AsyncIterator
+
+from ..database import get_async_session_local
+from ..routes.imports import IMPORT_KINDS, run_import, start_job
+
+
+async def read_blocks(path: str, block_size: int) -> AsyncIterator[bytes]:
+    """Dosyayı block_size byte'lık parçalar halinde okur."""
+    with open(path, "rb") as handle:
+        while True:
+            block = handle.read(block_size)
+            if not block:
+                break
+            yield block
+            # Uzun dosyalarda event loop'u bloklamamak için sıra ver
+            await asyncio.sleep(0)
+
+
+async def run(kind: str, path: str, block_size: int) -> None:
+    session_factory = get_async_session_local()
+    job = start_job(kind)
+    async with session_factory() as db:
+        await run_import(db, kind, read_blocks(path, block_size), job)
+    print(
+        f"durum={job.status} satır={job.rows} eklenen={job.inserted} "
+        f"güncellenen={job.updated} reddedilen={job.rejected}"
+    )
+    for error in job.errors:
+        print(f"  satır {error.index}: {error.error}")
+    if job.status != "completed":
+        raise SystemExit(f"İçe aktarma başarısız / Import failed: {job.error}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("kind", choices=sorted(IMPORT_KINDS))
+    parser.add_argument("path")
+    parser.add_argument("--block-size", type=int, default=64 * 1024)
+    args = parser.parse_args()
+    asyncio.run(run(args.kind, args.path, args.block_size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+Product.stock ile Stock.quantity toplamlarını karşılaştırıp farkları raporlar.
+Cron veya zamanlanmış görev olarak birkaç dakikada bir çalıştırılabilir;
+yalnızca son çalışmadan beri değişen ürünler ziyaret edilir.
+
+Kullanım:
+    python -m app.scripts.reconcile_stock            # yalnızca rapor
+    python -m app.scripts.reconcile_stock --fix      # ADJUST hareketiyle düzelt
+    python -m app.scripts.reconcile_stock --full     # tüm ürünler (örn. gecelik)
+"""
+
+import argparse
+import asyncio
+
+from ..core.settings import settings
+from ..database import get_async_session_local
+from ..reconciliation import ReconcileReport, reconcile_stock
+
+
+async def run(fix: bool, full: bool, chunk_size: int) -> ReconcileReport:
+    async with get_async_session_local()() as db:
+        return await reconcile_stock(db, fix=fix, full=full, chunk_size=chunk_size)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--fix", action="store_true")
+    parser.add_argument("--full", action="store_true")
+    parser.add_argument("--chunk-size", type=int, default=settings.RECONCILE_CHUNK_SIZE)
+    args = parser.parse_args()
+    report = asyncio.run(run(args.fix, args.full, args.chunk_size))
+    for drift in report.drifts:
+        print(
+            f"product_id={drift.product_id} products.stock={drift.product_stock} "
+            f"stocks.quantity={drift.stock_quantity} rezerve={drift.reserved} "
+            f"fark={drift.delta:+d}"
+        )
+    print(
+        f"{report.chunks} parça tarandı, {len(report.drifts)} farklı ürün, "
+        f"{report.corrected} düzeltildi."
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+"""
+Stok hareketlerini defterde uygulayıp ürün/konum anlık görüntülerini yazar.
+Cron veya zamanlanmış görev olarak periyodik çalıştırılmalıdır (örn. saatlik).
+
+Kullanım:
+    python -m app.scripts.snapshot_stock_ledger --chunk-size 100000
+"""
+
+import argparse
+import asyncio
+
+from ..core.settings import settings
+from ..database import get_async_session_local
+from ..ledger import take_snapshots
+
+
+async def run(chunk_size: int) -> int:
+    async with get_async_session_local()() as db:
+        return await take_snapshots(db, chunk_size)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--chunk-size", type=int, default=settings.LEDGER_CHUNK_SIZE)
+    args = parser.parse_args()
+    written = asyncio.run(run(args.chunk_size))
+    print(f"{written} stok görüntüsü yazıldı.")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,27 +4,41 @@ Tüm testlerde kullanılacak ortak fixture'lar ve helper fonksiyonlar.
 """
 
 import os
+import shutil
+import tempfile
 import uuid
 from unittest.mock import patch
 
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool, StaticPool
 
 from ..auth import get_current_user
+from ..catalog import product_catalog
+from ..core.settings import settings
+from ..entity_cache import get_entity_cache
 from ..main import app
 from ..models import Base  # Models dosyasındaki Base'i kullan
-from ..routes.common import get_db  # Doğru import
+from ..refresh_tokens import refresh_index
+from ..revocation import revocation_list
+from ..routes.common import get_async_db, get_db  # Doğru import
+from ..token_cache import token_cache
+from ..valuation import report_cache, valuation_summary
 
 # Test ortamını ayarla
 os.environ["TESTING"] = "1"
 os.environ["PYTEST_CURRENT_TEST"] = "test_session"
 os.environ["USE_MOCK"] = "true"
 
-# Test için in-memory SQLite database
-SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
+# Test veritabanı her oturumda geçici bir dizinde, modellerden oluşturulur
+TEST_DB_DIR = tempfile.mkdtemp(prefix="backend-tests-")
+TEST_DB_PATH = os.path.join(TEST_DB_DIR, "test.db")
+SQLALCHEMY_DATABASE_URL = f"sqlite:///{TEST_DB_PATH}"
+# Dependency override'ı olmayan testler de uygulamanın engine'iyle aynı dosyayı kullanır
+settings.TEST_SQLITE_URL = SQLALCHEMY_DATABASE_URL
 
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
@@ -33,6 +47,15 @@ engine = create_engine(
 )
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async route'lar için aynı SQLite dosyasına aiosqlite ile bağlan
+async_engine = create_async_engine(
+    f"sqlite+aiosqlite:///{TEST_DB_PATH}",
+    poolclass=NullPool,
+)
+TestingAsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
+
 
 def override_get_db():
     """Test için database session override."""
@@ -54,6 +77,16 @@ def override_get_db():
             print(f"Error closing database connection: {e}")
 
 
+async def override_get_async_db():
+    """Test için async database session override."""
+    async with TestingAsyncSessionLocal() as db:
+        try:
+            yield db
+        finally:
+            # Pending transaction'ları rollback
+            await db.rollback()
+
+
 def override_get_current_user():
     """Test için auth override - her zaman geçerli kullanıcı döndür."""
     return {
@@ -151,6 +184,15 @@ def test_db():
         pass
 
 
+@pytest.fixture(scope="session", autouse=True)
+def test_schema():
+    """Geçici test veritabanının şemasını kurar, oturum sonunda dizini siler."""
+    Base.metadata.create_all(bind=engine)
+    yield
+    engine.dispose()
+    shutil.rmtree(TEST_DB_DIR, ignore_errors=True)
+
+
 @pytest.fixture(autouse=True)
 def clean_database():
     """Her test sonunda database'i temizle."""
@@ -168,6 +210,14 @@ def clean_database():
                 print(f"Error cleaning table {table.name}: {e}")
         # Foreign key constraint'leri tekrar etkinleştir
         conn.execute(text("PRAGMA foreign_keys=ON"))
+    # Tablolar ORM dışında temizlendiği için süreç içi kataloğu ve cache'i sıfırla
+    product_catalog.clear()
+    get_entity_cache().clear()
+    report_cache.clear()
+    valuation_summary.reset()
+    token_cache.clear()
+    refresh_index.clear()
+    revocation_list.clear()
 
 
 @pytest.fixture
@@ -175,6 +225,7 @@ def client(test_db):
     """Test client fixture - auth bypass ile."""
     # Database dependency override
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
 
     # Auth dependency override - test ortamında bypass et
     app.dependency_overrides[get_current_user] = override_get_current_user
@@ -190,6 +241,7 @@ def client(test_db):
 def client_with_auth(test_db):
     """Auth header'ları ile test client."""
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
     # Auth dependency override - test ortamında bypass et
     app.dependency_overrides[get_current_user] = override_get_current_user
 
@@ -204,6 +256,7 @@ def client_with_auth(test_db):
 def client_without_auth(test_db):
     """Auth olmadan test client."""
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
     # Auth dependency override'ı kaldır - gerçek auth kontrolü yap
     # app.dependency_overrides[get_current_user] = override_get_current_user
 
@@ -218,6 +271,7 @@ def client_without_auth(test_db):
 def unauthenticated_client(test_db):
     """Unauthenticated test client."""
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
     # Auth dependency override'ı kaldır - gerçek auth kontrolü yap
     # app.dependency_overrides[get_current_user] = override_get_current_user
 
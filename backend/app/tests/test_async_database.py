@@ -0,0 +1,64 @@
+"""
+Async database path testleri.
+AsyncEngine/AsyncSession yapılandırması ve get_async_db dependency'si.
+"""
+
+import asyncio
+from unittest.mock import patch
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .. import database
+from ..routes.common import get_async_db
+
+
+class TestAsyncDatabaseUrl:
+    """Sync URL'den async driver URL'ine dönüşüm testleri"""
+
+    def test_sqlite_url_uses_aiosqlite(self):
+        with patch.object(
+            database, "get_database_url", return_value="sqlite:///./x.db"
+        ):
+            assert database.get_async_database_url() == "sqlite+aiosqlite:///./x.db"
+
+    def test_postgresql_url_uses_asyncpg(self):
+        with patch.object(
+            database, "get_database_url", return_value="postgresql://u:p@h:5432/db"
+        ):
+            assert (
+                database.get_async_database_url()
+                == "postgresql+asyncpg://u:p@h:5432/db"
+            )
+
+    def test_psycopg2_url_uses_asyncpg(self):
+        with patch.object(
+            database,
+            "get_database_url",
+            return_value="postgresql+psycopg2://u:p@h/db",
+        ):
+            assert database.get_async_database_url() == "postgresql+asyncpg://u:p@h/db"
+
+
+def test_get_async_db_yields_async_session():
+    """get_async_db her istek için AsyncSession sağlar"""
+
+    async def run():
+        gen = get_async_db()
+        db = await gen.__anext__()
+        try:
+            assert isinstance(db, AsyncSession)
+            result = await db.execute(text("SELECT 1"))
+            assert result.scalar() == 1
+        finally:
+            await gen.aclose()
+
+    asyncio.run(run())
+
+
+def test_list_endpoints_use_async_session(client, auth_headers):
+    """Liste endpoint'leri async session ile çalışır"""
+    for path in ("/users/", "/orders/"):
+        response = client.get(path, headers=auth_headers)
+        assert response.status_code == 200
+        assert isinstance(response.json(), list)
@@ -0,0 +1,98 @@
+"""
+Süreç içi ürün katalog indeksi testleri.
+"""
+
+import asyncio
+import uuid
+
+from sqlalchemy import text
+
+from ..catalog import CatalogEntry, ProductCatalog, product_catalog, warm_catalog
+from .conftest import TestingAsyncSessionLocal, engine
+from .test_eager_loading import count_queries
+
+
+def product_queries(statements):
+    return [s for s in statements if "FROM products" in s]
+
+
+def create_user(client, auth_headers):
+    response = client.post(
+        "/users/",
+        json={
+            "name": "Catalog User",
+            "email": f"catalog_{uuid.uuid4().hex[:8]}@example.com",
+            "password": "testpassword123",
+        },
+        headers=auth_headers,
+    )
+    return response.json()["id"]
+
+
+def test_catalog_lru_eviction():
+    catalog = ProductCatalog(max_size=2)
+    catalog.put(CatalogEntry(1, "a", 1.0, "sku-a"))
+    catalog.put(CatalogEntry(2, "b", 2.0, "sku-b"))
+    assert catalog.get_by_name("a").id == 1  # "a" artık en taze
+    catalog.put(CatalogEntry(3, "c", 3.0, "sku-c"))
+    assert len(catalog) == 2
+    assert catalog.get_by_name("b") is None
+    assert catalog.get_name(2) is None
+    assert catalog.get_name(1) == "a"
+
+
+def test_catalog_rename_and_discard():
+    catalog = ProductCatalog()
+    catalog.put(CatalogEntry(1, "old", 1.0, "sku"))
+    catalog.put(CatalogEntry(1, "new", 1.5, "sku"))
+    assert catalog.get_by_name("old") is None
+    assert catalog.get_by_name("new").price == 1.5
+    catalog.discard(1)
+    assert catalog.get_name(1) is None
+    assert len(catalog) == 0
+
+
+def test_committed_product_is_indexed(client, auth_headers):
+    """Sipariş ile eklenen ürün commit sonrası kataloğa girer"""
+    user_id = create_user(client, auth_headers)
+    name = f"Catalog Product {uuid.uuid4().hex[:8]}"
+    response = client.post(
+        "/orders/",
+        json={"user_id": user_id, "product_name": name, "amount": 9.0},
+        headers=auth_headers,
+    )
+    assert response.status_code == 201
+    entry = product_catalog.get_by_name(name)
+    assert entry is not None
+    assert entry.id == response.json()["order_items"][0]["product_id"]
+
+
+def test_known_product_skips_lookup(client, auth_headers):
+    """Bilinen ürün için products tablosu sorgulanmaz"""
+    user_id = create_user(client, auth_headers)
+    name = f"Hot Product {uuid.uuid4().hex[:8]}"
+    payload = {"user_id": user_id, "product_name": name, "amount": 3.0}
+    client.post("/orders/", json=payload, headers=auth_headers)
+    with count_queries() as statements:
+        response = client.post("/orders/", json=payload, headers=auth_headers)
+    assert response.status_code == 201
+    assert response.json()["product_name"] == name
+    assert product_queries(statements) == []
+
+
+def test_warm_catalog_loads_existing_products():
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO products (name, sku, price, stock, is_active) "
+                "VALUES ('Warm Product', 'warm-sku', 4.5, 10, 1)"
+            )
+        )
+    catalog = ProductCatalog(max_size=10)
+
+    async def warm():
+        async with TestingAsyncSessionLocal() as db:
+            return await warm_catalog(db, catalog)
+
+    assert asyncio.run(warm()) == 1
+    assert catalog.get_by_name("Warm Product").sku == "warm-sku"
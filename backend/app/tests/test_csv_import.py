@@ -0,0 +1,132 @@
+"""
+Streaming CSV içe aktarma (/imports/) testleri.
+"""
+
+import asyncio
+import csv
+import uuid
+from unittest.mock import patch
+
+import pytest
+from app.routes.imports import csv_records
+from sqlalchemy import text
+
+from .conftest import engine
+
+
+def csv_headers(auth_headers):
+    return {**auth_headers, "Content-Type": "text/csv"}
+
+
+def collect_records(chunks):
+    async def stream():
+        for chunk in chunks:
+            yield chunk
+
+    async def run():
+        return [fields async for fields in csv_records(stream())]
+
+    return asyncio.run(run())
+
+
+def test_csv_records_across_chunk_boundaries():
+    data = 'a,b\r\n1,"multi\nline, with comma"\n2,"say ""hi"""\n'.encode()
+    # Her byte ayrı parça: kayıtlar ve çok baytlı karakterler bölünmemeli
+    expected = [["a", "b"], ["1", "multi\nline, with comma"], ["2", 'say "hi"']]
+    assert collect_records([data]) == expected
+    assert collect_records([data[i : i + 1] for i in range(len(data))]) == expected
+    assert collect_records(["ü,ş".encode()[i : i + 1] for i in range(5)]) == [
+        ["ü", "ş"]
+    ]
+
+
+def test_csv_records_keep_crlf_inside_quotes():
+    data = b'a,b\r\n1,"first\r\nsecond"\r\n2,x'
+    expected = [["a", "b"], ["1", "first\r\nsecond"], ["2", "x"]]
+    assert collect_records([data]) == expected
+    assert collect_records([data[i : i + 1] for i in range(len(data))]) == expected
+
+
+def test_csv_records_unterminated_quote():
+    with pytest.raises(csv.Error):
+        collect_records([b'a,b\n1,"open\n'])
+
+
+def test_import_stocks_csv(client, auth_headers):
+    name = f"CSV Stock {uuid.uuid4().hex[:8]}"
+    body = (
+        "product_name,quantity,location\n"
+        f"{name},5,A\n"
+        f'"{name} Multi",7,"Raf\n2"\n'
+        "Bad Stock,-3,A\n"
+        "Short Row,1\n"
+        f"{name},9,\n"
+    )
+    with patch("app.routes.imports.settings.BULK_CHUNK_SIZE", 2):
+        response = client.post(
+            "/imports/stocks", content=body, headers=csv_headers(auth_headers)
+        )
+    assert response.status_code == 200
+    job = response.json()
+    assert job["status"] == "completed"
+    assert job["rows"] == 5
+    assert (job["inserted"], job["updated"], job["rejected"]) == (2, 1, 2)
+    assert sorted(error["index"] for error in job["errors"]) == [3, 4]
+
+    with engine.connect() as conn:
+        rows = dict(
+            conn.execute(
+                text(
+                    "SELECT product_name, quantity || '/' || location FROM stocks "
+                    "WHERE product_name LIKE :name"
+                ),
+                {"name": f"{name}%"},
+            ).all()
+        )
+    # Boş hücre gönderilmemiş sayılır; location korunur
+    assert rows == {name: "9/A", f"{name} Multi": "7/Raf\n2"}
+
+    listed = client.get("/imports/", headers=auth_headers).json()
+    assert listed[0]["id"] == job["id"]
+    detail = client.get(f"/imports/{job['id']}", headers=auth_headers)
+    assert detail.json()["rows"] == 5
+
+
+def test_import_products_csv(client, auth_headers):
+    sku = uuid.uuid4().hex[:8]
+    body = (
+        "﻿name,sku,price,stock,is_active\n"
+        f"CSV Product {sku},{sku},12.5,4,false\n"
+        f"CSV Product {sku}-2,{sku}-2,abc,1,true\n"
+    )
+    response = client.post(
+        "/imports/products",
+        content=body.encode(),
+        headers=csv_headers(auth_headers),
+    )
+    job = response.json()
+    assert job["status"] == "completed"
+    assert (job["inserted"], job["rejected"]) == (1, 1)
+    with engine.connect() as conn:
+        price, stock, active = conn.execute(
+            text("SELECT price, stock, is_active FROM products WHERE sku = :sku"),
+            {"sku": sku},
+        ).one()
+    assert (price, stock, active) == (12.5, 4, 0)
+
+
+def test_import_failed_job_and_unknown_kind(client, auth_headers):
+    response = client.post(
+        "/imports/stocks",
+        content='product_name,quantity\n"open,1\n',
+        headers=csv_headers(auth_headers),
+    )
+    job = response.json()
+    assert job["status"] == "failed"
+    assert job["error"]
+
+    response = client.post(
+        "/imports/users", content="a\n1\n", headers=csv_headers(auth_headers)
+    )
+    assert response.status_code == 404
+    assert client.get("/imports/missing", headers=auth_headers).status_code == 404
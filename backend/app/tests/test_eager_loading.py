@@ -0,0 +1,99 @@
+"""
+?include= parametresi ve sabit sorgu sayısı testleri.
+"""
+
+import uuid
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from .conftest import async_engine
+
+
+@contextmanager
+def count_queries():
+    """Async test engine üzerinde çalışan SELECT sorgularını sayar."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    event.listen(
+        async_engine.sync_engine, "before_cursor_execute", before_cursor_execute
+    )
+    try:
+        yield statements
+    finally:
+        event.remove(
+            async_engine.sync_engine, "before_cursor_execute", before_cursor_execute
+        )
+
+
+def create_user_with_order(client, auth_headers):
+    response = client.post(
+        "/users/",
+        json={
+            "name": "Eager User",
+            "email": f"eager_{uuid.uuid4().hex[:8]}@example.com",
+            "password": "testpassword123",
+        },
+        headers=auth_headers,
+    )
+    assert response.status_code == 201
+    user_id = response.json()["id"]
+    response = client.post(
+        "/orders/",
+        json={
+            "user_id": user_id,
+            "product_name": f"Eager Product {uuid.uuid4().hex[:8]}",
+            "amount": 10.0,
+        },
+        headers=auth_headers,
+    )
+    assert response.status_code == 201
+    return user_id
+
+
+def test_user_list_is_shallow_by_default(client, auth_headers):
+    """Varsayılan kullanıcı listesi siparişleri yüklemez"""
+    create_user_with_order(client, auth_headers)
+    response = client.get("/users/", headers=auth_headers)
+    assert response.status_code == 200
+    assert all(user["orders"] == [] for user in response.json())
+
+
+def test_user_list_include_deep_nesting(client, auth_headers):
+    """include ile sipariş kalemleri ve ürünler döner"""
+    user_id = create_user_with_order(client, auth_headers)
+    response = client.get(
+        "/users/", params={"include": "orders.items.product"}, headers=auth_headers
+    )
+    assert response.status_code == 200
+    user = next(u for u in response.json() if u["id"] == user_id)
+    assert user["orders"][0]["order_items"][0]["product"]["name"]
+
+
+def test_invalid_include_returns_400(client, auth_headers):
+    response = client.get("/orders/", params={"include": "user"}, headers=auth_headers)
+    assert response.status_code == 400
+
+
+def test_query_count_is_constant(client, auth_headers):
+    """Sorgu sayısı dönen satır sayısından bağımsız olmalı"""
+    params = {"include": "addresses,orders.items.product,orders.shipping_address"}
+    create_user_with_order(client, auth_headers)
+    with count_queries() as first:
+        assert (
+            client.get("/users/", params=params, headers=auth_headers).status_code
+            == 200
+        )
+
+    for _ in range(3):
+        create_user_with_order(client, auth_headers)
+    with count_queries() as second:
+        response = client.get("/users/", params=params, headers=auth_headers)
+        assert response.status_code == 200
+
+    assert len(response.json()) >= 4
+    assert len(first) == len(second)
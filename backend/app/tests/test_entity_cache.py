@@ -0,0 +1,179 @@
+"""
+Tek kayıt GET'leri için entity cache testleri.
+"""
+
+from app.entity_cache import LRUEntityCache, get_entity_cache
+from app.interfaces import CachedPayload
+
+from .test_list_filters import create_order, create_stock, create_user
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_lru_ttl_size_and_variants():
+    clock = FakeClock()
+    cache = LRUEntityCache(max_size=2, ttl=10, clock=clock)
+    cache.set("user", 1, CachedPayload(b"a"), "addresses")
+    cache.set("user", 1, CachedPayload(b"b"), "orders")
+    assert cache.get("user", 1, "addresses").body == b"a"
+
+    # En az kullanılan ("orders") düşer
+    cache.set("stock", 1, CachedPayload(b"c"))
+    assert cache.get("user", 1, "orders") is None
+    assert cache.get("stock", 1).body == b"c"
+
+    cache.invalidate("user", 1)
+    assert cache.get("user", 1, "addresses") is None
+
+    clock.now = 11
+    assert cache.get("stock", 1) is None
+    assert cache.stats() == {
+        "hits": 2,
+        "misses": 3,
+        "evictions": 1,
+        "expirations": 1,
+        "invalidations": 1,
+        "stale_sets": 0,
+        "size": 0,
+        "max_size": 2,
+    }
+
+
+def test_dependents_and_stale_sets():
+    cache = LRUEntityCache()
+    products = (("product", 7),)
+    cache.set("order", 1, CachedPayload(b"o", depends=products), "items.product")
+    cache.set("user", 2, CachedPayload(b"u", depends=products))
+    cache.set("order", 3, CachedPayload(b"x"))
+    cache.invalidate("product", 7)
+    assert cache.get("order", 1, "items.product") is None
+    assert cache.get("user", 2) is None
+    assert cache.get("order", 3).body == b"x"
+
+    # Üretim sırasında commit edilen yazım: sonuç saklanmaz
+    generation = cache.generation()
+    cache.invalidate("order", 4)
+    cache.set("order", 4, CachedPayload(b"stale"), generation=generation)
+    assert cache.get("order", 4) is None
+    cache.set("order", 4, CachedPayload(b"fresh"), generation=cache.generation())
+    assert cache.get("order", 4).body == b"fresh"
+    assert cache.stats()["stale_sets"] == 1
+
+
+def test_stock_get_is_cached_and_invalidated_on_writes(client, auth_headers):
+    stock_id = create_stock(client, auth_headers, 5, "A")
+    other_id = create_stock(client, auth_headers, 5, "B")
+    url = f"/stocks/{stock_id}"
+
+    first = client.get(url, headers=auth_headers)
+    assert first.headers["X-Cache"] == "MISS"
+    second = client.get(url, headers=auth_headers)
+    assert second.headers["X-Cache"] == "HIT"
+    assert second.json() == first.json()
+    assert second.headers["ETag"] == '"1"'
+
+    client.put(url, json={"quantity": 9}, headers=auth_headers)
+    response = client.get(url, headers=auth_headers)
+    assert response.headers["X-Cache"] == "MISS"
+    assert response.json()["quantity"] == 9
+
+    # Core yazımları (toplu upsert, transfer) da ilgili kaydı düşürür
+    client.get(f"/stocks/{other_id}", headers=auth_headers)
+    name = response.json()["product_name"]
+    client.post(
+        "/stocks/bulk",
+        json=[{"product_name": name, "location": "C"}],
+        headers=auth_headers,
+    )
+    response = client.get(url, headers=auth_headers)
+    assert (response.headers["X-Cache"], response.json()["location"]) == ("MISS", "C")
+    assert (
+        client.get(f"/stocks/{other_id}", headers=auth_headers).headers["X-Cache"]
+        == "HIT"
+    )
+
+    client.delete(url, headers=auth_headers)
+    assert client.get(url, headers=auth_headers).status_code == 404
+
+
+def test_user_and_order_invalidation(client, auth_headers):
+    user_id = create_user(client, auth_headers)
+    user_url = f"/users/{user_id}"
+    assert client.get(user_url, headers=auth_headers).json()["orders"] == []
+    assert client.get(user_url, headers=auth_headers).headers["X-Cache"] == "HIT"
+
+    # Yeni sipariş kullanıcı detayını geçersiz kılar
+    order_id = create_order(client, auth_headers, user_id)
+    response = client.get(user_url, headers=auth_headers)
+    assert response.headers["X-Cache"] == "MISS"
+    assert [order["id"] for order in response.json()["orders"]] == [order_id]
+
+    order_url = f"/orders/{order_id}"
+    client.get(order_url, headers=auth_headers)
+    client.get(f"{order_url}?include=items", headers=auth_headers)
+    assert client.get(order_url, headers=auth_headers).headers["X-Cache"] == "HIT"
+    client.put(
+        order_url,
+        json={"product_name": "Cache Product", "amount": 20.0},
+        headers=auth_headers,
+    )
+    for url in (order_url, f"{order_url}?include=items"):
+        response = client.get(url, headers=auth_headers)
+        assert response.headers["X-Cache"] == "MISS"
+        assert response.json()["total_amount"] == 20.0
+
+    client.put(user_url, json={"name": "Renamed"}, headers=auth_headers)
+    assert client.get(user_url, headers=auth_headers).json()["name"] == "Renamed"
+
+
+def test_product_writes_invalidate_embedding_orders_and_users(client, auth_headers):
+    user_id = create_user(client, auth_headers)
+    order_id = create_order(client, auth_headers, user_id)
+    order_url = f"/orders/{order_id}"
+    user_url = f"/users/{user_id}?include=orders.items.product"
+    items = client.get(order_url, headers=auth_headers).json()["order_items"]
+    product = items[0]["product"]
+    client.get(user_url, headers=auth_headers)
+    assert client.get(order_url, headers=auth_headers).headers["X-Cache"] == "HIT"
+
+    # Başka bir siparişin rezervasyonu (Core UPDATE) gömülü ürünü değiştirir
+    response = client.post(
+        "/orders/",
+        json={
+            "user_id": create_user(client, auth_headers),
+            "total_amount": 2.0,
+            "order_items": [
+                {
+                    "product_id": product["id"],
+                    "quantity": 2,
+                    "unit_price": 1.0,
+                    "total_price": 2.0,
+                }
+            ],
+        },
+        headers=auth_headers,
+    )
+    assert response.status_code == 201
+    response = client.get(order_url, headers=auth_headers)
+    assert response.headers["X-Cache"] == "MISS"
+    embedded = response.json()["order_items"][0]["product"]
+    assert embedded["stock"] == product["stock"] - 2
+    response = client.get(user_url, headers=auth_headers)
+    assert response.headers["X-Cache"] == "MISS"
+    items = response.json()["orders"][0]["order_items"]
+    assert items[0]["product"]["stock"] == product["stock"] - 2
+
+
+def test_cache_metrics_endpoint(client, auth_headers):
+    stock_id = create_stock(client, auth_headers, 5, "A")
+    client.get(f"/stocks/{stock_id}", headers=auth_headers)
+    client.get(f"/stocks/{stock_id}", headers=auth_headers)
+    stats = client.get("/metrics/cache").json()["entity"]
+    assert stats == get_entity_cache().stats()
+    assert stats["hits"] >= 1 and stats["size"] >= 1
@@ -0,0 +1,133 @@
+"""
+Liste endpoint'leri filtre/sıralama parametreleri testleri.
+"""
+
+import uuid
+
+from sqlalchemy import text
+
+from .conftest import engine
+
+
+def create_stock(client, auth_headers, quantity, location, supplier="ACME"):
+    response = client.post(
+        "/stocks/",
+        json={
+            "product_name": f"Filter Stock {uuid.uuid4().hex[:8]}",
+            "quantity": quantity,
+            "unit_price": 1.0,
+            "location": location,
+            "supplier": supplier,
+        },
+        headers=auth_headers,
+    )
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def create_user(client, auth_headers):
+    response = client.post(
+        "/users/",
+        json={
+            "name": "Filter User",
+            "email": f"filter_{uuid.uuid4().hex[:8]}@example.com",
+            "password": "testpassword123",
+        },
+        headers=auth_headers,
+    )
+    return response.json()["id"]
+
+
+def create_order(client, auth_headers, user_id):
+    response = client.post(
+        "/orders/",
+        json={
+            "user_id": user_id,
+            "product_name": f"Filter Product {uuid.uuid4().hex[:8]}",
+            "amount": 10.0,
+        },
+        headers=auth_headers,
+    )
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def collect(client, auth_headers, url, params):
+    """Tüm sayfaları cursor ile gezerek satırları toplar."""
+    rows, cursor = [], None
+    while True:
+        page_params = dict(params, limit=2)
+        if cursor:
+            page_params["cursor"] = cursor
+        response = client.get(url, params=page_params, headers=auth_headers)
+        assert response.status_code == 200
+        rows.extend(response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            return rows
+
+
+def test_orders_filter_by_user_status_and_date(client, auth_headers):
+    user_id = create_user(client, auth_headers)
+    other_id = create_user(client, auth_headers)
+    mine = [create_order(client, auth_headers, user_id) for _ in range(3)]
+    create_order(client, auth_headers, other_id)
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "UPDATE orders SET status = 'shipped', "
+                "created_at = '2020-01-01 00:00:00' WHERE id = :id"
+            ),
+            {"id": mine[0]},
+        )
+
+    rows = collect(
+        client,
+        auth_headers,
+        "/orders/",
+        {"user_id": user_id, "status": "pending", "created_at[gte]": "2021-01-01"},
+    )
+    assert sorted(row["id"] for row in rows) == mine[1:]
+
+    rows = collect(
+        client, auth_headers, "/orders/", {"status[in]": "shipped,cancelled"}
+    )
+    assert [row["id"] for row in rows] == [mine[0]]
+
+
+def test_stocks_sort_desc_with_cursor(client, auth_headers):
+    """Sıralı listede cursor sayfaları atlamadan/tekrarlamadan gezer"""
+    quantities = [5, 20, 5, 1, 12]
+    for quantity in quantities:
+        create_stock(client, auth_headers, quantity, "Depo A")
+    create_stock(client, auth_headers, 99, "Depo B")
+
+    rows = collect(
+        client, auth_headers, "/stocks/", {"location": "Depo A", "sort": "-quantity"}
+    )
+    assert [row["quantity"] for row in rows] == sorted(quantities, reverse=True)
+    assert len({row["id"] for row in rows}) == len(quantities)
+
+
+def test_unknown_filter_or_sort_returns_400(client, auth_headers):
+    for params in (
+        {"password_hash[eq]": "x"},
+        {"quantity[in]": "1"},
+        {"sort": "password_hash"},
+        {"quantity[gte]": "many"},
+    ):
+        response = client.get("/stocks/", params=params, headers=auth_headers)
+        assert response.status_code == 400, params
+
+
+def test_cursor_from_other_sort_is_rejected(client, auth_headers):
+    for quantity in (1, 2, 3):
+        create_stock(client, auth_headers, quantity, "Depo C")
+    response = client.get(
+        "/stocks/", params={"limit": 1, "sort": "quantity"}, headers=auth_headers
+    )
+    cursor = response.headers["X-Next-Cursor"]
+    response = client.get(
+        "/stocks/", params={"limit": 1, "cursor": cursor}, headers=auth_headers
+    )
+    assert response.status_code == 400
@@ -0,0 +1,83 @@
+"""
+Veritabanı tabanlı giriş (e-posta eşleşmesi, şifre doğrulama, hash maliyeti yükseltme) testleri.
+"""
+
+import jwt
+from sqlalchemy import text
+
+from ..core.settings import settings
+from .conftest import engine
+
+LOGIN_URL = "/users/login/"
+
+
+def create_user(client, auth_headers, email, password="testpassword123"):
+    response = client.post(
+        "/users/",
+        json={"name": "Login User", "email": email, "password": password},
+        headers=auth_headers,
+    )
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def stored_hash(user_id):
+    with engine.connect() as conn:
+        return conn.execute(
+            text("SELECT password_hash FROM users WHERE id = :id"), {"id": user_id}
+        ).scalar()
+
+
+def login(client, username, password="testpassword123"):
+    return client.post(LOGIN_URL, json={"username": username, "password": password})
+
+
+def test_login_matches_email_case_insensitively(client, auth_headers, monkeypatch):
+    monkeypatch.setattr(settings, "BCRYPT_ROUNDS", 4)
+    user_id = create_user(client, auth_headers, "Login.Case@Example.com")
+
+    response = login(client, " login.case@example.COM ")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["user"]["id"] == user_id
+    payload = jwt.decode(
+        body["access_token"],
+        settings.JWT_SECRET_KEY,
+        algorithms=[settings.JWT_ALGORITHM],
+    )
+    assert payload["sub"] == str(user_id)
+
+    assert login(client, "login.case@example.com", "wrong").status_code == 401
+    assert login(client, "missing@example.com").status_code == 401
+
+    response = client.post(
+        "/users/",
+        json={
+            "name": "Dup",
+            "email": "LOGIN.CASE@example.com",
+            "password": "testpassword123",
+        },
+        headers=auth_headers,
+    )
+    assert response.status_code == 400
+
+
+def test_login_rejects_inactive_user(client, auth_headers, monkeypatch):
+    monkeypatch.setattr(settings, "BCRYPT_ROUNDS", 4)
+    user_id = create_user(client, auth_headers, "inactive@example.com")
+    client.put(f"/users/{user_id}", json={"is_active": False}, headers=auth_headers)
+    assert login(client, "inactive@example.com").status_code == 401
+
+
+def test_login_rehashes_when_cost_changes(client, auth_headers, monkeypatch):
+    monkeypatch.setattr(settings, "BCRYPT_ROUNDS", 4)
+    user_id = create_user(client, auth_headers, "rehash@example.com")
+    assert stored_hash(user_id).startswith("$2b$04$")
+
+    assert login(client, "rehash@example.com").status_code == 200
+    assert stored_hash(user_id).startswith("$2b$04$")
+
+    monkeypatch.setattr(settings, "BCRYPT_ROUNDS", 5)
+    assert login(client, "rehash@example.com").status_code == 200
+    assert stored_hash(user_id).startswith("$2b$05$")
+    assert login(client, "rehash@example.com").status_code == 200
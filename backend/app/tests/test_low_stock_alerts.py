@@ -0,0 +1,122 @@
+"""
+Düşük stok uyarı tarayıcısı ve GET /stocks/alerts testleri.
+"""
+
+import asyncio
+import uuid
+
+from sqlalchemy import text
+
+from ..alerts import LowStockScanner
+from .conftest import TestingAsyncSessionLocal, engine
+
+
+def create_stock(client, auth_headers, quantity, threshold):
+    response = client.post(
+        "/stocks/",
+        json={
+            "product_name": f"Alert {uuid.uuid4().hex[:8]}",
+            "quantity": quantity,
+            "reorder_threshold": threshold,
+        },
+        headers=auth_headers,
+    )
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def scan(scanner):
+    async def run():
+        async with TestingAsyncSessionLocal() as db:
+            return await scanner.scan(db)
+
+    return asyncio.run(run())
+
+
+def alerts(client, auth_headers, **params):
+    response = client.get("/stocks/alerts", params=params, headers=auth_headers)
+    assert response.status_code == 200
+    return response
+
+
+def test_scanner_raises_and_clears_alerts(client, auth_headers):
+    low = create_stock(client, auth_headers, 2, 5)
+    ok = create_stock(client, auth_headers, 10, 5)
+    create_stock(client, auth_headers, 0, None)
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO products (name, sku, price, stock, reorder_threshold) "
+                "VALUES ('Alert product', 'ALERT-1', 1.0, 1, 3)"
+            )
+        )
+
+    scanner = LowStockScanner(chunk_size=1)
+    assert scan(scanner) == 2
+    body = alerts(client, auth_headers).json()
+    assert {(a["item_type"], a["quantity"], a["reorder_threshold"]) for a in body} == {
+        ("stock", 2, 5),
+        ("product", 1, 3),
+    }
+    stock_alert = alerts(client, auth_headers, item_type="stock").json()
+    assert [a["item_id"] for a in stock_alert] == [low]
+
+    # Eşiğin altına düşen satır açılır, üstüne çıkan kapanır
+    client.put(f"/stocks/{ok}", json={"quantity": 1}, headers=auth_headers)
+    client.put(f"/stocks/{low}", json={"quantity": 50}, headers=auth_headers)
+    assert scan(scanner) == 1
+    stock_alert = alerts(client, auth_headers, item_type="stock").json()
+    assert [(a["item_id"], a["quantity"]) for a in stock_alert] == [(ok, 1)]
+    assert scanner.stats()["cleared"] == 1
+
+    # Tekrar tarama uyarıları çoğaltmaz
+    assert scan(scanner) == 0
+    assert len(alerts(client, auth_headers).json()) == 2
+
+
+def test_scanner_only_checks_touched_rows(client, auth_headers):
+    stock_id = create_stock(client, auth_headers, 10, 5)
+    scanner = LowStockScanner()
+    scan(scanner)
+
+    # updated_at'i eski kalan satır sonraki turda okunmaz
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "UPDATE stocks SET quantity = 1, updated_at = '2000-01-01 00:00:00' "
+                "WHERE id = :id"
+            ),
+            {"id": stock_id},
+        )
+    scan(scanner)
+    assert alerts(client, auth_headers).json() == []
+
+    # Toplu upsert de updated_at'i günceller
+    name = client.get(f"/stocks/{stock_id}", headers=auth_headers).json()[
+        "product_name"
+    ]
+    client.post(
+        "/stocks/bulk",
+        json=[{"product_name": name, "quantity": 2}],
+        headers=auth_headers,
+    )
+    scan(scanner)
+    assert [a["item_id"] for a in alerts(client, auth_headers).json()] == [stock_id]
+
+
+def test_alerts_are_paged(client, auth_headers):
+    for _ in range(3):
+        create_stock(client, auth_headers, 0, 1)
+    scan(LowStockScanner())
+
+    first = alerts(client, auth_headers, limit=2)
+    assert len(first.json()) == 2
+    second = alerts(
+        client, auth_headers, limit=2, cursor=first.headers["X-Next-Cursor"]
+    )
+    assert len(second.json()) == 1
+    assert "X-Next-Cursor" not in second.headers
+    response = client.get(
+        "/stocks/alerts", params={"item_type": "other"}, headers=auth_headers
+    )
+    assert response.status_code in (400, 422)
@@ -0,0 +1,124 @@
+"""
+İyimser eşzamanlılık (version / If-Match / 412) testleri.
+"""
+
+import asyncio
+import uuid
+
+import pytest
+from app import models
+from app.routes.common import commit_versioned
+from fastapi import HTTPException
+from sqlalchemy import text
+
+from .conftest import TestingAsyncSessionLocal, engine
+from .test_list_filters import create_order, create_stock, create_user
+
+
+def test_stock_update_with_if_match(client, auth_headers):
+    stock_id = create_stock(client, auth_headers, 5, "A")
+    response = client.get(f"/stocks/{stock_id}", headers=auth_headers)
+    assert response.headers["ETag"] == '"1"'
+    assert response.json()["version"] == 1
+
+    response = client.put(
+        f"/stocks/{stock_id}",
+        json={"quantity": 6},
+        headers={**auth_headers, "If-Match": '"1"'},
+    )
+    assert response.status_code == 200
+    assert response.headers["ETag"] == '"2"'
+
+    # Eski sürümle gelen güncelleme değişikliği ezemez
+    response = client.put(
+        f"/stocks/{stock_id}",
+        json={"quantity": 99},
+        headers={**auth_headers, "If-Match": 'W/"1"'},
+    )
+    assert response.status_code == 412
+    assert (
+        client.get(f"/stocks/{stock_id}", headers=auth_headers).json()["quantity"] == 6
+    )
+
+    # If-Match olmadan güncelleme yine sürümü artırır
+    response = client.put(
+        f"/stocks/{stock_id}", json={"location": "B"}, headers=auth_headers
+    )
+    assert response.headers["ETag"] == '"3"'
+
+    response = client.put(
+        f"/stocks/{stock_id}",
+        json={"quantity": 1},
+        headers={**auth_headers, "If-Match": "abc"},
+    )
+    assert response.status_code == 400
+
+
+def test_bulk_writes_bump_version(client, auth_headers):
+    stock_id = create_stock(client, auth_headers, 5, "A")
+    name = client.get(f"/stocks/{stock_id}", headers=auth_headers).json()[
+        "product_name"
+    ]
+    client.post(
+        "/stocks/bulk",
+        json=[{"product_name": name, "quantity": 8}],
+        headers=auth_headers,
+    )
+    client.post(
+        "/stocks/bulk",
+        json=[{"product_name": name, "location": "C"}],
+        headers=auth_headers,
+    )
+    response = client.put(
+        f"/stocks/{stock_id}",
+        json={"quantity": 1},
+        headers={**auth_headers, "If-Match": '"1"'},
+    )
+    assert response.status_code == 412
+    assert (
+        client.get(f"/stocks/{stock_id}", headers=auth_headers).headers["ETag"] == '"3"'
+    )
+
+
+def test_order_update_with_if_match(client, auth_headers):
+    user_id = create_user(client, auth_headers)
+    order_id = create_order(client, auth_headers, user_id)
+    response = client.get(f"/orders/{order_id}", headers=auth_headers)
+    assert response.headers["ETag"] == '"1"'
+
+    payload = {"product_name": f"OCC {uuid.uuid4().hex[:8]}", "amount": 10.0}
+    response = client.put(
+        f"/orders/{order_id}", json=payload, headers={**auth_headers, "If-Match": '"1"'}
+    )
+    assert response.status_code == 200
+    assert response.json()["version"] == 2
+
+    response = client.put(
+        f"/orders/{order_id}", json=payload, headers={**auth_headers, "If-Match": '"1"'}
+    )
+    assert response.status_code == 412
+
+
+def test_concurrent_write_between_read_and_commit_is_412(client, auth_headers):
+    stock_id = create_stock(client, auth_headers, 5, "A")
+
+    async def run():
+        async with TestingAsyncSessionLocal() as db:
+            stock = await db.get(models.Stock, stock_id)
+            # Okuma ile commit arasında başka bir yazar sürümü artırır
+            with engine.begin() as conn:
+                conn.execute(
+                    text("UPDATE stocks SET version = version + 1 WHERE id = :id"),
+                    {"id": stock_id},
+                )
+            stock.quantity = 50
+            await commit_versioned(db, stock, "quantity")
+
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(run())
+    assert exc.value.status_code == 412
+    with engine.connect() as conn:
+        quantity = conn.execute(
+            text("SELECT quantity FROM stocks WHERE id = :id"), {"id": stock_id}
+        ).scalar()
+    assert quantity == 5
@@ -0,0 +1,97 @@
+"""
+Sipariş arşivleme testleri.
+"""
+
+import asyncio
+import datetime
+
+from sqlalchemy import text
+
+from ..archive import archive_orders
+from ..models import OrderArchive
+from .conftest import TestingAsyncSessionLocal, engine
+from .test_list_filters import create_order, create_user
+
+
+def age_order(order_id, status, days):
+    created_at = datetime.datetime.utcnow() - datetime.timedelta(days=days)
+    with engine.begin() as conn:
+        conn.execute(
+            text("UPDATE orders SET status = :status, created_at = :c WHERE id = :id"),
+            {"status": status, "c": created_at, "id": order_id},
+        )
+
+
+def run_archive(**kwargs):
+    async def run():
+        async with TestingAsyncSessionLocal() as db:
+            return await archive_orders(db, **kwargs)
+
+    return asyncio.run(run())
+
+
+def count(table):
+    with engine.connect() as conn:
+        return conn.execute(text(f"SELECT COUNT(*) FROM {table}")).scalar()
+
+
+def test_archive_moves_only_old_closed_orders(client, auth_headers):
+    user_id = create_user(client, auth_headers)
+    old_delivered, old_cancelled, old_pending, recent = (
+        create_order(client, auth_headers, user_id) for _ in range(4)
+    )
+    age_order(old_delivered, "delivered", 400)
+    age_order(old_cancelled, "cancelled", 500)
+    age_order(old_pending, "pending", 400)
+    age_order(recent, "delivered", 10)
+
+    assert run_archive(older_than_days=365, chunk_size=1) == 2
+    with engine.connect() as conn:
+        archived = conn.execute(
+            text("SELECT id FROM orders_archive ORDER BY id")
+        ).scalars()
+        assert list(archived) == [old_delivered, old_cancelled]
+        hot = conn.execute(text("SELECT id FROM orders ORDER BY id")).scalars()
+        assert list(hot) == [old_pending, recent]
+    assert count("order_items_archive") == 2
+    assert count("order_items") == 2
+
+
+def test_get_order_falls_back_to_archive(client, auth_headers):
+    user_id = create_user(client, auth_headers)
+    order_id = create_order(client, auth_headers, user_id)
+    age_order(order_id, "delivered", 400)
+    run_archive(older_than_days=365)
+
+    response = client.get(f"/orders/{order_id}", headers=auth_headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["id"] == order_id
+    assert data["status"] == "delivered"
+    assert len(data["order_items"]) == 1
+    assert data["order_items"][0]["product"]["name"]
+
+    # Arşivlenmiş sipariş liste ve güncellemede görünmez
+    response = client.put(
+        f"/orders/{order_id}",
+        json={"product_name": "x", "amount": 1.0},
+        headers=auth_headers,
+    )
+    assert response.status_code == 404
+
+
+def test_deleting_user_keeps_archived_orders(client, auth_headers):
+    user_id = create_user(client, auth_headers)
+    order_id = create_order(client, auth_headers, user_id)
+    age_order(order_id, "delivered", 400)
+    run_archive(older_than_days=365)
+
+    # Arşiv users/addresses tablolarına FK ile bağlı değil; silme engellenmez
+    referenced = {fk.column.table.name for fk in OrderArchive.__table__.foreign_keys}
+    assert referenced.isdisjoint({"users", "addresses"})
+    response = client.delete(f"/users/{user_id}", headers=auth_headers)
+    assert response.status_code == 204
+    assert count("orders_archive") == 1
+    response = client.get(f"/orders/{order_id}", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["user_id"] == user_id
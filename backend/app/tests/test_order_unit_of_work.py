@@ -0,0 +1,94 @@
+"""
+create_order / update_order tek transaction (unit of work) testleri.
+"""
+
+import uuid
+from unittest.mock import patch
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .conftest import engine
+
+
+def product_count(name):
+    with engine.connect() as conn:
+        return conn.execute(
+            text("SELECT COUNT(*) FROM products WHERE name = :name"), {"name": name}
+        ).scalar()
+
+
+def create_user(client, auth_headers):
+    response = client.post(
+        "/users/",
+        json={
+            "name": "UoW User",
+            "email": f"uow_{uuid.uuid4().hex[:8]}@example.com",
+            "password": "testpassword123",
+        },
+        headers=auth_headers,
+    )
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def test_create_order_commits_once(client, auth_headers):
+    """Ürün, başlık ve kalemler tek commit ile yazılmalı"""
+    user_id = create_user(client, auth_headers)
+    name = f"UoW Product {uuid.uuid4().hex[:8]}"
+    original_commit = AsyncSession.commit
+    calls = []
+
+    async def counting_commit(self):
+        calls.append(self)
+        await original_commit(self)
+
+    with patch.object(AsyncSession, "commit", counting_commit):
+        response = client.post(
+            "/orders/",
+            json={"user_id": user_id, "product_name": name, "amount": 25.0},
+            headers=auth_headers,
+        )
+    assert response.status_code == 201
+    assert len(calls) == 1
+    data = response.json()
+    assert data["product_name"] == name
+    assert data["order_items"][0]["product_id"]
+
+
+def test_create_order_unknown_user_leaves_no_partial_rows(client, auth_headers):
+    """Kullanıcı bulunamazsa otomatik ürün de kalıcı olmamalı"""
+    name = f"Orphan Product {uuid.uuid4().hex[:8]}"
+    response = client.post(
+        "/orders/",
+        json={"user_id": 999999, "product_name": name, "amount": 5.0},
+        headers=auth_headers,
+    )
+    assert response.status_code == 404
+    assert product_count(name) == 0
+
+
+def test_update_order_replaces_items(client, auth_headers):
+    """Güncelleme eski kalemleri tek transaction'da değiştirmeli"""
+    user_id = create_user(client, auth_headers)
+    response = client.post(
+        "/orders/",
+        json={"user_id": user_id, "product_name": "UoW First", "amount": 10.0},
+        headers=auth_headers,
+    )
+    order_id = response.json()["id"]
+    response = client.put(
+        f"/orders/{order_id}",
+        json={"product_name": "UoW Second", "amount": 12.0},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["product_name"] == "UoW Second"
+    assert len(data["order_items"]) == 1
+    with engine.connect() as conn:
+        count = conn.execute(
+            text("SELECT COUNT(*) FROM order_items WHERE order_id = :id"),
+            {"id": order_id},
+        ).scalar()
+    assert count == 1
@@ -0,0 +1,97 @@
+"""
+POST /orders/bulk testleri.
+"""
+
+import uuid
+from unittest.mock import patch
+
+from sqlalchemy import text
+
+from .conftest import engine
+
+
+def setup_user_and_product(client, auth_headers):
+    response = client.post(
+        "/users/",
+        json={
+            "name": "Bulk User",
+            "email": f"bulk_{uuid.uuid4().hex[:8]}@example.com",
+            "password": "testpassword123",
+        },
+        headers=auth_headers,
+    )
+    user_id = response.json()["id"]
+    response = client.post(
+        "/orders/",
+        json={
+            "user_id": user_id,
+            "product_name": f"Bulk Product {uuid.uuid4().hex[:8]}",
+            "amount": 10.0,
+        },
+        headers=auth_headers,
+    )
+    product_id = response.json()["order_items"][0]["product_id"]
+    return user_id, product_id
+
+
+def order_payload(user_id, product_id, quantity=1):
+    return {
+        "user_id": user_id,
+        "total_amount": 10.0 * quantity,
+        "order_items": [
+            {
+                "product_id": product_id,
+                "quantity": quantity,
+                "unit_price": 10.0,
+                "total_price": 10.0 * quantity,
+            }
+        ],
+    }
+
+
+def test_bulk_create_orders_per_row_results(client, auth_headers):
+    """Geçerli satırlar oluşturulur, geçersizler nedenleriyle reddedilir"""
+    user_id, product_id = setup_user_and_product(client, auth_headers)
+    payload = [
+        order_payload(user_id, product_id, 1),
+        {"user_id": user_id},  # order_items / total_amount eksik
+        order_payload(999999, product_id),
+        order_payload(user_id, 999999),
+        order_payload(user_id, product_id, 3),
+    ]
+    response = client.post("/orders/bulk", json=payload, headers=auth_headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["created"] == 2
+    assert data["rejected"] == 3
+    statuses = [row["status"] for row in data["results"]]
+    assert statuses == ["created", "rejected", "rejected", "rejected", "created"]
+    assert [row["index"] for row in data["results"]] == list(range(5))
+    assert "User not found" in data["results"][2]["error"]
+    assert "Product not found" in data["results"][3]["error"]
+
+    created_id = data["results"][4]["order_id"]
+    with engine.connect() as conn:
+        quantity = conn.execute(
+            text("SELECT quantity FROM order_items WHERE order_id = :id"),
+            {"id": created_id},
+        ).scalar()
+    assert quantity == 3
+
+
+def test_bulk_create_orders_chunks(client, auth_headers):
+    """Satırlar BULK_CHUNK_SIZE'lık transaction'lara bölünür"""
+    user_id, product_id = setup_user_and_product(client, auth_headers)
+    payload = [order_payload(user_id, product_id) for _ in range(7)]
+    with patch("app.routes.orders.settings.BULK_CHUNK_SIZE", 3):
+        response = client.post("/orders/bulk", json=payload, headers=auth_headers)
+    assert response.status_code == 200
+    order_ids = [row["order_id"] for row in response.json()["results"]]
+    assert len(set(order_ids)) == 7
+    assert order_ids == sorted(order_ids)
+
+
+def test_bulk_create_orders_rejects_oversized_batch(client, auth_headers):
+    with patch("app.routes.orders.settings.BULK_MAX_ROWS", 1):
+        response = client.post("/orders/bulk", json=[{}, {}], headers=auth_headers)
+    assert response.status_code == 413
@@ -0,0 +1,65 @@
+"""
+Keyset (cursor) sayfalama testleri.
+"""
+
+import uuid
+
+import pytest
+from fastapi import HTTPException
+
+from ..routes.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
+
+
+def test_cursor_roundtrip():
+    """Cursor encode/decode simetrik olmalı"""
+    cursor = encode_cursor({"id": 42})
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == {"id": 42}
+
+
+@pytest.mark.parametrize("cursor", ["not-base64!", "e30", encode_cursor({"id": "x"})])
+def test_invalid_cursor_raises_400(cursor):
+    """Bozuk cursor 400 döndürmeli"""
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor(cursor)
+    assert exc.value.status_code == 400
+
+
+def test_list_users_follows_cursor(client, auth_headers):
+    """Sayfalar cursor ile sırayla ve tekrarsız gezilmeli"""
+    created = []
+    for i in range(5):
+        response = client.post(
+            "/users/",
+            json={
+                "name": f"Page User {i}",
+                "email": f"page_{uuid.uuid4().hex[:8]}@example.com",
+                "password": "testpassword123",
+            },
+            headers=auth_headers,
+        )
+        assert response.status_code == 201
+        created.append(response.json()["id"])
+
+    seen = []
+    params = {"limit": 2}
+    while True:
+        response = client.get("/users/", params=params, headers=auth_headers)
+        assert response.status_code == 200
+        page = response.json()
+        assert len(page) <= 2
+        seen.extend(user["id"] for user in page)
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if not cursor:
+            break
+        params = {"limit": 2, "cursor": cursor}
+
+    assert seen == sorted(seen)
+    assert set(created) <= set(seen)
+    assert len(seen) == len(set(seen))
+
+
+def test_list_orders_rejects_invalid_limit(client, auth_headers):
+    """Limit sınırların dışındaysa 422 dönmeli"""
+    response = client.get("/orders/", params={"limit": 0}, headers=auth_headers)
+    assert response.status_code == 422
@@ -0,0 +1,75 @@
+"""
+bcrypt hash havuzu (maliyet faktörü, event loop dışı çalışma, 503 ile reddetme) testleri.
+"""
+
+import asyncio
+import threading
+
+import bcrypt
+import pytest
+from fastapi import HTTPException
+
+from ..core import security
+from ..core.security import PasswordHashPool, password_pool
+from ..core.settings import settings
+
+
+def test_hash_uses_configured_cost_and_pool_thread(monkeypatch):
+    monkeypatch.setattr(settings, "BCRYPT_ROUNDS", 4)
+    threads = []
+    hash_password = security.hash_password
+
+    def hash_in_thread(password):
+        threads.append(threading.current_thread().name)
+        return hash_password(password)
+
+    monkeypatch.setattr(security, "hash_password", hash_in_thread)
+    hashed = asyncio.run(security.hash_password_async("secret"))
+    assert hashed.startswith("$2b$04$")
+    assert threads[0].startswith("bcrypt")
+    assert asyncio.run(security.verify_password_async("secret", hashed))
+    assert not asyncio.run(security.verify_password_async("wrong", hashed))
+    assert bcrypt.checkpw(b"secret", hashed.encode())
+
+
+def test_pool_sheds_work_beyond_queue_limit():
+    pool = PasswordHashPool(workers=1, queue_limit=1)
+    release = threading.Event()
+
+    async def go():
+        jobs = [asyncio.ensure_future(pool.run(release.wait)) for _ in range(2)]
+        await asyncio.sleep(0)
+        with pytest.raises(HTTPException) as exc:
+            await pool.run(release.wait)
+        release.set()
+        await asyncio.gather(*jobs)
+        return exc.value
+
+    error = asyncio.run(go())
+    pool.shutdown()
+    assert error.status_code == 503
+    assert error.headers["Retry-After"] == "1"
+    assert pool.stats() == {
+        "workers": 1,
+        "queue_limit": 1,
+        "in_flight": 0,
+        "completed": 2,
+        "shed": 1,
+    }
+
+
+def test_create_user_returns_503_when_pool_is_full(client, auth_headers, monkeypatch):
+    monkeypatch.setattr(
+        password_pool, "in_flight", password_pool.workers + password_pool.queue_limit
+    )
+    response = client.post(
+        "/users/",
+        json={
+            "name": "Busy",
+            "email": "busy@example.com",
+            "password": "testpassword123",
+        },
+        headers=auth_headers,
+    )
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
@@ -0,0 +1,100 @@
+"""
+Refresh token rotasyonu (yenileme, yeniden kullanım tespiti, tablo/indeks) testleri.
+"""
+
+import asyncio
+
+import jwt
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy import text
+
+from ..auth import get_current_user
+from ..core.settings import settings
+from ..refresh_tokens import issue_refresh_token, refresh_index
+from .conftest import TestingAsyncSessionLocal, engine
+from .test_login import create_user, login
+
+REFRESH_URL = "/auth/refresh"
+
+
+@pytest.fixture
+def tokens(client, auth_headers, monkeypatch):
+    monkeypatch.setattr(settings, "BCRYPT_ROUNDS", 4)
+    user_id = create_user(client, auth_headers, "refresh@example.com")
+    body = login(client, "refresh@example.com").json()
+    return user_id, body["refresh_token"]
+
+
+def refresh(client, token):
+    return client.post(REFRESH_URL, json={"refresh_token": token})
+
+
+def test_refresh_rotates_and_detects_reuse(client, tokens):
+    user_id, first = tokens
+    response = refresh(client, first)
+    assert response.status_code == 200
+    body = response.json()
+    claims = jwt.decode(
+        body["access_token"],
+        settings.JWT_SECRET_KEY,
+        algorithms=[settings.JWT_ALGORITHM],
+    )
+    assert claims["sub"] == str(user_id)
+    second = body["refresh_token"]
+    assert second != first
+
+    # Kullanılmış token tekrar gelir: tüm aile iptal edilir
+    response = refresh(client, first)
+    assert response.status_code == 401
+    assert "reuse" in response.json()["detail"]
+    assert refresh(client, second).status_code == 401
+    with engine.connect() as conn:
+        rows = conn.execute(
+            text(
+                "SELECT used_at IS NOT NULL, revoked_at IS NOT NULL FROM refresh_tokens"
+            )
+        ).all()
+    assert sorted(rows) == [(0, 1), (1, 1)]
+
+
+def test_refresh_falls_back_to_table_when_index_is_cold(client, tokens):
+    _, first = tokens
+    refresh_index.clear()
+    second = refresh(client, first).json()["refresh_token"]
+    refresh_index.clear()
+    assert refresh(client, first).status_code == 401
+    assert refresh(client, second).status_code == 401
+    assert refresh_index.stats()["misses"] >= 2
+
+
+def test_index_is_filled_only_after_commit(client, tokens):
+    user_id, _ = tokens
+
+    async def issue(commit):
+        async with TestingAsyncSessionLocal() as db:
+            token = issue_refresh_token(db, user_id)
+            jti = jwt.decode(token, options={"verify_signature": False})["jti"]
+            # Satır commit edilmeden indekste görünmemeli
+            assert refresh_index.get(jti) is None
+            await (db.commit() if commit else db.rollback())
+            return jti
+
+    assert refresh_index.get(asyncio.run(issue(commit=False))) is None
+    assert refresh_index.get(asyncio.run(issue(commit=True))) is not None
+
+
+def test_token_types_are_not_interchangeable(client, tokens):
+    _, refresh_token = tokens
+    access_token = refresh(client, refresh_token).json()["access_token"]
+    assert refresh(client, access_token).status_code == 401
+    assert refresh(client, "not-a-token").status_code == 401
+
+    credentials = HTTPAuthorizationCredentials(
+        scheme="Bearer", credentials=refresh_token
+    )
+    with pytest.raises(HTTPException) as exc:
+        get_current_user(credentials)
+    assert exc.value.status_code == 401
+    assert exc.value.detail == "Invalid token type"
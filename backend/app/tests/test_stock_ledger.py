@@ -0,0 +1,152 @@
+"""
+Stok defteri (anlık görüntü + hareket kuyruğu) testleri.
+"""
+
+import asyncio
+import datetime
+import uuid
+
+from sqlalchemy import text
+
+from ..ledger import quantities_at, quantity_at, take_snapshots
+from .conftest import TestingAsyncSessionLocal, engine
+
+T0 = datetime.datetime(2026, 1, 1)
+
+
+def create_product():
+    sku = uuid.uuid4().hex[:8]
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO products (name, sku, price, stock, is_active, created_at) "
+                "VALUES (:name, :sku, 1.0, 0, 1, :c)"
+            ),
+            {"name": f"Ledger {sku}", "sku": sku, "c": T0},
+        )
+        return conn.execute(
+            text("SELECT id FROM products WHERE sku = :sku"), {"sku": sku}
+        ).scalar()
+
+
+def move(product_id, kind, quantity, day, source=None, dest=None, id=None):
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO stock_movements (id, product_id, movement_type, "
+                "quantity, source_location, dest_location, created_at) "
+                "VALUES (:id, :p, :kind, :q, :s, :d, :c)"
+            ),
+            {
+                "id": id,
+                "p": product_id,
+                "kind": kind,
+                "q": quantity,
+                "s": source,
+                "d": dest,
+                "c": T0 + datetime.timedelta(days=day),
+            },
+        )
+
+
+def run(func, *args, **kwargs):
+    async def call():
+        async with TestingAsyncSessionLocal() as db:
+            return await func(db, *args, **kwargs)
+
+    return asyncio.run(call())
+
+
+def day(n):
+    return T0 + datetime.timedelta(days=n, hours=12)
+
+
+def test_movements_applied_per_location():
+    product = create_product()
+    move(product, "IN", 10, 0, dest="A")
+    move(product, "TRANSFER", 4, 1, source="A", dest="B")
+    move(product, "OUT", -3, 2, source="B")
+    move(product, "OUT", 1, 2, source="A", dest="Kargo")
+    move(product, "ADJUST", -2, 3, dest="A")
+
+    assert run(quantities_at, day(0)) == {(product, "A"): 10}
+    assert run(quantities_at, day(1)) == {(product, "A"): 6, (product, "B"): 4}
+    assert run(quantities_at, day(3)) == {(product, "A"): 3, (product, "B"): 1}
+    assert run(quantity_at, product, "B", day(2)) == 1
+    assert run(quantity_at, product, "Kargo", day(3)) == 0
+
+
+def test_snapshots_plus_tail_match_full_history():
+    product = create_product()
+    other = create_product()
+    move(product, "IN", 10, 0, dest="A")
+    move(other, "IN", 5, 0, dest="A")
+    move(product, "TRANSFER", 4, 1, source="A", dest="B")
+
+    assert run(take_snapshots, chunk_size=1, now=day(1)) == 4
+    # Yeni hareket yoksa görüntü yazılmaz
+    assert run(take_snapshots, now=day(1)) == 0
+
+    move(product, "OUT", 6, 2, source="A")
+    move(product, "IN", 2, 3, dest="B")
+    with engine.begin() as conn:
+        # Görüntü tek doğruluk kaynağı: kuyruk görüntünün üzerine eklenir
+        conn.execute(text("UPDATE stock_snapshots SET quantity = quantity + 100"))
+
+    expected = {(product, "B"): 106, (other, "A"): 105, (product, "A"): 100}
+    assert run(quantities_at, day(3)) == expected
+    # Görüntüden önceki zaman yalnızca hareketlerden hesaplanır
+    assert run(quantities_at, day(0)) == {(product, "A"): 10, (other, "A"): 5}
+
+    assert run(take_snapshots, now=day(4)) == 2
+    assert run(quantities_at, day(4)) == expected
+    assert run(quantities_at, day(4), product, "A") == {(product, "A"): 100}
+
+
+def test_watermark_waits_for_late_commits():
+    """Küçük id'li hareket sonradan commit edilirse görüntüden kaçmamalı"""
+    product = create_product()
+    move(product, "IN", 10, 0, dest="A", id=1001)
+    # 1002 henüz commit edilmemiş; 1003 görünür ama yeni
+    move(product, "IN", 1, 1, dest="A", id=1003)
+    snapshot_at = T0 + datetime.timedelta(days=1, seconds=30)
+    assert run(take_snapshots, now=snapshot_at) == 1
+    with engine.connect() as conn:
+        assert (
+            conn.execute(text("SELECT MAX(movement_id) FROM stock_snapshots")).scalar()
+            == 1001
+        )
+
+    move(product, "IN", 5, 1, dest="A", id=1002)
+    assert run(quantities_at, day(1)) == {(product, "A"): 16}
+    assert run(take_snapshots, now=day(1)) == 1
+    assert run(quantities_at, day(1)) == {(product, "A"): 16}
+
+
+def test_timezone_aware_time_is_converted_to_utc():
+    product = create_product()
+    move(product, "IN", 4, 1, dest="A")
+    istanbul = datetime.timezone(datetime.timedelta(hours=3))
+    # 01:00+03:00 == 22:00 UTC önceki gün: hareketten önce
+    before = datetime.datetime(2026, 1, 2, 1, 0, tzinfo=istanbul)
+    after = datetime.datetime(2026, 1, 2, 4, 0, tzinfo=istanbul)
+    assert run(quantities_at, before) == {}
+    assert run(quantities_at, after) == {(product, "A"): 4}
+
+
+def test_ledger_endpoint(client, auth_headers):
+    product = create_product()
+    move(product, "IN", 7, 0, dest="A")
+    move(product, "IN", 3, 0)
+
+    response = client.get(
+        f"/stocks/ledger?product_id={product}&at={day(0).isoformat()}",
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    assert response.json() == [
+        {"product_id": product, "location": None, "quantity": 3},
+        {"product_id": product, "location": "A", "quantity": 7},
+    ]
+    response = client.get("/stocks/ledger?location=A", headers=auth_headers)
+    assert [row["quantity"] for row in response.json()] == [7]
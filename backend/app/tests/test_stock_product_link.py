@@ -0,0 +1,106 @@
+"""
+Stock.product_id bağlantısı (oluşturma, toplu upsert, güncelleme, transfer) testleri.
+"""
+
+import uuid
+
+from sqlalchemy import text
+
+from .conftest import engine
+
+
+def create_product(name):
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO products (name, sku, price, stock) "
+                "VALUES (:name, :sku, 1.0, 0)"
+            ),
+            {"name": name, "sku": uuid.uuid4().hex[:8]},
+        )
+        return conn.execute(
+            text("SELECT id FROM products WHERE name = :name"), {"name": name}
+        ).scalar()
+
+
+def post_stock(client, auth_headers, **payload):
+    payload.setdefault("quantity", 10)
+    return client.post("/stocks/", json=payload, headers=auth_headers)
+
+
+def test_create_links_product_by_name_or_id(client, auth_headers):
+    product_id = create_product("Link A")
+    response = post_stock(client, auth_headers, product_name="Link A")
+    assert response.status_code == 201
+    assert response.json()["product_id"] == product_id
+
+    response = post_stock(
+        client, auth_headers, product_name="Depo etiketi", product_id=product_id
+    )
+    assert response.json()["product_id"] == product_id
+    assert (
+        post_stock(client, auth_headers, product_name="Serbest").json()["product_id"]
+        is None
+    )
+    response = post_stock(client, auth_headers, product_name="X", product_id=999999)
+    assert response.status_code == 422
+
+    response = client.get(
+        "/stocks/", params={"product_id": product_id}, headers=auth_headers
+    )
+    assert len(response.json()) == 2
+
+
+def test_bulk_and_update_link_products(client, auth_headers):
+    a = create_product("Link Bulk A")
+    b = create_product("Link Bulk B")
+    response = client.post(
+        "/stocks/bulk",
+        json=[
+            {"product_name": "Link Bulk A", "quantity": 1},
+            {"product_name": "Link Bulk Other", "quantity": 1, "product_id": b},
+            {"product_name": "Link Bulk Bad", "quantity": 1, "product_id": 999999},
+        ],
+        headers=auth_headers,
+    )
+    body = response.json()
+    assert (body["inserted"], [e["index"] for e in body["errors"]]) == (2, [2])
+    stocks = {
+        s["product_name"]: s
+        for s in client.get("/stocks/", headers=auth_headers).json()
+    }
+    assert stocks["Link Bulk A"]["product_id"] == a
+    assert stocks["Link Bulk Other"]["product_id"] == b
+
+    # Ad değişince yeni adlı ürüne bağlanır
+    stock_id = stocks["Link Bulk A"]["id"]
+    response = client.put(
+        f"/stocks/{stock_id}",
+        json={"product_name": "Link Bulk B"},
+        headers=auth_headers,
+    )
+    assert response.json()["product_id"] == b
+    response = client.put(
+        f"/stocks/{stock_id}", json={"product_id": 999999}, headers=auth_headers
+    )
+    assert response.status_code == 422
+
+
+def test_transfer_uses_linked_product_id(client, auth_headers):
+    product_id = create_product("Link Transfer")
+    source = post_stock(
+        client, auth_headers, product_name="Raf 1", product_id=product_id
+    ).json()["id"]
+    # Hedef adından çözülür: aynı ürünün başka konumdaki satırı
+    dest = post_stock(client, auth_headers, product_name="Link Transfer").json()["id"]
+    response = client.post(
+        "/stocks/transfers",
+        json=[{"source_id": source, "dest_id": dest, "quantity": 4}],
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    with engine.connect() as conn:
+        moved = conn.execute(
+            text("SELECT product_id, quantity FROM stock_movements")
+        ).all()
+    assert moved == [(product_id, 4)]
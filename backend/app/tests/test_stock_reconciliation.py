@@ -0,0 +1,202 @@
+"""
+Product.stock / Stock.quantity mutabakatı testleri.
+"""
+
+import asyncio
+import uuid
+
+from sqlalchemy import text
+
+from ..archive import archive_orders
+from ..reconciliation import reconcile_stock
+from .conftest import TestingAsyncSessionLocal, engine
+
+
+def create_product(stock):
+    sku = uuid.uuid4().hex[:8]
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO products (name, sku, price, stock, is_active) "
+                "VALUES (:name, :sku, 1.0, :stock, 1)"
+            ),
+            {"name": f"Recon {sku}", "sku": sku, "stock": stock},
+        )
+        return conn.execute(
+            text("SELECT id FROM products WHERE sku = :sku"), {"sku": sku}
+        ).scalar()
+
+
+def create_stock(product_id, quantity):
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO stocks (product_name, product_id, quantity, unit_price) "
+                "VALUES (:name, :product_id, :quantity, 0)"
+            ),
+            {
+                "name": f"Recon stock {uuid.uuid4().hex[:8]}",
+                "product_id": product_id,
+                "quantity": quantity,
+            },
+        )
+
+
+def run(**kwargs):
+    async def go():
+        async with TestingAsyncSessionLocal() as db:
+            return await reconcile_stock(db, **kwargs)
+
+    return asyncio.run(go())
+
+
+def product_stock(product_id):
+    with engine.connect() as conn:
+        return conn.execute(
+            text("SELECT stock FROM products WHERE id = :id"), {"id": product_id}
+        ).scalar()
+
+
+def test_report_then_fix_with_adjustments():
+    drifted = create_product(10)
+    create_stock(drifted, 4)
+    create_stock(drifted, 3)
+    in_sync = create_product(5)
+    create_stock(in_sync, 5)
+    create_product(8)  # stok satırı yok, karşılaştırılmaz
+
+    report = run(chunk_size=1)
+    assert [(d.product_id, d.delta) for d in report.drifts] == [(drifted, -3)]
+    assert report.corrected == 0 and product_stock(drifted) == 10
+
+    report = run(fix=True, full=True, chunk_size=2)
+    assert report.corrected == 1
+    assert product_stock(drifted) == 7
+    with engine.connect() as conn:
+        movements = conn.execute(
+            text("SELECT product_id, movement_type, quantity FROM stock_movements")
+        ).all()
+    assert movements == [(drifted, "ADJUST", -3)]
+    assert run(full=True).drifts == []
+
+
+def test_incremental_run_visits_only_changed_rows():
+    product_id = create_product(1)
+    create_stock(product_id, 1)
+    assert run().drifts == []
+
+    # Checkpoint'ten önce değişmiş görünen fark artımlı çalışmada görülmez
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "UPDATE products SET stock = 9, updated_at = '2000-01-01 00:00:00' "
+                "WHERE id = :id"
+            ),
+            {"id": product_id},
+        )
+        conn.execute(text("UPDATE stocks SET updated_at = '2000-01-01 00:00:00'"))
+    assert run().drifts == []
+    assert [d.product_id for d in run(full=True).drifts] == [product_id]
+
+    # Stok satırındaki değişiklik bağlı ürünü yeniden ziyaret ettirir
+    with engine.begin() as conn:
+        conn.execute(
+            text("UPDATE stocks SET quantity = 2, updated_at = CURRENT_TIMESTAMP")
+        )
+    report = run(fix=True)
+    assert [(d.product_id, d.delta) for d in report.drifts] == [(product_id, -7)]
+    assert product_stock(product_id) == 2
+
+
+def test_fix_keeps_order_reservations(client, auth_headers):
+    """Sipariş products.stock'u düşer; düzeltme rezervasyonu geri almamalı"""
+    product_id = create_product(10)
+    create_stock(product_id, 10)
+    user_id = client.post(
+        "/users/",
+        json={
+            "name": "Recon User",
+            "email": f"recon_{uuid.uuid4().hex[:8]}@example.com",
+            "password": "testpassword123",
+        },
+        headers=auth_headers,
+    ).json()["id"]
+    order = {
+        "user_id": user_id,
+        "total_amount": 3.0,
+        "order_items": [
+            {
+                "product_id": product_id,
+                "quantity": 3,
+                "unit_price": 1.0,
+                "total_price": 3.0,
+            }
+        ],
+    }
+    response = client.post("/orders/", json=order, headers=auth_headers)
+    assert response.status_code == 201
+    assert product_stock(product_id) == 7
+
+    report = run(fix=True, full=True)
+    assert report.drifts == [] and report.corrected == 0
+    assert product_stock(product_id) == 7
+
+    # İptal edilen siparişin rezervasyonu sayılmaz
+    client.put(
+        f"/orders/{response.json()['id']}",
+        json={"status": "cancelled"},
+        headers=auth_headers,
+    )
+    assert product_stock(product_id) == 10
+    assert run(full=True).drifts == []
+
+
+def test_archived_delivered_order_is_not_added_back(client, auth_headers):
+    """Arşive taşınan teslim edilmiş sipariş düşümünü geri almamalı"""
+    product_id = create_product(10)
+    create_stock(product_id, 10)
+    user_id = client.post(
+        "/users/",
+        json={
+            "name": "Recon Archive",
+            "email": f"recon_{uuid.uuid4().hex[:8]}@example.com",
+            "password": "testpassword123",
+        },
+        headers=auth_headers,
+    ).json()["id"]
+    orders = [
+        client.post(
+            "/orders/",
+            json={
+                "user_id": user_id,
+                "total_amount": 2.0,
+                "order_items": [
+                    {
+                        "product_id": product_id,
+                        "quantity": 2,
+                        "unit_price": 1.0,
+                        "total_price": 2.0,
+                    }
+                ],
+            },
+            headers=auth_headers,
+        ).json()["id"]
+        for _ in range(2)
+    ]
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "UPDATE orders SET status = 'delivered', "
+                "created_at = '2000-01-01 00:00:00' WHERE id = :id"
+            ),
+            {"id": orders[0]},
+        )
+
+    async def archive():
+        async with TestingAsyncSessionLocal() as db:
+            return await archive_orders(db, older_than_days=30)
+
+    assert asyncio.run(archive()) == 1
+    report = run(fix=True, full=True)
+    assert report.drifts == [] and report.corrected == 0
+    assert product_stock(product_id) == 6
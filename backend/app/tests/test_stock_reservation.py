@@ -0,0 +1,253 @@
+"""
+Sipariş verilirken atomik stok rezervasyonu testleri.
+"""
+
+import asyncio
+import uuid
+
+import pytest
+from sqlalchemy import text
+
+from ..scripts.benchmark_stock_reservation import create_hot_product, hammer, verify
+from .conftest import TestingAsyncSessionLocal, engine
+
+
+def create_user(client, auth_headers):
+    response = client.post(
+        "/users/",
+        json={
+            "name": "Stock User",
+            "email": f"stock_{uuid.uuid4().hex[:8]}@example.com",
+            "password": "testpassword123",
+        },
+        headers=auth_headers,
+    )
+    return response.json()["id"]
+
+
+def create_product(stock):
+    return asyncio.run(create_hot_product(TestingAsyncSessionLocal, stock))
+
+
+def product_stock(product_id):
+    with engine.connect() as conn:
+        return conn.execute(
+            text("SELECT stock FROM products WHERE id = :id"), {"id": product_id}
+        ).scalar()
+
+
+def movements(product_id):
+    with engine.connect() as conn:
+        return conn.execute(
+            text(
+                "SELECT movement_type, quantity FROM stock_movements "
+                "WHERE product_id = :id"
+            ),
+            {"id": product_id},
+        ).all()
+
+
+def order_payload(user_id, *items):
+    return {
+        "user_id": user_id,
+        "total_amount": 1.0,
+        "order_items": [
+            {
+                "product_id": product_id,
+                "quantity": quantity,
+                "unit_price": 1.0,
+                "total_price": float(quantity),
+            }
+            for product_id, quantity in items
+        ],
+    }
+
+
+def test_order_reserves_stock_and_writes_movement(client, auth_headers):
+    user_id = create_user(client, auth_headers)
+    product_id = create_product(5)
+    response = client.post(
+        "/orders/", json=order_payload(user_id, (product_id, 3)), headers=auth_headers
+    )
+    assert response.status_code == 201
+    assert product_stock(product_id) == 2
+    assert movements(product_id) == [("OUT", -3)]
+
+
+def test_out_of_stock_returns_409_and_rolls_back(client, auth_headers):
+    """Bir kalem yetmezse diğer kalemlerin düşümü de geri alınmalı"""
+    user_id = create_user(client, auth_headers)
+    plenty = create_product(10)
+    scarce = create_product(1)
+    response = client.post(
+        "/orders/",
+        json=order_payload(user_id, (plenty, 2), (scarce, 2)),
+        headers=auth_headers,
+    )
+    assert response.status_code == 409
+    assert product_stock(plenty) == 10
+    assert product_stock(scarce) == 1
+    assert movements(plenty) == []
+    with engine.connect() as conn:
+        orders = conn.execute(
+            text("SELECT COUNT(*) FROM orders WHERE user_id = :id"), {"id": user_id}
+        ).scalar()
+    assert orders == 0
+
+
+def test_bulk_rejects_rows_that_run_out(client, auth_headers):
+    user_id = create_user(client, auth_headers)
+    product_id = create_product(3)
+    other_id = create_product(5)
+    payload = [
+        order_payload(user_id, (product_id, 2)),
+        order_payload(user_id, (other_id, 1), (product_id, 2)),
+        order_payload(user_id, (product_id, 1)),
+    ]
+    response = client.post("/orders/bulk", json=payload, headers=auth_headers)
+    assert response.status_code == 200
+    statuses = [row["status"] for row in response.json()["results"]]
+    assert statuses == ["created", "rejected", "created"]
+    assert product_stock(product_id) == 0
+    # Reddedilen satırın diğer kalemi geri eklenmeli
+    assert product_stock(other_id) == 5
+    assert movements(other_id) == []
+
+
+@pytest.mark.slow
+def test_hot_sku_is_never_oversold():
+    """Çok sayıda worker tek ürünü aynı anda rezerve eder"""
+    product_id = create_product(50)
+
+    async def run():
+        stats = await hammer(TestingAsyncSessionLocal, product_id, 20, 5)
+        return stats, await verify(TestingAsyncSessionLocal, product_id)
+
+    stats, totals = asyncio.run(run())
+    assert stats["reserved"] + stats["rejected"] + stats["errors"] == 100
+    assert stats["reserved"] <= 50
+    assert totals["stock"] == 50 - stats["reserved"]
+    assert totals["moved"] == stats["reserved"]
+
+
+def product_name(product_id):
+    with engine.connect() as conn:
+        return conn.execute(
+            text("SELECT name FROM products WHERE id = :id"), {"id": product_id}
+        ).scalar()
+
+
+def place_order(client, auth_headers, product_id, quantity):
+    user_id = create_user(client, auth_headers)
+    response = client.post(
+        "/orders/",
+        json=order_payload(user_id, (product_id, quantity)),
+        headers=auth_headers,
+    )
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def test_product_change_moves_reservation(client, auth_headers):
+    old_id = create_product(5)
+    new_id = create_product(5)
+    order_id = place_order(client, auth_headers, old_id, 3)
+    response = client.put(
+        f"/orders/{order_id}",
+        json={"product_name": product_name(new_id), "amount": 2.0},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    assert product_stock(old_id) == 5
+    assert product_stock(new_id) == 4
+    assert sorted(movements(old_id)) == [("IN", 3), ("OUT", -3)]
+    assert movements(new_id) == [("OUT", -1)]
+
+
+def test_product_change_without_stock_returns_409(client, auth_headers):
+    old_id = create_product(5)
+    empty_id = create_product(0)
+    order_id = place_order(client, auth_headers, old_id, 2)
+    response = client.put(
+        f"/orders/{order_id}",
+        json={"product_name": product_name(empty_id), "amount": 2.0},
+        headers=auth_headers,
+    )
+    assert response.status_code == 409
+    assert product_stock(old_id) == 3
+    assert movements(old_id) == [("OUT", -2)]
+    with engine.connect() as conn:
+        items = conn.execute(
+            text("SELECT product_id FROM order_items WHERE order_id = :id"),
+            {"id": order_id},
+        ).all()
+    assert items == [(old_id,)]
+
+
+def test_cancel_releases_reservation(client, auth_headers):
+    product_id = create_product(5)
+    order_id = place_order(client, auth_headers, product_id, 3)
+    response = client.put(
+        f"/orders/{order_id}", json={"status": "cancelled"}, headers=auth_headers
+    )
+    assert response.status_code == 200
+    assert product_stock(product_id) == 5
+    # Tekrar iptal etmek ikinci kez geri eklemez
+    client.put(
+        f"/orders/{order_id}", json={"status": "cancelled"}, headers=auth_headers
+    )
+    assert product_stock(product_id) == 5
+
+
+def test_delete_releases_undelivered_reservation(client, auth_headers):
+    product_id = create_product(5)
+    pending = place_order(client, auth_headers, product_id, 2)
+    delivered = place_order(client, auth_headers, product_id, 1)
+    client.put(
+        f"/orders/{delivered}", json={"status": "delivered"}, headers=auth_headers
+    )
+    assert client.delete(f"/orders/{pending}", headers=auth_headers).status_code == 204
+    assert (
+        client.delete(f"/orders/{delivered}", headers=auth_headers).status_code == 204
+    )
+    assert product_stock(product_id) == 4
+
+
+def test_non_positive_quantities_are_rejected(client, auth_headers):
+    user_id = create_user(client, auth_headers)
+    product_id = create_product(5)
+    for quantity in (0, -2):
+        response = client.post(
+            "/orders/",
+            json=order_payload(user_id, (product_id, quantity)),
+            headers=auth_headers,
+        )
+        assert response.status_code == 422
+    assert product_stock(product_id) == 5
+
+
+def test_cancelled_order_reserves_nothing(client, auth_headers):
+    user_id = create_user(client, auth_headers)
+    product_id = create_product(5)
+    payload = {**order_payload(user_id, (product_id, 2)), "status": "cancelled"}
+    response = client.post("/orders/", json=payload, headers=auth_headers)
+    assert response.status_code == 201
+    response = client.post("/orders/bulk", json=[payload], headers=auth_headers)
+    assert response.json()["results"][0]["status"] == "created"
+    assert product_stock(product_id) == 5
+    assert movements(product_id) == []
+
+
+def test_delete_user_releases_pending_orders(client, auth_headers):
+    user_id = create_user(client, auth_headers)
+    product_id = create_product(5)
+    response = client.post(
+        "/orders/",
+        json=order_payload(user_id, (product_id, 3)),
+        headers=auth_headers,
+    )
+    assert response.status_code == 201
+    assert product_stock(product_id) == 2
+    response = client.delete(f"/users/{user_id}", headers=auth_headers)
+    assert response.status_code == 204
+    assert product_stock(product_id) == 5
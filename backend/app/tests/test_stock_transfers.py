@@ -0,0 +1,181 @@
+"""
+POST /stocks/transfers testleri.
+"""
+
+import asyncio
+import uuid
+
+from sqlalchemy import text
+
+from ..ledger import quantities_at
+from .conftest import TestingAsyncSessionLocal, engine
+
+
+def create_product():
+    name = f"Transfer {uuid.uuid4().hex[:8]}"
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO products (name, sku, price, stock, is_active, created_at) "
+                "VALUES (:name, :sku, 1.0, 0, 1, CURRENT_TIMESTAMP)"
+            ),
+            {"name": name, "sku": name},
+        )
+        return conn.execute(
+            text("SELECT id FROM products WHERE sku = :sku"), {"sku": name}
+        ).scalar()
+
+
+def create_stock(client, auth_headers, product_id, quantity, location):
+    """Ürüne bağlı, konum başına bir stok satırı; giriş hareketi de yazılır."""
+    response = client.post(
+        "/stocks/",
+        json={
+            "product_name": f"Transfer {uuid.uuid4().hex[:8]} @ {location}",
+            "product_id": product_id,
+            "quantity": quantity,
+            "location": location,
+        },
+        headers=auth_headers,
+    )
+    assert response.status_code == 201
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO stock_movements "
+                "(product_id, movement_type, quantity, dest_location) "
+                "VALUES (:p, 'IN', :q, :loc)"
+            ),
+            {"p": product_id, "q": quantity, "loc": location},
+        )
+    return response.json()["id"]
+
+
+def quantities(*ids):
+    with engine.connect() as conn:
+        return [
+            conn.execute(
+                text("SELECT quantity FROM stocks WHERE id = :id"), {"id": id}
+            ).scalar()
+            for id in ids
+        ]
+
+
+def transfer_movements():
+    with engine.connect() as conn:
+        return conn.execute(
+            text(
+                "SELECT product_id, quantity, source_location, dest_location "
+                "FROM stock_movements WHERE movement_type = 'TRANSFER' ORDER BY id"
+            )
+        ).all()
+
+
+def ledger(product_id):
+    async def call():
+        async with TestingAsyncSessionLocal() as db:
+            return await quantities_at(db, product_id=product_id)
+
+    return asyncio.run(call())
+
+
+def stock_table(product_id):
+    with engine.connect() as conn:
+        rows = conn.execute(
+            text(
+                "SELECT location, quantity FROM stocks "
+                "WHERE product_id = :p AND quantity != 0"
+            ),
+            {"p": product_id},
+        ).all()
+    return {(product_id, location): quantity for location, quantity in rows}
+
+
+def test_batch_transfer_moves_product_between_locations(client, auth_headers):
+    product = create_product()
+    a = create_stock(client, auth_headers, product, 10, "A")
+    b = create_stock(client, auth_headers, product, 0, "B")
+    c = create_stock(client, auth_headers, product, 5, "C")
+
+    payload = [
+        {"source_id": a, "dest_id": b, "quantity": 4},
+        # Partideki net değişim kontrol edilir: b önce alır sonra verir
+        {"source_id": b, "dest_id": c, "quantity": 4},
+        {"source_id": c, "dest_id": a, "quantity": 1},
+    ]
+    response = client.post("/stocks/transfers", json=payload, headers=auth_headers)
+    assert response.status_code == 200
+    assert [stock["quantity"] for stock in response.json()] == [7, 0, 8]
+    assert quantities(a, b, c) == [7, 0, 8]
+    assert transfer_movements() == [
+        (product, 4, "A", "B"),
+        (product, 4, "B", "C"),
+        (product, 1, "C", "A"),
+    ]
+    # Defter ve stok tablosu aynı bakiyeleri göstermeli
+    expected = {(product, "A"): 7, (product, "C"): 8}
+    assert ledger(product) == stock_table(product) == expected
+
+
+def test_transfer_between_different_products_is_rejected(client, auth_headers):
+    product = create_product()
+    other = create_product()
+    a = create_stock(client, auth_headers, product, 10, "A")
+    b = create_stock(client, auth_headers, other, 0, "B")
+    response = client.post(
+        "/stocks/transfers",
+        json=[{"source_id": a, "dest_id": b, "quantity": 1}],
+        headers=auth_headers,
+    )
+    assert response.status_code == 422
+    assert "different products" in response.json()["detail"]
+    assert quantities(a, b) == [10, 0]
+    assert transfer_movements() == []
+    assert ledger(product) == stock_table(product)
+
+
+def test_insufficient_stock_rolls_back_whole_batch(client, auth_headers):
+    product = create_product()
+    a = create_stock(client, auth_headers, product, 10, "A")
+    b = create_stock(client, auth_headers, product, 1, "B")
+    payload = [
+        {"source_id": a, "dest_id": b, "quantity": 5},
+        {"source_id": b, "dest_id": a, "quantity": 7},
+    ]
+    response = client.post("/stocks/transfers", json=payload, headers=auth_headers)
+    assert response.status_code == 409
+    assert f"stock_id={b}" in response.json()["detail"]
+    assert quantities(a, b) == [10, 1]
+    assert transfer_movements() == []
+    assert ledger(product) == stock_table(product)
+
+
+def test_transfer_validation(client, auth_headers):
+    product = create_product()
+    a = create_stock(client, auth_headers, product, 10, "A")
+    response = client.post(
+        "/stocks/transfers",
+        json=[{"source_id": a, "dest_id": a, "quantity": 1}],
+        headers=auth_headers,
+    )
+    assert response.status_code == 422
+    response = client.post(
+        "/stocks/transfers",
+        json=[{"source_id": a, "dest_id": 999999, "quantity": 1}],
+        headers=auth_headers,
+    )
+    assert response.status_code == 404
+
+    orphan = client.post(
+        "/stocks/",
+        json={"product_name": f"Orphan {uuid.uuid4().hex[:8]}", "quantity": 3},
+        headers=auth_headers,
+    ).json()["id"]
+    for source, dest in ((orphan, a), (a, orphan)):
+        response = client.post(
+            "/stocks/transfers",
+            json=[{"source_id": source, "dest_id": dest, "quantity": 1}],
+            headers=auth_headers,
+        )
+        assert response.status_code == 422
+    assert quantities(a, orphan) == [10, 3]
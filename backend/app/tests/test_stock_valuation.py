@@ -0,0 +1,80 @@
+"""
+Stok değerleme raporu (GROUP BY, cache, artımlı özet tablosu) testleri.
+"""
+
+import pytest
+
+from ..core.settings import settings
+from ..valuation import report_cache
+from .test_list_filters import create_stock
+
+URL = "/stocks/reports/valuation"
+
+
+def report(client, auth_headers, group_by):
+    report_cache.clear()
+    response = client.get(URL, params={"group_by": group_by}, headers=auth_headers)
+    assert response.status_code == 200
+    return {
+        row["key"]: (row["items"], row["quantity"], row["value"])
+        for row in response.json()
+    }
+
+
+def setup_stocks(client, auth_headers):
+    ids = [
+        create_stock(client, auth_headers, 2, "A", "ACME"),
+        create_stock(client, auth_headers, 3, "A", "Globex"),
+        create_stock(client, auth_headers, 5, "B", "ACME"),
+        create_stock(client, auth_headers, 1, None, None),
+    ]
+    client.put(f"/stocks/{ids[0]}", json={"unit_price": 2.5}, headers=auth_headers)
+    return ids
+
+
+@pytest.mark.parametrize("summary", [False, True])
+def test_valuation_grouped_by_location_and_supplier(
+    client, auth_headers, monkeypatch, summary
+):
+    monkeypatch.setattr(settings, "VALUATION_SUMMARY", summary)
+    setup_stocks(client, auth_headers)
+    assert report(client, auth_headers, "location") == {
+        "A": (2, 5, 8.0),
+        "B": (1, 5, 5.0),
+        None: (1, 1, 1.0),
+    }
+    assert report(client, auth_headers, "supplier") == {
+        "ACME": (2, 7, 10.0),
+        "Globex": (1, 3, 3.0),
+        None: (1, 1, 1.0),
+    }
+    response = client.get(URL, params={"group_by": "sku"}, headers=auth_headers)
+    assert response.status_code in (400, 422)
+
+
+def test_summary_refreshes_changed_groups(client, auth_headers, monkeypatch):
+    monkeypatch.setattr(settings, "VALUATION_SUMMARY", True)
+    ids = setup_stocks(client, auth_headers)
+    report(client, auth_headers, "location")
+
+    # Satır A'dan C'ye taşınır, B silinir, toplu upsert miktarı değiştirir
+    client.put(f"/stocks/{ids[1]}", json={"location": "C"}, headers=auth_headers)
+    client.delete(f"/stocks/{ids[2]}", headers=auth_headers)
+    name = client.get(f"/stocks/{ids[3]}", headers=auth_headers).json()["product_name"]
+    client.post(
+        "/stocks/bulk",
+        json=[{"product_name": name, "location": "C"}],
+        headers=auth_headers,
+    )
+    assert report(client, auth_headers, "location") == {
+        "A": (1, 2, 5.0),
+        "C": (2, 4, 4.0),
+    }
+
+
+def test_report_is_cached(client, auth_headers):
+    create_stock(client, auth_headers, 2, "A")
+    report(client, auth_headers, "location")
+    response = client.get(URL, headers=auth_headers)
+    assert response.headers["X-Cache"] == "HIT"
+    assert client.get("/metrics/cache").json()["report"]["hits"] >= 1
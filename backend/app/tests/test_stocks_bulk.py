@@ -0,0 +1,95 @@
+"""
+POST /stocks/bulk upsert testleri.
+"""
+
+import uuid
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import text
+
+from ..models import Stock
+from ..routes.common import upsert_statement
+from .conftest import engine
+
+
+def stock_rows():
+    with engine.connect() as conn:
+        return {
+            name: (quantity, location)
+            for name, quantity, location in conn.execute(
+                text("SELECT product_name, quantity, location FROM stocks")
+            )
+        }
+
+
+def test_bulk_upsert_inserts_and_updates(client, auth_headers):
+    existing = f"Bulk Stock {uuid.uuid4().hex[:8]}"
+    response = client.post(
+        "/stocks/",
+        json={"product_name": existing, "quantity": 1, "location": "A"},
+        headers=auth_headers,
+    )
+    assert response.status_code == 201
+
+    new = f"Bulk Stock {uuid.uuid4().hex[:8]}"
+    payload = [
+        {"product_name": existing, "quantity": 50},
+        {"product_name": new, "quantity": 7, "location": "B"},
+        {"product_name": "", "quantity": 3},
+        {"product_name": "x", "quantity": -1},
+    ]
+    with patch("app.routes.upserts.settings.BULK_CHUNK_SIZE", 1):
+        response = client.post("/stocks/bulk", json=payload, headers=auth_headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert (data["inserted"], data["updated"], data["rejected"]) == (1, 1, 2)
+    assert [error["index"] for error in data["errors"]] == [2, 3]
+
+    rows = stock_rows()
+    # Gönderilmeyen location korunur
+    assert rows[existing] == (50, "A")
+    assert rows[new] == (7, "B")
+
+
+def test_bulk_partial_rows_update_existing_only(client, auth_headers):
+    name = f"Partial Stock {uuid.uuid4().hex[:8]}"
+    client.post(
+        "/stocks/",
+        json={"product_name": name, "quantity": 5, "location": "A"},
+        headers=auth_headers,
+    )
+    payload = [
+        {"product_name": name, "location": "C"},
+        {"product_name": "Missing Stock", "location": "C"},
+    ]
+    response = client.post("/stocks/bulk", json=payload, headers=auth_headers)
+    data = response.json()
+    assert (data["inserted"], data["updated"], data["rejected"]) == (0, 1, 1)
+    assert stock_rows()[name] == (5, "C")
+
+
+def test_bulk_duplicate_keys_last_row_wins(client, auth_headers):
+    name = f"Dup Stock {uuid.uuid4().hex[:8]}"
+    payload = [
+        {"product_name": name, "quantity": 1},
+        {"product_name": name, "quantity": 2},
+    ]
+    response = client.post("/stocks/bulk", json=payload, headers=auth_headers)
+    data = response.json()
+    assert (data["inserted"], data["rejected"]) == (1, 1)
+    assert data["errors"][0]["index"] == 0
+    assert stock_rows()[name][0] == 2
+
+
+def test_bulk_upsert_rejects_oversized_batch(client, auth_headers):
+    with patch("app.routes.stocks.settings.BULK_MAX_ROWS", 1):
+        response = client.post("/stocks/bulk", json=[{}, {}], headers=auth_headers)
+    assert response.status_code == 413
+
+
+def test_upsert_statement_names_unsupported_dialect():
+    db = SimpleNamespace(bind=SimpleNamespace(dialect=SimpleNamespace(name="mysql")))
+    with pytest.raises(RuntimeError, match="got dialect: mysql"):
+        upsert_statement(db, Stock.__table__, ["product_name"], ["quantity"])
@@ -0,0 +1,90 @@
+"""
+Liste endpoint'leri NDJSON streaming testleri.
+"""
+
+import json
+import uuid
+from unittest.mock import patch
+
+from ..main import app
+from ..routes.common import get_async_db
+from .conftest import TestingAsyncSessionLocal
+from .test_list_filters import create_order, create_stock, create_user
+
+
+def ndjson(response):
+    return [json.loads(line) for line in response.text.splitlines() if line]
+
+
+def test_stream_stocks_returns_all_rows(client, auth_headers):
+    """Sayfa boyutundan bağımsız olarak tüm satırlar akar"""
+    for quantity in range(5):
+        create_stock(client, auth_headers, quantity, "Stream Depo")
+    with patch("app.routes.streaming.settings.STREAM_BATCH_SIZE", 2):
+        response = client.get(
+            "/stocks/",
+            params={"stream": 1, "limit": 1, "sort": "-quantity"},
+            headers=auth_headers,
+        )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert "X-Next-Cursor" not in response.headers
+    assert [row["quantity"] for row in ndjson(response)] == [4, 3, 2, 1, 0]
+
+
+def test_stream_via_accept_header_with_filters(client, auth_headers):
+    create_stock(client, auth_headers, 1, "Depo X")
+    create_stock(client, auth_headers, 2, "Depo Y")
+    response = client.get(
+        "/stocks/",
+        params={"location": "Depo Y"},
+        headers={**auth_headers, "Accept": "application/x-ndjson"},
+    )
+    assert response.status_code == 200
+    assert [row["location"] for row in ndjson(response)] == ["Depo Y"]
+
+
+def test_stream_orders_includes_items(client, auth_headers):
+    user_id = create_user(client, auth_headers)
+    ids = [create_order(client, auth_headers, user_id) for _ in range(3)]
+    with patch("app.routes.streaming.settings.STREAM_BATCH_SIZE", 2):
+        response = client.get(
+            "/orders/",
+            params={"stream": "true", "user_id": user_id},
+            headers=auth_headers,
+        )
+    assert response.status_code == 200
+    rows = ndjson(response)
+    assert [row["id"] for row in rows] == ids
+    assert all(len(row["order_items"]) == 1 for row in rows)
+
+
+def test_stream_users(client, auth_headers):
+    email = f"stream_{uuid.uuid4().hex[:8]}@example.com"
+    client.post(
+        "/users/",
+        json={"name": "Stream User", "email": email, "password": "testpassword123"},
+        headers=auth_headers,
+    )
+    response = client.get("/users/", params={"stream": 1}, headers=auth_headers)
+    assert response.status_code == 200
+    assert email in [row["email"] for row in ndjson(response)]
+
+
+def test_stream_does_not_use_request_session(client, auth_headers):
+    """Gövde, route döndükten sonra istek oturumuna dokunmadan üretilir"""
+    create_stock(client, auth_headers, 1, "Depo Z")
+
+    async def guarded_request_session():
+        async with TestingAsyncSessionLocal() as db:
+
+            async def fail(*args, **kwargs):
+                raise AssertionError("request session used while streaming")
+
+            db.stream_scalars = fail
+            yield db
+
+    app.dependency_overrides[get_async_db] = guarded_request_session
+    response = client.get("/stocks/", params={"stream": 1}, headers=auth_headers)
+    assert response.status_code == 200
+    assert [row["location"] for row in ndjson(response)] == ["Depo Z"]
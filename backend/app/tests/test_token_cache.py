@@ -0,0 +1,78 @@
+"""
+JWT doğrulama cache'i (özet anahtarı, exp'te düşme, iptal kontrolü, sayaçlar) testleri.
+"""
+
+import datetime
+
+import jwt
+import pytest
+from fastapi import HTTPException
+
+from .. import auth
+from ..core.security import create_access_token
+from ..token_cache import TokenCache, token_cache
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_verify_token_decodes_once_per_token(monkeypatch):
+    calls = []
+    decode = jwt.decode
+
+    def counting_decode(*args, **kwargs):
+        calls.append(args[0])
+        return decode(*args, **kwargs)
+
+    monkeypatch.setattr(auth.jwt, "decode", counting_decode)
+    token = create_access_token({"sub": "1", "role": "admin"})
+    hits = token_cache.stats()["hits"]
+    first = auth.verify_token(token)
+    first["role"] = "changed"
+    assert auth.verify_token(token)["role"] == "admin"
+    assert len(calls) == 1
+    assert token_cache.stats()["hits"] == hits + 1
+
+    expired = create_access_token({"sub": "1"}, datetime.timedelta(seconds=-1))
+    with pytest.raises(HTTPException):
+        auth.verify_token(expired)
+    assert len(token_cache) == 1
+
+
+def test_entries_expire_at_token_exp_and_evict_lru():
+    clock = FakeClock()
+    cache = TokenCache(max_size=2, clock=clock)
+    cache.set("a", {"sub": "1", "exp": 1010})
+    cache.set("b", {"sub": "2", "exp": 1100})
+    cache.set("no-exp", {"sub": "3"})
+    assert len(cache) == 2
+
+    clock.now = 1010
+    assert cache.get("a") is None
+    assert cache.get("b") == {"sub": "2", "exp": 1100}
+    cache.set("c", {"sub": "3", "exp": 1100})
+    cache.set("d", {"sub": "4", "exp": 1100})
+    assert cache.get("b") is None
+    assert cache.stats()["expirations"] == 1
+    assert cache.stats()["evictions"] == 1
+
+
+def test_revocation_check_drops_cached_claims():
+    cache = TokenCache(clock=FakeClock())
+    cache.set("a", {"sub": "1", "exp": 2000})
+    cache.set("b", {"sub": "2", "exp": 2000})
+    cache.set_revocation_check(lambda claims: claims["sub"] == "1")
+    assert cache.get("a") is None
+    assert cache.get("b") is not None
+    cache.invalidate("b")
+    assert len(cache) == 0
+    assert cache.stats()["revocations"] == 2
+
+
+def test_token_cache_in_metrics(client):
+    assert "token" in client.get("/metrics/cache").json()
@@ -0,0 +1,121 @@
+"""
+Token iptal listesi (Bloom filtresi, tablo yenilemesi, çıkış ve iptal uçları) testleri.
+"""
+
+import asyncio
+import datetime
+import uuid
+
+from sqlalchemy import text
+
+from ..core.settings import settings
+from ..revocation import BloomFilter, revocation_list, revoke_token
+from .conftest import TestingAsyncSessionLocal, engine
+from .test_login import create_user, login
+
+
+def refresh_list():
+    async def go():
+        async with TestingAsyncSessionLocal() as db:
+            return await revocation_list.refresh(db)
+
+    return asyncio.run(go())
+
+
+def insert_revoked(jti, expires_at="2999-01-01 00:00:00", revoked_at=None):
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO revoked_tokens (jti, expires_at, revoked_at) "
+                "VALUES (:jti, :exp, COALESCE(:rev, CURRENT_TIMESTAMP))"
+            ),
+            {"jti": jti, "exp": expires_at, "rev": revoked_at},
+        )
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    added = [uuid.uuid4().hex for _ in range(1000)]
+    for key in added:
+        bloom.add(key)
+    assert all(key in bloom for key in added)
+    false_positives = sum(uuid.uuid4().hex in bloom for _ in range(2000))
+    assert false_positives < 100
+
+
+def test_list_is_built_from_table_then_refreshed_incrementally(monkeypatch):
+    monkeypatch.setattr(settings, "REVOCATION_BLOOM_CAPACITY", 2)
+    insert_revoked("a")
+    insert_revoked("expired", "2000-01-01 00:00:00")
+    assert refresh_list() == 1
+    assert revocation_list.is_revoked("a")
+    assert not revocation_list.is_revoked("expired")
+    assert not revocation_list.is_revoked(None)
+
+    insert_revoked("b")
+    insert_revoked("c")
+    refresh_list()
+    # Kapasite aşıldığında filtre büyütülerek yeniden kurulur
+    assert all(revocation_list.is_revoked(jti) for jti in "abc")
+    assert revocation_list.stats()["filter_capacity"] >= 6
+    assert not revocation_list.is_revoked("d")
+
+
+def test_watermark_follows_rows_read_not_refresh_time():
+    insert_revoked("early", revoked_at="2026-01-01 00:00:00")
+    refresh_list()
+    assert revocation_list.since == datetime.datetime(2026, 1, 1)
+
+    # now()'u erken alınıp yenilemeden sonra commit edilen iptal kaçmamalı
+    insert_revoked("late", revoked_at="2026-01-01 00:01:00")
+    assert refresh_list() == 2
+    assert revocation_list.is_revoked("late")
+    assert revocation_list.since == datetime.datetime(2026, 1, 1, 0, 1)
+
+
+def test_logout_revokes_access_and_refresh_tokens(
+    client_without_auth, auth_headers, monkeypatch
+):
+    client = client_without_auth
+    monkeypatch.setattr(settings, "BCRYPT_ROUNDS", 4)
+    user_id = create_user(client, auth_headers, "logout@example.com")
+    body = login(client, "logout@example.com").json()
+    headers = {"Authorization": f"Bearer {body['access_token']}"}
+    assert client.get(f"/users/{user_id}", headers=headers).status_code == 200
+
+    response = client.post(
+        "/auth/logout",
+        json={"refresh_token": body["refresh_token"]},
+        headers=headers,
+    )
+    assert response.status_code == 204
+    response = client.get(f"/users/{user_id}", headers=headers)
+    assert response.status_code == 401
+    assert response.json()["detail"] == "Token has been revoked"
+    response = client.post(
+        "/auth/refresh", json={"refresh_token": body["refresh_token"]}
+    )
+    assert response.status_code == 401
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT count(*) FROM revoked_tokens")).scalar() == 1
+
+
+def test_admin_can_revoke_by_jti(client):
+    response = client.post("/auth/revoke", json={"jti": "stolen"})
+    assert response.status_code == 204
+    assert revocation_list.is_revoked("stolen")
+    assert client.get("/metrics").json()["revocation"]["revoked"] >= 1
+
+
+def test_concurrent_revocation_of_same_jti_is_idempotent():
+    """Başka bir istek satırı önce yazdıysa çakışma hata değil"""
+    insert_revoked("raced")
+
+    async def go():
+        async with TestingAsyncSessionLocal() as db:
+            await revoke_token(db, "raced", datetime.datetime(2999, 1, 1))
+
+    asyncio.run(go())
+    assert revocation_list.is_revoked("raced")
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT count(*) FROM revoked_tokens")).scalar() == 1
@@ -0,0 +1,112 @@
+"""
+JWT doğrulama cache'i.
+Aynı token'ın her istekte yeniden imza doğrulamasından geçmemesi için
+doğrulanmış claim'ler token'ın SHA-256 özetiyle süreç içi LRU'da tutulur.
+
+Kayıt token'ın exp zamanında düşer; exp içermeyen token'lar cache'lenmez.
+Her isabette iptal kontrolü (revocation hook) çalıştırılır, iptal edilen
+token'ın kaydı silinir ve doğrulama yeniden yapılır.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+from .core.settings import settings
+
+# claim'leri alıp token iptal edildiyse True döndüren kontrol
+RevocationCheck = Callable[[dict], bool]
+
+
+def token_digest(token: str) -> bytes:
+    """Token'ın cache anahtarı olarak kullanılan SHA-256 özeti."""
+    return hashlib.sha256(token.encode("utf-8")).digest()
+
+
+class TokenCache:
+    """
+    Boyut sınırlı, kayıtları token exp'inde düşen doğrulanmış claim cache'i.
+
+    Args:
+        max_size: En fazla kayıt sayısı (0: kapalı)
+        clock: Unix zamanı döndüren saat (exp ile karşılaştırılır)
+    """
+
+    def __init__(self, max_size: int = 10000, clock: Callable[[], float] = time.time):
+        self.max_size = max_size
+        self._clock = clock
+        self._entries: "OrderedDict[bytes, Tuple[float, dict]]" = OrderedDict()
+        self._revocation_check: Optional[RevocationCheck] = None
+        self._lock = threading.Lock()
+        self._counters = dict.fromkeys(
+            ("hits", "misses", "evictions", "expirations", "revocations"), 0
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def set_revocation_check(self, check: Optional[RevocationCheck]) -> None:
+        """Cache isabetlerinde çağrılacak iptal kontrolünü ayarlar."""
+        self._revocation_check = check
+
+    def get(self, token: str) -> Optional[dict]:
+        """Token'ın doğrulanmış claim'lerini döndürür; yoksa None."""
+        key = token_digest(token)
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                self._counters["misses"] += 1
+                return None
+            expires_at, claims = item
+            if expires_at <= self._clock():
+                del self._entries[key]
+                self._counters["expirations"] += 1
+                self._counters["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+        check = self._revocation_check
+        if check is not None and check(claims):
+            with self._lock:
+                self._entries.pop(key, None)
+                self._counters["revocations"] += 1
+                self._counters["misses"] += 1
+            return None
+        with self._lock:
+            self._counters["hits"] += 1
+        return dict(claims)
+
+    def set(self, token: str, claims: dict) -> None:
+        """Doğrulanmış claim'leri token'ın exp zamanına kadar saklar."""
+        expires_at = claims.get("exp")
+        if self.max_size <= 0 or not isinstance(expires_at, (int, float)):
+            return
+        key = token_digest(token)
+        with self._lock:
+            self._entries[key] = (float(expires_at), dict(claims))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._counters["evictions"] += 1
+
+    def invalidate(self, token: str) -> None:
+        """Token'ın kaydını siler (örn. çıkış veya iptal sonrası)."""
+        with self._lock:
+            if self._entries.pop(token_digest(token), None) is not None:
+                self._counters["revocations"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                **self._counters,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+            }
+
+
+token_cache = TokenCache(settings.TOKEN_CACHE_SIZE)
@@ -0,0 +1,235 @@
+"""
+Stok değerleme raporları.
+sum(quantity * unit_price) toplamlarını location veya supplier bazında
+SQL GROUP BY ile hesaplar; yanıtlar kısa TTL'li report_cache'te tutulur.
+
+VALUATION_SUMMARY açıkken raporlar stock_valuation_summary tablosundan
+okunur. Tablo ilk okumada tamamen kurulur; sonraki okumalarda yalnızca
+değişen gruplar yeniden hesaplanır:
+    - son yenilemeden beri updated_at'i değişen satırların grupları
+    - ORM/Core yazımlarında satırın eski konum/tedarikçi değerleri
+      (satır başka gruba taşındığında veya silindiğinde eski grup)
+Eski değerler süreç içinde tutulur; başka bir süreçte taşınan veya silinen
+satırın eski grubu, bu süreçte özet yeniden kurulana (reset) kadar eski kalır.
+"""
+
+import asyncio
+import datetime
+from typing import Dict, Hashable, Iterable, List, Set
+
+from sqlalchemy import delete, event, func, insert, inspect, literal, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, object_session
+
+from .core.settings import settings
+from .entity_cache import LRUEntityCache
+from .models import Stock, StockValuationSummary
+from .schemas import StockValuationRow
+
+_PENDING_KEY = "valuation_dirty"
+
+# Rapor boyutu -> gruplama kolonu
+DIMENSIONS = {"location": Stock.location, "supplier": Stock.supplier}
+
+# updated_at saniye çözünürlüklü olabilir; sınırdaki satırlar kaçmasın
+REFRESH_OVERLAP = datetime.timedelta(seconds=5)
+
+# Rapor yanıtları (boyut başına tek kayıt)
+report_cache = LRUEntityCache(max_size=64, ttl=settings.REPORT_CACHE_TTL)
+
+
+def _grouped(dimension: str, *where):
+    """Boyuta göre gruplanmış (key, items, quantity, value) sorgusu."""
+    column = DIMENSIONS[dimension]
+    return (
+        select(
+            column.label("key"),
+            func.count(Stock.id).label("items"),
+            func.coalesce(func.sum(Stock.quantity), 0).label("quantity"),
+            func.coalesce(func.sum(Stock.quantity * Stock.unit_price), 0.0).label(
+                "value"
+            ),
+        )
+        .where(*where)
+        .group_by(column)
+    )
+
+
+def _in_keys(column, keys: Iterable[Hashable]):
+    """NULL grup değerini de kapsayan IN koşulu."""
+    keys = list(keys)
+    values = [key for key in keys if key is not None]
+    clauses = [column.in_(values)] if values else []
+    if len(values) < len(keys):
+        clauses.append(column.is_(None))
+    return or_(*clauses)
+
+
+class ValuationSummary:
+    """
+    stock_valuation_summary tablosunu artımlı yenileyen yardımcı.
+
+    Attributes:
+        since: Son yenilemenin başladığı zaman (kurulmadıysa None)
+    """
+
+    def __init__(self):
+        self.since = None
+        self._dirty: Dict[str, Set[Hashable]] = {name: set() for name in DIMENSIONS}
+        self._lock = asyncio.Lock()
+
+    def mark(self, dimension: str, keys: Iterable[Hashable]) -> None:
+        """Grupları bir sonraki yenilemede yeniden hesaplanacak olarak işaretler."""
+        self._dirty[dimension].update(keys)
+
+    def reset(self) -> None:
+        """Özetin yeniden kurulmasını sağlar (örn. tablo dışarıdan silindiğinde)."""
+        self.since = None
+        for keys in self._dirty.values():
+            keys.clear()
+
+    async def refresh(self, db: AsyncSession) -> None:
+        """
+        Özeti günceller: ilk çağrıda tamamen, sonrakilerde yalnızca
+        değişen grupları yeniden hesaplar.
+
+        Args:
+            db: Async veritabanı oturumu
+        """
+        async with self._lock:
+            started = (await db.execute(select(func.now()))).scalar_one()
+            if self.since is None:
+                await db.execute(delete(StockValuationSummary))
+                for dimension in DIMENSIONS:
+                    await self._insert_groups(db, dimension)
+                for keys in self._dirty.values():
+                    keys.clear()
+            else:
+                dirty = {name: set(keys) for name, keys in self._dirty.items()}
+                touched = await db.execute(
+                    select(Stock.location, Stock.supplier)
+                    .where(Stock.updated_at >= self.since - REFRESH_OVERLAP)
+                    .distinct()
+                )
+                for location, supplier in touched:
+                    dirty["location"].add(location)
+                    dirty["supplier"].add(supplier)
+                for dimension, keys in dirty.items():
+                    keys = list(keys)
+                    for start in range(0, len(keys), settings.BULK_CHUNK_SIZE):
+                        chunk = keys[start : start + settings.BULK_CHUNK_SIZE]
+                        await db.execute(
+                            delete(StockValuationSummary).where(
+                                StockValuationSummary.dimension == dimension,
+                                _in_keys(StockValuationSummary.key, chunk),
+                            )
+                        )
+                        await self._insert_groups(
+                            db, dimension, _in_keys(DIMENSIONS[dimension], chunk)
+                        )
+            await db.commit()
+            if self.since is not None:
+                for dimension, keys in dirty.items():
+                    self._dirty[dimension] -= keys
+            self.since = started
+
+    async def _insert_groups(self, db: AsyncSession, dimension: str, *where) -> None:
+        grouped = _grouped(dimension, *where).subquery()
+        await db.execute(
+            insert(StockValuationSummary).from_select(
+                ["dimension", "key", "items", "quantity", "value"],
+                select(
+                    literal(dimension),
+                    grouped.c.key,
+                    grouped.c["items"],
+                    grouped.c.quantity,
+                    grouped.c.value,
+                ),
+            )
+        )
+
+
+valuation_summary = ValuationSummary()
+
+
+async def valuation_report(db: AsyncSession, dimension: str) -> List[StockValuationRow]:
+    """
+    Stok değerini boyuta göre gruplanmış olarak döndürür.
+
+    Args:
+        db: Async veritabanı oturumu
+        dimension: "location" veya "supplier"
+
+    Returns:
+        List[StockValuationRow]: Grup değerine göre sıralı toplamlar
+    """
+    if settings.VALUATION_SUMMARY:
+        await valuation_summary.refresh(db)
+        stmt = (
+            select(
+                StockValuationSummary.key,
+                StockValuationSummary.items,
+                StockValuationSummary.quantity,
+                StockValuationSummary.value,
+            )
+            .where(StockValuationSummary.dimension == dimension)
+            .order_by(StockValuationSummary.key)
+        )
+    else:
+        stmt = _grouped(dimension).order_by(DIMENSIONS[dimension])
+    rows = await db.execute(stmt)
+    return [StockValuationRow.model_validate(row._mapping) for row in rows]
+
+
+async def mark_keys_before_write(db, model, column, keys: Iterable[Hashable]) -> None:
+    """
+    Core üzerinden güncellenecek stok satırlarının mevcut (eski) gruplarını
+    commit sonrası yeniden hesaplanacak olarak işaretler.
+    """
+    keys = list(keys)
+    if model is not Stock or not settings.VALUATION_SUMMARY or not keys:
+        return
+    rows = await db.execute(
+        select(Stock.location, Stock.supplier).where(column.in_(keys))
+    )
+    session = db.sync_session
+    pending = session.info.setdefault(_PENDING_KEY, set())
+    for location, supplier in rows:
+        pending.update({("location", location), ("supplier", supplier)})
+
+
+# --- ORM event'leri: taşınan/silinen satırların eski grupları ---
+
+
+@event.listens_for(Stock, "after_update")
+def _stock_updated(mapper, connection, target):
+    session = object_session(target)
+    if session is None or not settings.VALUATION_SUMMARY:
+        return
+    state = inspect(target)
+    pending = session.info.setdefault(_PENDING_KEY, set())
+    for dimension in DIMENSIONS:
+        pending.update(
+            (dimension, key) for key in state.attrs[dimension].history.deleted
+        )
+
+
+@event.listens_for(Stock, "after_delete")
+def _stock_deleted(mapper, connection, target):
+    session = object_session(target)
+    if session is None or not settings.VALUATION_SUMMARY:
+        return
+    session.info.setdefault(_PENDING_KEY, set()).update(
+        (dimension, getattr(target, dimension)) for dimension in DIMENSIONS
+    )
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_dirty(session):
+    for dimension, key in session.info.pop(_PENDING_KEY, ()):
+        valuation_summary.mark(dimension, [key])
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_dirty(session):
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,29 @@
+"""add_list_filter_indexes
+
+Revision ID: 3b7d9e1f2a4c
+Revises: ff6fedb38d28
+Create Date: 2026-10-17 10:12:41.318204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3b7d9e1f2a4c'
+down_revision = 'ff6fedb38d28'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Liste endpoint'lerindeki filtre + created_at sıralaması için
+    op.create_index('ix_orders_user_id_created_at', 'orders', ['user_id', 'created_at'], unique=False)
+    op.create_index('ix_orders_status_created_at', 'orders', ['status', 'created_at'], unique=False)
+    op.create_index('ix_stocks_location', 'stocks', ['location'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_stocks_location', table_name='stocks')
+    op.drop_index('ix_orders_status_created_at', table_name='orders')
+    op.drop_index('ix_orders_user_id_created_at', table_name='orders')
@@ -0,0 +1,37 @@
+"""add_stock_snapshots
+
+Revision ID: 5d1f7b3c9e2a
+Revises: 8c2e4a6f1d3b
+Create Date: 2026-10-17 14:05:27.604118
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5d1f7b3c9e2a'
+down_revision = '8c2e4a6f1d3b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('stock_snapshots',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('location', sa.String(), nullable=True),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.Column('movement_id', sa.Integer(), nullable=False),
+    sa.Column('taken_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_stock_snapshots_product_location', 'stock_snapshots', ['product_id', 'location', 'movement_id'], unique=False)
+    op.create_index(op.f('ix_stock_snapshots_taken_at'), 'stock_snapshots', ['taken_at'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_stock_snapshots_taken_at'), table_name='stock_snapshots')
+    op.drop_index('ix_stock_snapshots_product_location', table_name='stock_snapshots')
+    op.drop_table('stock_snapshots')
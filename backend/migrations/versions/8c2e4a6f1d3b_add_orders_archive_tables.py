@@ -0,0 +1,61 @@
+"""add_orders_archive_tables
+
+Revision ID: 8c2e4a6f1d3b
+Revises: 3b7d9e1f2a4c
+Create Date: 2026-10-17 11:02:17.540913
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.settings import settings
+
+
+# revision identifiers, used by Alembic.
+revision = '8c2e4a6f1d3b'
+down_revision = '3b7d9e1f2a4c'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # PostgreSQL'de isteğe bağlı olarak created_at'e göre range partition
+    partitioned = (
+        settings.ARCHIVE_PARTITIONING and op.get_bind().dialect.name == 'postgresql'
+    )
+    table_kwargs = {'postgresql_partition_by': 'RANGE (created_at)'} if partitioned else {}
+    # user_id ve shipping_address_id foreign key değildir; arşiv satırları
+    # kullanıcı ve adresleri silindikten sonra da korunur
+    op.create_table('orders_archive',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('total_amount', sa.Float(), nullable=False),
+    sa.Column('shipping_address_id', sa.Integer(), nullable=True),
+    sa.Column('archived_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id', 'created_at'),
+    **table_kwargs
+    )
+    op.create_index(op.f('ix_orders_archive_user_id'), 'orders_archive', ['user_id'], unique=False)
+    if partitioned:
+        # Yıllık partition'lar arşivleme sırasında oluşturulur
+        op.execute('CREATE TABLE orders_archive_default PARTITION OF orders_archive DEFAULT')
+    op.create_table('order_items_archive',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('order_id', sa.Integer(), nullable=False),
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.Column('unit_price', sa.Float(), nullable=False),
+    sa.Column('total_price', sa.Float(), nullable=False),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_order_items_archive_order_id'), 'order_items_archive', ['order_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_order_items_archive_order_id'), table_name='order_items_archive')
+    op.drop_table('order_items_archive')
+    op.drop_index(op.f('ix_orders_archive_user_id'), table_name='orders_archive')
+    op.drop_table('orders_archive')
@@ -0,0 +1,29 @@
+"""add_version_columns
+
+Revision ID: 9e4b2c7a1f6d
+Revises: 5d1f7b3c9e2a
+Create Date: 2026-10-17 15:21:09.447305
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9e4b2c7a1f6d'
+down_revision = '5d1f7b3c9e2a'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # İyimser eşzamanlılık (version_id_col); mevcut satırlar 1'den başlar
+    op.add_column('stocks', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+    op.add_column('orders', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+    op.add_column('products', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade():
+    op.drop_column('products', 'version')
+    op.drop_column('orders', 'version')
+    op.drop_column('stocks', 'version')
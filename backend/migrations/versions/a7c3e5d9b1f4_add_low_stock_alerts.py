@@ -0,0 +1,45 @@
+"""add_low_stock_alerts
+
+Revision ID: a7c3e5d9b1f4
+Revises: 9e4b2c7a1f6d
+Create Date: 2026-10-17 16:02:41.183527
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7c3e5d9b1f4'
+down_revision = '9e4b2c7a1f6d'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('low_stock_alerts',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('item_type', sa.String(), nullable=False),
+    sa.Column('item_id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.Column('reorder_threshold', sa.Integer(), nullable=False),
+    sa.Column('detected_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('item_type', 'item_id', name='uq_low_stock_alerts_item')
+    )
+    for table, quantity in (('stocks', 'quantity'), ('products', 'stock')):
+        op.add_column(table, sa.Column('reorder_threshold', sa.Integer(), nullable=True))
+        op.add_column(table, sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False))
+        op.create_index(op.f(f'ix_{table}_updated_at'), table, ['updated_at'], unique=False)
+        # Kısmi indeks: yalnızca eşiğin altındaki satırlar
+        op.create_index(f'ix_{table}_below_reorder', table, ['id'], unique=False, postgresql_where=sa.text(f'{quantity} < reorder_threshold'), sqlite_where=sa.text(f'{quantity} < reorder_threshold'))
+
+
+def downgrade():
+    for table in ('products', 'stocks'):
+        op.drop_index(f'ix_{table}_below_reorder', table_name=table)
+        op.drop_index(op.f(f'ix_{table}_updated_at'), table_name=table)
+        op.drop_column(table, 'updated_at')
+        op.drop_column(table, 'reorder_threshold')
+    op.drop_table('low_stock_alerts')
@@ -0,0 +1,24 @@
+"""add_users_email_lower_index
+
+Revision ID: b8d2f6a4c9e3
+Revises: f5a9c1e7b2d8
+Create Date: 2026-10-17 19:12:05.418263
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b8d2f6a4c9e3'
+down_revision = 'f5a9c1e7b2d8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_users_email_lower', 'users', [sa.text('lower(email)')], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_users_email_lower', table_name='users')
@@ -0,0 +1,35 @@
+"""add_stock_valuation_summary
+
+Revision ID: c4f8a2e6d0b7
+Revises: a7c3e5d9b1f4
+Create Date: 2026-10-17 16:48:12.905316
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4f8a2e6d0b7'
+down_revision = 'a7c3e5d9b1f4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('stock_valuation_summary',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('dimension', sa.String(), nullable=False),
+    sa.Column('key', sa.String(), nullable=True),
+    sa.Column('items', sa.Integer(), nullable=False),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.Column('value', sa.Float(), nullable=False),
+    sa.Column('refreshed_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_stock_valuation_summary_dimension_key', 'stock_valuation_summary', ['dimension', 'key'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_stock_valuation_summary_dimension_key', table_name='stock_valuation_summary')
+    op.drop_table('stock_valuation_summary')
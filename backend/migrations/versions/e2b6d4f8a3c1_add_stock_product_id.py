@@ -0,0 +1,66 @@
+"""add_stock_product_id
+
+Revision ID: e2b6d4f8a3c1
+Revises: c4f8a2e6d0b7
+Create Date: 2026-10-17 17:26:54.318740
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2b6d4f8a3c1'
+down_revision = 'c4f8a2e6d0b7'
+branch_labels = None
+depends_on = None
+
+# Backfill'de transaction başına işlenen stok id aralığı
+BATCH_SIZE = 10000
+
+
+def upgrade():
+    # DDL her adımda mevcut şemaya bakılarak uygulanır: backfill yarıda
+    # kalıp migration tekrar çalıştırıldığında kolon, index ve FK zaten
+    # commit edilmiş olur ve yeniden oluşturulmaya çalışılmaz.
+    inspector = sa.inspect(op.get_bind())
+    columns = {column['name'] for column in inspector.get_columns('stocks')}
+    indexes = {index['name'] for index in inspector.get_indexes('stocks')}
+    foreign_keys = {fk['name'] for fk in inspector.get_foreign_keys('stocks')}
+
+    # SQLite ALTER ile FK ekleyemez; batch modu gerektiğinde tabloyu
+    # yeniden oluşturur, diğer veritabanlarında doğrudan ALTER kullanır.
+    with op.batch_alter_table('stocks') as batch_op:
+        if 'product_id' not in columns:
+            batch_op.add_column(sa.Column('product_id', sa.Integer(), nullable=True))
+        if op.f('ix_stocks_product_id') not in indexes:
+            batch_op.create_index(op.f('ix_stocks_product_id'), ['product_id'], unique=False)
+        if 'fk_stocks_product_id_products' not in foreign_keys:
+            batch_op.create_foreign_key('fk_stocks_product_id_products', 'products', ['product_id'], ['id'])
+
+    # Mevcut satırlar ürün adından eşleştirilir. Her id aralığı ayrı
+    # transaction'da commit edilir; migration yarıda kalırsa tekrar
+    # çalıştırıldığında DDL atlanır ve yalnızca product_id'si boş
+    # satırlar işlenir.
+    with op.get_context().autocommit_block():
+        backfill_product_ids(op.get_bind())
+
+
+def backfill_product_ids(conn, batch_size=BATCH_SIZE):
+    start, end = conn.execute(sa.text(
+        'SELECT min(id), max(id) FROM stocks WHERE product_id IS NULL'
+    )).one()
+    while start is not None and start <= end:
+        conn.execute(sa.text(
+            'UPDATE stocks SET product_id = '
+            '(SELECT p.id FROM products p WHERE p.name = stocks.product_name) '
+            'WHERE product_id IS NULL AND id >= :lo AND id < :hi'
+        ), {'lo': start, 'hi': start + batch_size})
+        start += batch_size
+
+
+def downgrade():
+    with op.batch_alter_table('stocks') as batch_op:
+        batch_op.drop_constraint('fk_stocks_product_id_products', type_='foreignkey')
+        batch_op.drop_index(op.f('ix_stocks_product_id'))
+        batch_op.drop_column('product_id')
@@ -0,0 +1,29 @@
+"""add_job_checkpoints
+
+Revision ID: f5a9c1e7b2d8
+Revises: e2b6d4f8a3c1
+Create Date: 2026-10-17 18:04:37.562091
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f5a9c1e7b2d8'
+down_revision = 'e2b6d4f8a3c1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('job_checkpoints',
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('checkpoint', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade():
+    op.drop_table('job_checkpoints')